@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for Amazon search/detail page parsing.
+
+Compares the BeautifulSoup ``html.parser`` path with the lxml fast path on saved
+pages. Without arguments a full-size results page is synthesized from the test
+fixtures.
+
+Usage: python -m benchmarks.bench_amazon_parser [--max-results N] [search.html ...]
+"""
+
+import argparse
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.platforms.amazon.amazon_affiliate import AmazonAffiliate  # noqa: E402
+
+FIXTURES = Path(__file__).resolve().parent.parent / "tests" / "fixtures"
+
+
+def synthetic_search_page(results: int = 60, filler_kb: int = 600) -> bytes:
+    """Build a results page roughly the size of a real one out of the fixture items.
+
+    Markup noise is spread between the result blocks the way scripts, ads and
+    widgets are on a real page.
+    """
+    page = (FIXTURES / "amazon_search.html").read_bytes()
+    head, _, rest = page.partition(b'<div data-component-type="s-search-result"')
+    items, _, tail = rest.rpartition(b'<div id="footer">')
+    copies = max(1, results // 4)
+    noise = b"<div class='a-section'><span>widget</span></div>" * (filler_kb * 20 // copies)
+    block = b'<div data-component-type="s-search-result"' + items + noise
+    return head + block * copies + b'<div id="footer">' + tail
+
+
+def bench(label: str, func, number: int) -> float:
+    seconds = min(timeit.repeat(func, number=number, repeat=3)) / number
+    print(f"  {label:<14} {seconds * 1000:8.2f} ms/page")
+    return seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("pages", nargs="*", type=Path, help="Saved Amazon search pages")
+    parser.add_argument("--max-results", type=int, default=10)
+    parser.add_argument("--number", type=int, default=20)
+    args = parser.parse_args()
+
+    fast = AmazonAffiliate({"amazon_associate_tag": "bench-20"})
+    slow = AmazonAffiliate(
+        {"amazon_associate_tag": "bench-20", "amazon_html_parser": "html.parser"}
+    )
+
+    pages = [(p.name, p.read_bytes()) for p in args.pages] or [
+        ("synthetic search page", synthetic_search_page())
+    ]
+    for name, content in pages:
+        print(f"{name} ({len(content) / 1024:.0f} KiB, max_results={args.max_results})")
+        before = bench(
+            "html.parser", lambda: slow._parse_search_page(content, args.max_results), args.number
+        )
+        after = bench(
+            "lxml", lambda: fast._parse_search_page(content, args.max_results), args.number
+        )
+        print(f"  speed-up       {before / after:8.1f}x")
+
+    detail = (FIXTURES / "amazon_product.html").read_bytes()
+    print("detail page fixture")
+    before = bench(
+        "html.parser", lambda: slow._parse_product_page(detail, "B0TEST0001"), args.number
+    )
+    after = bench("lxml", lambda: fast._parse_product_page(detail, "B0TEST0001"), args.number)
+    print(f"  speed-up       {before / after:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
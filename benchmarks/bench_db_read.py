@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Benchmark for reading saved products: ORM entities vs Core rows.
+
+The ORM path is what ``get_products`` used to do: load ``ProductModel`` objects
+into a session and copy each one with ``to_product``. The Core path selects the
+product columns and builds ``Product(*row)`` directly, as ``get_products``,
+``iter_products`` and ``query_products`` now do.
+
+Usage: python -m benchmarks.bench_db_read [--rows N] [--repeat N]
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.bench_db_upsert import make_products  # noqa: E402
+from src.utils.database import Database, ProductModel  # noqa: E402
+
+
+def orm_get_products(db: Database):
+    with db.SessionLocal() as session:
+        return [p.to_product() for p in session.query(ProductModel).all()]
+
+
+def rows_per_second(label: str, rows: int, repeat: int, read) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        count = len(read())
+        best = min(best, time.perf_counter() - start)
+        assert count == rows
+    rate = rows / best
+    print(f"  {label:<28} {rate:12,.0f} rows/s  ({best * 1000:7.1f} ms)")
+    return rate
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(f"sqlite:///{Path(tmp) / 'bench.db'}")
+        db.save_products(make_products(args.rows))
+
+        print(f"{args.rows} products, SQLite, best of {args.repeat}")
+        before = rows_per_second(
+            "ORM + to_product", args.rows, args.repeat, lambda: orm_get_products(db)
+        )
+        after = rows_per_second("Core get_products", args.rows, args.repeat, db.get_products)
+        rows_per_second(
+            "Core iter_products", args.rows, args.repeat, lambda: list(db.iter_products())
+        )
+        print(f"  speed-up                     {after / before:12.1f}x")
+        db.engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
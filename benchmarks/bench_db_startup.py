@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Benchmark for opening the product database on every CLI run.
+
+Compares the old startup (``create_all`` plus an existence check for every
+index) with the schema-version check ``Database`` does now, both against an
+up-to-date SQLite file, and times the one-off migration of an empty database.
+The cold-process run includes interpreter and import time, as a CLI command
+sees it, and reports whether Alembic had to be imported.
+
+Usage: python -m benchmarks.bench_db_startup [--repeat N]
+"""
+
+import argparse
+import json
+import subprocess  # nosec B404 - runs this interpreter on a fixed script
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from sqlalchemy import create_engine  # noqa: E402
+
+from src.utils.database import Base, Database, PriceHistoryModel, ProductModel  # noqa: E402
+
+COLD_START = """
+import json, sys, time
+start = time.perf_counter()
+from src.utils.database import Database
+Database(sys.argv[1])
+print(json.dumps([time.perf_counter() - start, "alembic" in sys.modules]))
+"""
+
+
+def create_all_startup(url: str):
+    """What Database.__init__ did before versioned migrations."""
+    engine = create_engine(url)
+    Base.metadata.create_all(engine)
+    for index in (*ProductModel.__table__.indexes, *PriceHistoryModel.__table__.indexes):
+        index.create(engine, checkfirst=True)
+    engine.dispose()
+
+
+def version_check_startup(url: str):
+    Database(url).engine.dispose()
+
+
+def best_ms(func, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def cold_start(url: str):
+    output = subprocess.run(  # nosec B603
+        [sys.executable, "-c", COLD_START, url],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    seconds, imported_alembic = json.loads(output.strip().splitlines()[-1])
+    return seconds * 1000, imported_alembic
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{Path(tmp) / 'bench.db'}"
+        first = best_ms(lambda: version_check_startup(url), 1)
+        print(f"SQLite, best of {args.repeat}")
+        print(f"  {'first run (migrate empty db)':<34} {first:8.2f} ms")
+        before = best_ms(lambda: create_all_startup(url), args.repeat)
+        print(f"  {'create_all + index checks':<34} {before:8.2f} ms")
+        after = best_ms(lambda: version_check_startup(url), args.repeat)
+        print(f"  {'schema version check':<34} {after:8.2f} ms")
+        print(f"  {'speed-up':<34} {before / after:8.1f}x")
+
+        cold, imported_alembic = cold_start(url)
+        print(f"  {'cold process, up-to-date db':<34} {cold:8.2f} ms")
+        print(f"  {'alembic imported':<34} {str(imported_alembic):>8}")
+
+
+if __name__ == "__main__":
+    main()
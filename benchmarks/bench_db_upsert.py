@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Benchmark for saving products: per-row ``save_product`` vs bulk ``save_products``.
+
+Each run writes ``--rows`` fresh products into an empty SQLite file and then
+writes them again (the update path), so both inserts and conflicts are timed.
+
+Usage: python -m benchmarks.bench_db_upsert [--rows N]
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.core.base_affiliate import Product  # noqa: E402
+from src.utils.database import Database  # noqa: E402
+
+
+def make_products(rows: int, price_offset: float = 0.0):
+    return [
+        Product(
+            id=f"B{i:08d}",
+            title=f"Benchmark product {i}",
+            price=10.0 + i % 500 + price_offset,
+            original_price=20.0 + i % 500,
+            discount_percentage=float(i % 60),
+            url=f"https://www.amazon.com/dp/B{i:08d}",
+            affiliate_url=f"https://www.amazon.com/dp/B{i:08d}?tag=bench-20",
+            rating=3.0 + (i % 20) / 10,
+            review_count=i % 5000,
+            category="Electronics",
+            platform="Amazon",
+        )
+        for i in range(rows)
+    ]
+
+
+def timed(label: str, func) -> float:
+    start = time.perf_counter()
+    func()
+    seconds = time.perf_counter() - start
+    print(f"  {label:<22} {seconds:8.2f} s")
+    return seconds
+
+
+def run(label: str, rows: int, save) -> float:
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(f"sqlite:///{Path(tmp) / 'bench.db'}")
+        print(label)
+        total = timed("insert", lambda: save(db, make_products(rows)))
+        total += timed("update", lambda: save(db, make_products(rows, price_offset=1.0)))
+        assert len(db.get_products()) == rows
+        db.engine.dispose()
+        return total
+
+
+def save_each(db: Database, products):
+    for product in products:
+        db.save_product(product)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000)
+    args = parser.parse_args()
+
+    print(f"{args.rows} products, SQLite")
+    before = run("per-row save_product", args.rows, save_each)
+    after = run("bulk save_products", args.rows, lambda db, products: db.save_products(products))
+    print(f"  speed-up               {before / after:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Benchmark for exporting the catalog for offline analysis with pandas.
+
+``to_dict`` loads every product with ``get_products`` and builds a DataFrame
+from ``Product.to_dict`` dicts, as analysis scripts did before. ``parquet``
+streams the table to Parquet with ``export_parquet`` and reads it back with
+``pandas.read_parquet``. Each mode runs in a fresh process so that its peak RSS
+can be reported.
+
+Usage: python -m benchmarks.bench_parquet_export [--rows N] [--chunk-size N]
+"""
+
+import argparse
+import json
+import resource
+import subprocess  # nosec B404 - runs this interpreter on this module
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import pandas as pd  # noqa: E402
+
+from benchmarks.bench_db_upsert import make_products  # noqa: E402
+from src.utils.database import Database  # noqa: E402
+from src.utils.parquet_io import export_parquet  # noqa: E402
+
+
+def run_mode(mode: str, url: str, directory: str, chunk_size: int):
+    db = Database(url)
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    if mode == "to_dict":
+        frame = pd.DataFrame([p.to_dict() for p in db.get_products()])
+    else:
+        export_parquet(db, directory, chunk_size=chunk_size, include_history=False)
+        frame = pd.read_parquet(Path(directory) / "products")
+    seconds = time.perf_counter() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - baseline
+    print(json.dumps({"seconds": seconds, "peak_kib": peak, "rows": len(frame)}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--chunk-size", type=int, default=50_000)
+    parser.add_argument("--mode", choices=["to_dict", "parquet"], help=argparse.SUPPRESS)
+    parser.add_argument("--url", help=argparse.SUPPRESS)
+    parser.add_argument("--directory", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        run_mode(args.mode, args.url, args.directory, args.chunk_size)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{Path(tmp) / 'bench.db'}"
+        db = Database(url)
+        for start in range(0, args.rows, 50_000):
+            batch = make_products(min(50_000, args.rows - start))
+            for product in batch:
+                product.id = f"{product.id}-{start}"
+            db.save_products(batch)
+        db.engine.dispose()
+
+        print(f"{args.rows} products, SQLite, chunk size {args.chunk_size}")
+        for mode in ("to_dict", "parquet"):
+            output = subprocess.run(  # nosec B603
+                [
+                    sys.executable,
+                    "-m",
+                    "benchmarks.bench_parquet_export",
+                    "--mode",
+                    mode,
+                    "--url",
+                    url,
+                    "--directory",
+                    str(Path(tmp) / "export"),
+                    "--chunk-size",
+                    str(args.chunk_size),
+                ],
+                cwd=ROOT,
+                capture_output=True,
+                text=True,
+                check=True,
+            ).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            assert result["rows"] == args.rows
+            print(
+                f"  {mode:<10} {result['seconds']:8.2f} s  "
+                f"peak RSS +{result['peak_kib'] / 1024:7.1f} MiB"
+            )
+
+
+if __name__ == "__main__":
+    main()
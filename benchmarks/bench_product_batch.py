@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Benchmark for get_best_deals on large trending sets: list comprehension and
+``list.sort`` against ``ProductBatch`` filter and rank.
+
+"batch" includes building the batch from the products and converting the
+result back; "batch, prebuilt" is the filter and sort alone, for callers that
+keep products as a batch. The top-k rows take the best ``--top`` deals, once
+with ``top_deals`` (a bounded heap per provider and a k-way merge, with the
+products split over two providers) and once with ``ProductBatch.top_k``.
+
+Usage: python -m benchmarks.bench_product_batch [--rows N ...] [--repeat N] [--top K]
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.bench_db_upsert import make_products  # noqa: E402
+from src.core.product_batch import ProductBatch  # noqa: E402
+from src.core.product_manager import top_deals  # noqa: E402
+
+MIN_DISCOUNT = 20.0
+
+
+def list_deals(products):
+    deals = [p for p in products if p.discount_percentage and p.discount_percentage >= MIN_DISCOUNT]
+    deals.sort(key=lambda x: x.discount_percentage or 0, reverse=True)
+    return deals
+
+
+def batch_deals(products):
+    return prebuilt_deals(ProductBatch.from_products(products)).to_products()
+
+
+def prebuilt_deals(batch):
+    return batch.filter(min_discount=MIN_DISCOUNT).rank("discount_percentage")
+
+
+def best(func, arg, repeat: int):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(arg)
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000, 10_000, 100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    for rows in args.rows:
+        products = make_products(rows)
+        random.Random(rows).shuffle(products)
+        batch = ProductBatch.from_products(products)
+        print(f"{rows:,} trending products")
+
+        baseline, expected = best(list_deals, products, args.repeat)
+        cases = [
+            ("list + sort", baseline, expected),
+            ("batch", *best(batch_deals, products, args.repeat)),
+        ]
+        providers = [products[: rows // 2], products[rows // 2 :]]
+        cases.append(
+            (
+                f"heap top {args.top}",
+                *best(
+                    lambda lists: top_deals(lists, MIN_DISCOUNT, args.top), providers, args.repeat
+                ),
+            )
+        )
+        seconds, ranked = best(prebuilt_deals, batch, args.repeat)
+        cases.append(("batch, prebuilt", seconds, ranked.to_products()))
+        seconds, top = best(
+            lambda b: b.filter(min_discount=MIN_DISCOUNT).top_k(args.top), batch, args.repeat
+        )
+        cases.append((f"batch, prebuilt top {args.top}", seconds, top.to_products()))
+
+        for label, seconds, result in cases:
+            assert result == expected[: len(result)], label
+            print(f"  {label:<24} {seconds * 1000:9.2f} ms  {baseline / seconds:6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
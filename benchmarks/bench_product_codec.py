@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the Product representation: memory per product and codec speed.
+
+Memory is the tracemalloc-measured size of ``--count`` products whose field
+values are shared, i.e. the per-object overhead, for the slotted ``Product``
+and for a plain ``@dataclass`` copy of it. Round trips compare
+``to_bytes``/``from_bytes`` with ``json.dumps(to_dict())``/``from_dict``.
+
+Usage: python -m benchmarks.bench_product_codec [--count N] [--round-trips N]
+"""
+
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+from dataclasses import MISSING, field, fields, make_dataclass
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.core.base_affiliate import Product  # noqa: E402
+
+# Product as it was before slots: same fields, per-instance __dict__
+DictProduct = make_dataclass(
+    "DictProduct",
+    [
+        (f.name, f.type, field(default=f.default, default_factory=f.default_factory))
+        if f.default is not MISSING or f.default_factory is not MISSING
+        else (f.name, f.type)
+        for f in fields(Product)
+    ],
+)
+
+
+def sample(cls):
+    return cls(
+        id="B0BENCH001",
+        title="Sony WH-1000XM5 Wireless Noise Cancelling Headphones",
+        price=329.99,
+        original_price=399.99,
+        discount_percentage=17.5,
+        url="https://www.amazon.com/dp/B0BENCH001",
+        affiliate_url="https://www.amazon.com/dp/B0BENCH001?tag=bench-20",
+        image_url="https://m.media-amazon.com/images/I/bench.jpg",
+        rating=4.6,
+        review_count=12873,
+        category="Electronics",
+        platform="Amazon",
+    )
+
+
+def bytes_per_product(cls, count: int) -> float:
+    template = sample(cls)
+    values = [getattr(template, f.name) for f in fields(cls)]
+    tracemalloc.start()
+    products = [cls(*values) for _ in range(count)]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del products
+    return size / count
+
+
+def round_trips_per_second(label: str, encode, decode, product, count: int) -> float:
+    start = time.perf_counter()
+    for _ in range(count):
+        decoded = decode(encode(product))
+    seconds = time.perf_counter() - start
+    assert decoded == product
+    rate = count / seconds
+    print(f"  {label:<28} {rate:12,.0f} round trips/s  ({len(encode(product))} bytes)")
+    return rate
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--count", type=int, default=1_000_000)
+    parser.add_argument("--round-trips", type=int, default=200_000)
+    args = parser.parse_args()
+
+    print(f"Memory for {args.count:,} products")
+    before = bytes_per_product(DictProduct, args.count)
+    after = bytes_per_product(Product, args.count)
+    for label, size in (("dataclass with __dict__", before), ("slotted Product", after)):
+        print(f"  {label:<28} {size:8.0f} B/product  {size * args.count / 2**20:8.1f} MiB")
+
+    print(f"Codec, {args.round_trips:,} round trips")
+    product = sample(Product)
+    old = round_trips_per_second(
+        "to_dict + json / from_dict",
+        lambda p: json.dumps(p.to_dict()).encode(),
+        lambda data: Product.from_dict(json.loads(data)),
+        product,
+        args.round_trips,
+    )
+    new = round_trips_per_second(
+        "to_bytes / from_bytes", Product.to_bytes, Product.from_bytes, product, args.round_trips
+    )
+    print(f"  speed-up                     {new / old:12.1f}x")
+
+
+if __name__ == "__main__":
+    main()
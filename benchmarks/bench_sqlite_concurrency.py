@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Concurrent read/write throughput of the SQLite database with and without the
+performance profile (WAL, synchronous=NORMAL, larger cache, mmap, busy timeout).
+
+Writer processes upsert small batches of products while reader processes page
+through them with ``query_products``, as the CLI and the scheduler do when they
+share ``affiliate_data.db``.
+
+Usage: python -m benchmarks.bench_sqlite_concurrency [--seconds S] [--readers N] [--writers N]
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from multiprocessing import Process, Value
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy.exc import OperationalError  # noqa: E402
+
+from benchmarks.bench_db_upsert import make_products  # noqa: E402
+from src.utils.database import Database  # noqa: E402
+
+ROWS = 5000
+BATCH = 50
+
+
+PROFILES = {
+    "defaults": {},  # plain SQLite: rollback journal, synchronous=FULL
+    "tuned": None,  # DEFAULT_SQLITE_PRAGMAS
+}
+
+
+def _worker(url: str, profile: str, role: str, deadline: float, counts, errors):
+    db = Database(url, sqlite_pragmas=PROFILES[profile])
+    catalog = make_products(ROWS)
+    while time.time() < deadline:
+        try:
+            if role == "reads":
+                db.query_products(
+                    order_by=random.choice(["price", "rating", "last_updated"]), limit=50
+                )
+            else:
+                start = random.randrange(0, ROWS - BATCH)
+                batch = catalog[start : start + BATCH]
+                for product in batch:
+                    product.price += 1
+                db.save_products(batch)
+            with counts.get_lock():
+                counts.value += 1
+        except OperationalError:
+            with errors.get_lock():
+                errors.value += 1
+    db.engine.dispose()
+
+
+def run(profile: str, seconds: float, readers: int, writers: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{Path(tmp) / 'bench.db'}"
+        db = Database(url, sqlite_pragmas=PROFILES[profile])
+        db.save_products(make_products(ROWS))
+        db.engine.dispose()
+
+        reads, writes, errors = Value("i", 0), Value("i", 0), Value("i", 0)
+        deadline = time.time() + seconds
+        jobs = [("reads", reads)] * readers + [("writes", writes)] * writers
+        processes = [
+            Process(target=_worker, args=(url, profile, role, deadline, counts, errors))
+            for role, counts in jobs
+        ]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+
+    print(
+        f"  {profile:<10} {reads.value / seconds:9.0f} reads/s "
+        f"{writes.value / seconds:8.0f} writes/s {errors.value:6d} lock errors"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--writers", type=int, default=2)
+    args = parser.parse_args()
+
+    print(
+        f"{args.readers} readers, {args.writers} writers, {args.seconds:.0f}s, "
+        f"batches of {BATCH} over {ROWS} products"
+    )
+    for profile in PROFILES:
+        run(profile, args.seconds, args.readers, args.writers)
+
+
+if __name__ == "__main__":
+    main()
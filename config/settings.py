@@ -1,4 +1,5 @@
 from pathlib import Path
+from typing import Dict, Optional
 
 from pydantic_settings import BaseSettings
 
@@ -10,13 +11,70 @@ class Settings(BaseSettings):
     amazon_associate_tag: str = ""
     amazon_access_key: str = ""
     amazon_secret_key: str = ""
+    amazon_html_parser: str = "lxml"
+    amazon_rate_limit: float = 1.0  # requests per second, 0 disables
+    amazon_rate_burst: int = 3
 
     # Flipkart Settings
     flipkart_affiliate_id: str = ""
     flipkart_affiliate_token: str = ""
+    flipkart_rate_limit: float = 5.0
+    flipkart_rate_burst: int = 10
+
+    # Provider fan-out
+    concurrent_providers: bool = True
+    provider_max_workers: int = 4
+    provider_timeout: float = 20.0
+    search_timeout: float = 30.0
+
+    # HTTP connection pooling
+    http_pool_connections: int = 10
+    http_pool_maxsize: int = 10
+    http_keep_alive: bool = True
+    share_http_session: bool = True
+
+    # Response cache (TTLs in seconds, keyed by URL regex)
+    cache_enabled: bool = True
+    cache_max_entries: int = 512
+    cache_max_bytes: int = 64 * 1024 * 1024
+    cache_default_ttl: float = 300
+    cache_ttls: Dict[str, float] = {}
+    cache_dir: Optional[str] = None
+    cache_disk_max_bytes: int = 256 * 1024 * 1024
+
+    # Circuit breakers (one per provider)
+    circuit_breaker_enabled: bool = True
+    circuit_failure_threshold: float = 0.5  # failure rate that opens the circuit
+    circuit_window_size: int = 20
+    circuit_min_calls: int = 5
+    circuit_reset_timeout: float = 30.0  # seconds before probing again
+    circuit_half_open_max_calls: int = 1
+
+    # Asyncio providers
+    async_providers: bool = False
+    async_max_concurrency: int = 100
 
     # Database
     database_url: str = "sqlite:///affiliate_data.db"
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30.0
+
+    # SQLite performance profile (ignored for other databases)
+    sqlite_tuning: bool = True
+    sqlite_journal_mode: str = "wal"
+    sqlite_synchronous: str = "normal"
+    sqlite_cache_size: int = -64 * 1024  # negative = KiB
+    sqlite_mmap_size: int = 256 * 1024 * 1024
+    sqlite_busy_timeout: int = 5000  # milliseconds
+    sqlite_temp_store: str = "memory"
+
+    # Write-behind: save_product queues products and a background thread saves them in batches
+    write_behind_enabled: bool = True
+    write_behind_batch_size: int = 500
+    write_behind_flush_interval: float = 1.0  # seconds a queued product may wait
+    write_behind_max_pending: int = 10_000  # save_product blocks beyond this
+    write_behind_put_timeout: Optional[float] = None
 
     # Social Media
     twitter_api_key: str = ""
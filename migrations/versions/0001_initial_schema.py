@@ -0,0 +1,85 @@
+"""Initial schema: products, price history and their query indexes.
+
+Databases created before migrations existed already have some of these tables
+and indexes, so only the missing ones are created.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0001"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = (
+    ("ix_products_last_updated", "products", ["last_updated", "platform", "id"]),
+    ("ix_products_platform_updated", "products", ["platform", "last_updated", "id"]),
+    ("ix_products_discount", "products", ["discount_percentage", "platform", "id"]),
+    (
+        "ix_products_category_discount",
+        "products",
+        ["category", "discount_percentage", "platform", "id"],
+    ),
+    ("ix_products_price", "products", ["price", "platform", "id"]),
+    ("ix_products_rating", "products", ["rating", "platform", "id"]),
+    ("ix_price_history_product", "price_history", ["platform", "id", "ts", "price"]),
+    ("ix_price_history_ts", "price_history", ["ts", "platform", "id", "price"]),
+)
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    tables = set(inspector.get_table_names())
+
+    if "products" not in tables:
+        op.create_table(
+            "products",
+            sa.Column("id", sa.String(), nullable=False),
+            sa.Column("platform", sa.String(), nullable=False),
+            sa.Column("title", sa.String()),
+            sa.Column("price", sa.Float()),
+            sa.Column("original_price", sa.Float()),
+            sa.Column("discount_percentage", sa.Float()),
+            sa.Column("url", sa.Text()),
+            sa.Column("affiliate_url", sa.Text()),
+            sa.Column("image_url", sa.Text()),
+            sa.Column("rating", sa.Float()),
+            sa.Column("review_count", sa.Integer()),
+            sa.Column("category", sa.String()),
+            sa.Column("description", sa.Text()),
+            sa.Column("last_updated", sa.DateTime()),
+            sa.PrimaryKeyConstraint("id", "platform"),
+        )
+    if "price_history" not in tables:
+        op.create_table(
+            "price_history",
+            sa.Column("platform", sa.String(), nullable=False),
+            sa.Column("id", sa.String(), nullable=False),
+            sa.Column("ts", sa.DateTime(), nullable=False),
+            sa.Column("price", sa.Float(), nullable=False),
+            sa.PrimaryKeyConstraint("platform", "id", "ts"),
+        )
+
+    existing = {
+        index["name"]
+        for table in ("products", "price_history")
+        if table in tables
+        for index in inspector.get_indexes(table)
+    }
+    for name, table, columns in INDEXES:
+        if name not in existing:
+            op.create_index(name, table, columns)
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
+    op.drop_table("price_history")
+    op.drop_table("products")
@@ -0,0 +1,67 @@
+"""SQLite FTS5 index over product title, description and category.
+
+An external-content table kept in sync by triggers; the update trigger only
+fires when an indexed column is written. Skipped on other databases and on
+SQLite builds without FTS5 (search then falls back to LIKE).
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+from src.utils.logger import get_logger
+
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+logger = get_logger(__name__)
+
+TRIGGERS = (
+    "CREATE TRIGGER products_fts_insert AFTER INSERT ON products BEGIN "
+    "INSERT INTO products_fts(rowid, title, description, category) "
+    "VALUES (new.rowid, new.title, new.description, new.category); END",
+    "CREATE TRIGGER products_fts_delete AFTER DELETE ON products BEGIN "
+    "INSERT INTO products_fts(products_fts, rowid, title, description, category) "
+    "VALUES ('delete', old.rowid, old.title, old.description, old.category); END",
+    "CREATE TRIGGER products_fts_update "
+    "AFTER UPDATE OF title, description, category ON products BEGIN "
+    "INSERT INTO products_fts(products_fts, rowid, title, description, category) "
+    "VALUES ('delete', old.rowid, old.title, old.description, old.category); "
+    "INSERT INTO products_fts(rowid, title, description, category) "
+    "VALUES (new.rowid, new.title, new.description, new.category); END",
+)
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "sqlite":
+        return
+    try:
+        op.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS products_fts USING fts5("
+            "title, description, category, content='products', content_rowid='rowid')"
+        )
+    except sa.exc.OperationalError as e:
+        logger.warning(f"SQLite FTS5 unavailable, saved-product search uses LIKE: {e}")
+        return
+    # Replace triggers from earlier builds and index rows saved before the table existed
+    for action in ("insert", "delete", "update"):
+        op.execute(f"DROP TRIGGER IF EXISTS products_fts_{action}")
+    for statement in TRIGGERS:
+        op.execute(statement)
+    op.execute("INSERT INTO products_fts(products_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "sqlite":
+        return
+    for action in ("insert", "delete", "update"):
+        op.execute(f"DROP TRIGGER IF EXISTS products_fts_{action}")
+    op.execute("DROP TABLE IF EXISTS products_fts")
@@ -0,0 +1,31 @@
+"""Add products.fingerprint and products.last_seen for change detection.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    columns = {column["name"] for column in sa.inspect(op.get_bind()).get_columns("products")}
+    # Builds before migrations added these columns on startup
+    if "fingerprint" not in columns:
+        op.add_column("products", sa.Column("fingerprint", sa.String(32)))
+    if "last_seen" not in columns:
+        op.add_column("products", sa.Column("last_seen", sa.DateTime()))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("products") as batch:
+        batch.drop_column("last_seen")
+        batch.drop_column("fingerprint")
@@ -10,16 +10,25 @@ import sys
 from typing import Optional
 
 from rich.console import Console
+from rich.live import Live
 from rich.prompt import Confirm, Prompt
 from rich.table import Table
 
 from config.settings import settings
 from src.automation.content_generator import ContentGenerator
 from src.automation.social_media_poster import SocialMediaPoster
-from src.core.product_manager import ProductManager
+from src.core.base_affiliate import Product
+from src.core.product_manager import STATUS_OPEN, ProductManager
 from src.utils.logger import get_logger
 
 console = Console()
+
+# Saved products read per database page when scheduling posts
+SCHEDULE_BATCH_SIZE = 90
+# Saved matches shown by an offline or database-first search
+SAVED_SEARCH_LIMIT = 20
+# Top deals shown by the deals command
+BEST_DEALS_LIMIT = 10
 logger = get_logger(__name__)
 
 
@@ -29,14 +38,57 @@ class AffiliateAutomation:
             "amazon_associate_tag": settings.amazon_associate_tag,
             "amazon_access_key": settings.amazon_access_key,
             "amazon_secret_key": settings.amazon_secret_key,
+            "amazon_html_parser": settings.amazon_html_parser,
+            "amazon_rate_limit": settings.amazon_rate_limit,
+            "amazon_rate_burst": settings.amazon_rate_burst,
             "flipkart_affiliate_id": settings.flipkart_affiliate_id,
             "flipkart_affiliate_token": settings.flipkart_affiliate_token,
+            "flipkart_rate_limit": settings.flipkart_rate_limit,
+            "flipkart_rate_burst": settings.flipkart_rate_burst,
             "database_url": settings.database_url,
+            "db_pool_size": settings.db_pool_size,
+            "db_max_overflow": settings.db_max_overflow,
+            "db_pool_timeout": settings.db_pool_timeout,
+            "sqlite_tuning": settings.sqlite_tuning,
+            "sqlite_journal_mode": settings.sqlite_journal_mode,
+            "sqlite_synchronous": settings.sqlite_synchronous,
+            "sqlite_cache_size": settings.sqlite_cache_size,
+            "sqlite_mmap_size": settings.sqlite_mmap_size,
+            "sqlite_busy_timeout": settings.sqlite_busy_timeout,
+            "sqlite_temp_store": settings.sqlite_temp_store,
+            "write_behind_enabled": settings.write_behind_enabled,
+            "write_behind_batch_size": settings.write_behind_batch_size,
+            "write_behind_flush_interval": settings.write_behind_flush_interval,
+            "write_behind_max_pending": settings.write_behind_max_pending,
+            "write_behind_put_timeout": settings.write_behind_put_timeout,
             "openai_api_key": settings.openai_api_key,
             "twitter_api_key": settings.twitter_api_key,
             "twitter_api_secret": settings.twitter_api_secret,
             "twitter_access_token": settings.twitter_access_token,
             "twitter_access_token_secret": settings.twitter_access_token_secret,
+            "concurrent_providers": settings.concurrent_providers,
+            "provider_max_workers": settings.provider_max_workers,
+            "provider_timeout": settings.provider_timeout,
+            "search_timeout": settings.search_timeout,
+            "http_pool_connections": settings.http_pool_connections,
+            "http_pool_maxsize": settings.http_pool_maxsize,
+            "http_keep_alive": settings.http_keep_alive,
+            "share_http_session": settings.share_http_session,
+            "cache_enabled": settings.cache_enabled,
+            "cache_max_entries": settings.cache_max_entries,
+            "cache_max_bytes": settings.cache_max_bytes,
+            "cache_default_ttl": settings.cache_default_ttl,
+            "cache_ttls": settings.cache_ttls,
+            "cache_dir": settings.cache_dir,
+            "cache_disk_max_bytes": settings.cache_disk_max_bytes,
+            "circuit_breaker_enabled": settings.circuit_breaker_enabled,
+            "circuit_failure_threshold": settings.circuit_failure_threshold,
+            "circuit_window_size": settings.circuit_window_size,
+            "circuit_min_calls": settings.circuit_min_calls,
+            "circuit_reset_timeout": settings.circuit_reset_timeout,
+            "circuit_half_open_max_calls": settings.circuit_half_open_max_calls,
+            "async_providers": settings.async_providers,
+            "async_max_concurrency": settings.async_max_concurrency,
         }
 
         self.product_manager = ProductManager(self.config)
@@ -47,30 +99,64 @@ class AffiliateAutomation:
             SocialMediaPoster(self.config) if settings.twitter_api_key else None
         )
 
-    def search_products(self, query: str):
-        """Search products across all platforms."""
+    @staticmethod
+    def _search_table(title: str) -> Table:
+        table = Table(title=title)
+        table.add_column("Platform", style="magenta")
+        table.add_column("Title", style="cyan", no_wrap=False)
+        table.add_column("Price", style="green")
+        table.add_column("Rating", style="yellow")
+        table.add_column("Link", style="blue", no_wrap=True)
+        return table
+
+    @staticmethod
+    def _add_search_row(table: Table, platform: str, product: Product):
+        table.add_row(
+            platform.capitalize(),
+            product.title[:50] + "..." if len(product.title) > 50 else product.title,
+            f"${product.price:.2f}",
+            f"{product.rating or 'N/A'}",
+            (product.affiliate_url or product.url)[:30] + "...",
+        )
+
+    def search_saved_products(self, query: str) -> bool:
+        """Search the local product database; return whether anything matched."""
+        products = self.product_manager.search_saved(query, limit=SAVED_SEARCH_LIMIT)
+        if not products:
+            console.print(f"[yellow]No saved products match '{query}'[/yellow]")
+            return False
+
+        table = self._search_table("Saved Products")
+        for product in products:
+            self._add_search_row(table, product.platform, product)
+        console.print(table)
+        return True
+
+    def search_products(self, query: str, offline: bool = False, db_first: bool = False):
+        """Search products across all platforms.
+
+        ``offline`` searches only the saved products; ``db_first`` shows saved
+        matches when there are any and goes to the platforms otherwise.
+        """
         console.print(f"\n[bold cyan]Searching for:[/bold cyan] {query}")
 
-        results = self.product_manager.search_all_platforms(query)
-
-        for platform, products in results.items():
-            if products:
-                table = Table(title=f"{platform.capitalize()} Results")
-                table.add_column("Title", style="cyan", no_wrap=False)
-                table.add_column("Price", style="green")
-                table.add_column("Rating", style="yellow")
-                table.add_column("Link", style="blue", no_wrap=True)
-
-                for product in products[:5]:  # Show top 5
-                    table.add_row(
-                        product.title[:50] + "..." if len(product.title) > 50 else product.title,
-                        f"${product.price:.2f}",
-                        f"{product.rating or 'N/A'}",
-                        product.affiliate_url[:30] + "...",
-                    )
-
-                console.print(table)
-            else:
+        if offline or db_first:
+            if self.search_saved_products(query) or offline:
+                return
+
+        table = self._search_table("Search Results")
+
+        # Rows are rendered as each platform streams them in
+        with Live(table, console=console, refresh_per_second=8):
+            for platform, product in self.product_manager.iter_all_platforms(
+                query, max_per_platform=5
+            ):
+                self._add_search_row(table, platform, product)
+
+        for platform, status in self.product_manager.last_status.items():
+            if status.status == STATUS_OPEN:
+                console.print(f"[yellow]{platform} is unavailable, showing saved products[/yellow]")
+            if not status.value:
                 console.print(f"[yellow]No results found on {platform}[/yellow]")
 
     def compare_prices(self, product_name: str):
@@ -102,7 +188,7 @@ class AffiliateAutomation:
         """Get trending deals across platforms."""
         console.print("\n[bold cyan]Fetching trending deals...[/bold cyan]")
 
-        deals = self.product_manager.get_best_deals(min_discount=20.0)
+        deals = self.product_manager.get_best_deals(min_discount=20.0, limit=BEST_DEALS_LIMIT)
 
         if deals:
             table = Table(title="Best Deals")
@@ -111,7 +197,7 @@ class AffiliateAutomation:
             table.add_column("Price", style="green")
             table.add_column("Discount", style="red")
 
-            for deal in deals[:10]:  # Top 10 deals
+            for deal in deals:
                 table.add_row(
                     deal.platform,
                     deal.title[:40] + "..." if len(deal.title) > 40 else deal.title,
@@ -148,7 +234,10 @@ class AffiliateAutomation:
 
             # Save to database
             self.product_manager.save_product(product)
-            console.print("\n[green]Product saved to database![/green]")
+            if self.product_manager.flush_writes():
+                console.print("\n[red]Product could not be saved to database[/red]")
+            else:
+                console.print("\n[green]Product saved to database![/green]")
 
     def schedule_posts(self):
         """Schedule social media posts."""
@@ -158,8 +247,16 @@ class AffiliateAutomation:
             )
             return
 
-        # Get saved products
-        products = self.product_manager.get_saved_products()
+        # Every saved product, best deals first; the ordering happens in the database
+        products, cursor = [], None
+        while True:
+            page = self.product_manager.query_saved_products(
+                order_by="discount_percentage", limit=SCHEDULE_BATCH_SIZE, after=cursor
+            )
+            products.extend(page.products)
+            if page.next_cursor is None:
+                break
+            cursor = page.next_cursor
 
         if products:
             console.print(f"\n[bold cyan]Scheduling posts for {len(products)} products[/bold cyan]")
@@ -181,6 +278,16 @@ def main():
     parser.add_argument("--query", "-q", help="Search query or product name")
     parser.add_argument("--product-id", "-p", help="Product ID for content generation")
     parser.add_argument("--platform", "-pl", help="Platform name (amazon, flipkart)")
+    parser.add_argument(
+        "--offline",
+        action="store_true",
+        help="Search saved products only, without contacting the platforms",
+    )
+    parser.add_argument(
+        "--db-first",
+        action="store_true",
+        help="Show saved matches and only search the platforms when there are none",
+    )
 
     args = parser.parse_args()
 
@@ -190,7 +297,7 @@ def main():
         if args.command == "search":
             if not args.query:
                 args.query = Prompt.ask("Enter search query")
-            automation.search_products(args.query)
+            automation.search_products(args.query, offline=args.offline, db_first=args.db_first)
 
         elif args.command == "compare":
             if not args.query:
@@ -217,6 +324,8 @@ def main():
         logger.error(f"Error: {e}")
         console.print(f"[red]Error: {e}[/red]")
         sys.exit(1)
+    finally:
+        automation.product_manager.close()
 
 
 if __name__ == "__main__":
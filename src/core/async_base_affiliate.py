@@ -0,0 +1,224 @@
+import asyncio
+import threading
+from abc import ABC, abstractmethod
+from contextlib import nullcontext
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import aiohttp
+
+from ..utils.cache import ResponseCache
+from ..utils.circuit_breaker import CircuitBreaker, CircuitOpenError
+from ..utils.deadline import deadline_scope, remaining
+from ..utils.http import DEFAULT_POOL_CONNECTIONS, DEFAULT_POOL_MAXSIZE, THROTTLE_STATUS_CODES
+from ..utils.rate_limit import parse_retry_after, rate_limiters
+from .base_affiliate import BaseAffiliateProvider, LookupResult, Product
+
+DEFAULT_TIMEOUT = 30
+
+
+class AsyncBaseAffiliateProvider(ABC):
+    """Asyncio counterpart of BaseAffiliateProvider."""
+
+    def __init__(self, config: Dict[str, Any]):
+        self.config = config
+        self.platform_name = self.__class__.__name__.replace("Async", "").replace("Affiliate", "")
+        self._session: Optional[aiohttp.ClientSession] = config.get("aiohttp_session")
+        self._owns_session = self._session is None
+        self.cache: Optional[ResponseCache] = config.get("response_cache")
+        self.breaker: Optional[CircuitBreaker] = config.get("circuit_breaker")
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """Pooled keep-alive client session, created on first use inside the event loop."""
+        if self._session is None or self._session.closed:
+            pool_maxsize = self.config.get("http_pool_maxsize") or DEFAULT_POOL_MAXSIZE
+            pool_connections = self.config.get("http_pool_connections") or DEFAULT_POOL_CONNECTIONS
+            connector = aiohttp.TCPConnector(
+                limit=pool_connections * pool_maxsize,
+                limit_per_host=pool_maxsize,
+                force_close=not self.config.get("http_keep_alive", True),
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=DEFAULT_TIMEOUT),
+            )
+        return self._session
+
+    async def _throttle(self, url: str):
+        """Wait for a token from the host's shared rate limiter."""
+        bucket = rate_limiters.for_url(url)
+        if bucket is not None:
+            await bucket.acquire_async()
+
+    def _guard(self):
+        """Circuit-breaker scope for one request; a no-op without a breaker."""
+        return self.breaker.guard() if self.breaker is not None else nullcontext()
+
+    def _check_throttled(self, url: str, response: aiohttp.ClientResponse):
+        """Pause the host's limiter when the response asks us to back off."""
+        if response.status in THROTTLE_STATUS_CODES:
+            bucket = rate_limiters.for_url(url)
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            if bucket is not None and retry_after:
+                bucket.pause(retry_after)
+
+    async def _http_get(
+        self,
+        url: str,
+        params: Optional[Dict] = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: float = DEFAULT_TIMEOUT,
+        validate: Optional[Callable[[bytes], None]] = None,
+    ) -> bytes:
+        """GET a URL through the response cache (when configured) and return the body.
+
+        Same contract as ``BaseAffiliateProvider._http_get``: the cache, its
+        revalidation and the stale copy served while the circuit is open work
+        the same for async providers.
+        """
+        try:
+            return await self._fetch(url, params, headers, timeout, validate)
+        except CircuitOpenError:
+            entry = self.cache.get(self.cache.make_key(url, params)) if self.cache else None
+            if entry is None:
+                raise
+            return entry.body
+
+    async def _fetch(
+        self,
+        url: str,
+        params: Optional[Dict],
+        headers: Optional[Dict[str, str]],
+        timeout: float,
+        validate: Optional[Callable[[bytes], None]],
+    ) -> bytes:
+        async def send(request_headers: Dict[str, str]):
+            await self._throttle(url)
+            async with self.session.get(
+                url,
+                headers=request_headers,
+                params=params,
+                timeout=aiohttp.ClientTimeout(total=timeout),
+            ) as response:
+                self._check_throttled(url, response)
+                response.raise_for_status()
+                return response.status, response.headers, await response.read()
+
+        if self.cache is not None:
+            guard = self.breaker.guard if self.breaker is not None else None
+            return await self.cache.fetch_async(
+                send, url, params=params, headers=headers, validate=validate, guard=guard
+            )
+        with self._guard():
+            _, _, body = await send(dict(headers or {}))
+            if validate is not None:
+                validate(body)
+        return body
+
+    async def close(self):
+        """Close the client session if this provider created it."""
+        if self._owns_session and self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    @abstractmethod
+    async def search_products(self, query: str, **kwargs) -> List[Product]:
+        """Search for products on the platform."""
+        pass
+
+    @abstractmethod
+    async def get_product_details(self, product_id: str) -> Optional[Product]:
+        """Get detailed information about a specific product."""
+        pass
+
+    @abstractmethod
+    async def get_trending_products(self, category: Optional[str] = None) -> List[Product]:
+        """Get trending/popular products."""
+        pass
+
+    async def _lookup_product(self, product_id: str) -> Optional[Product]:
+        """Fetch one product, letting errors propagate so batch lookups can report them."""
+        return await self.get_product_details(product_id)
+
+    async def get_product_details_many(
+        self, product_ids: Iterable[str], max_concurrency: Optional[int] = None
+    ) -> Dict[str, LookupResult]:
+        """Get details for many products, keyed by product ID.
+
+        Same contract as ``BaseAffiliateProvider.get_product_details_many``, with
+        concurrency bounded by a semaphore instead of a thread pool.
+        """
+        ids = list(dict.fromkeys(pid for pid in product_ids if pid))
+        semaphore = asyncio.Semaphore(
+            max_concurrency or self.config.get("detail_max_workers") or 32
+        )
+
+        async def lookup(product_id: str) -> LookupResult:
+            async with semaphore:
+                try:
+                    product = await self._lookup_product(product_id)
+                except Exception as e:
+                    return LookupResult(error=str(e))
+            return LookupResult(product=product, error=None if product else "not found")
+
+        return dict(zip(ids, await asyncio.gather(*(lookup(pid) for pid in ids))))
+
+    @abstractmethod
+    def generate_affiliate_link(self, product_url: str) -> str:
+        """Generate affiliate link for a product."""
+        pass
+
+
+async def _with_deadline(coro, seconds: Optional[float]):
+    with deadline_scope(seconds):
+        return await coro
+
+
+class SyncProviderAdapter(BaseAffiliateProvider):
+    """Expose an async provider through the blocking BaseAffiliateProvider interface.
+
+    The wrapped provider runs on a private event loop in a daemon thread, so the
+    adapter can be called from any thread, including ProductManager's worker pool.
+    """
+
+    def __init__(self, provider: AsyncBaseAffiliateProvider):
+        super().__init__(provider.config)
+        self.provider = provider
+        self.platform_name = provider.platform_name
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever, name=f"{self.platform_name}-loop", daemon=True
+        )
+        self._thread.start()
+
+    def _run(self, coro):
+        # The loop thread has its own context; carry the caller's deadline across
+        return asyncio.run_coroutine_threadsafe(
+            _with_deadline(coro, remaining()), self._loop
+        ).result()
+
+    def get_required_config_fields(self) -> List[str]:
+        # The wrapped provider validates its own configuration
+        return []
+
+    def search_products(self, query: str, **kwargs) -> List[Product]:
+        return self._run(self.provider.search_products(query, **kwargs))
+
+    def get_product_details(self, product_id: str) -> Optional[Product]:
+        return self._run(self.provider.get_product_details(product_id))
+
+    def get_trending_products(self, category: Optional[str] = None) -> List[Product]:
+        return self._run(self.provider.get_trending_products(category))
+
+    def get_product_details_many(
+        self, product_ids: Iterable[str], max_workers: Optional[int] = None
+    ) -> Dict[str, LookupResult]:
+        return self._run(self.provider.get_product_details_many(product_ids, max_workers))
+
+    def generate_affiliate_link(self, product_url: str) -> str:
+        return self.provider.generate_affiliate_link(product_url)
+
+    def close(self):
+        if self._loop.is_running():
+            self._run(self.provider.close())
+            self._loop.call_soon_threadsafe(self._loop.stop)
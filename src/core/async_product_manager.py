@@ -0,0 +1,221 @@
+import asyncio
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from ..platforms.amazon.async_amazon_affiliate import AsyncAmazonAffiliate
+from ..platforms.flipkart.async_flipkart_affiliate import AsyncFlipkartAffiliate
+from ..utils.circuit_breaker import OPEN, CircuitBreaker, breaker_from_config
+from ..utils.deadline import deadline_scope
+from ..utils.logger import get_logger
+from .async_base_affiliate import AsyncBaseAffiliateProvider
+from .base_affiliate import Product
+from .product_manager import (
+    STATUS_ERROR,
+    STATUS_OK,
+    STATUS_OPEN,
+    STATUS_TIMEOUT,
+    PlatformResult,
+    top_deals,
+)
+
+logger = get_logger(__name__)
+
+
+class AsyncProductManager:
+    """Asyncio facade over the async providers.
+
+    Every provider call goes through one semaphore, so thousands of lookups can be
+    scheduled on a single event loop while at most ``max_concurrency`` are in flight.
+    """
+
+    def __init__(self, config: Dict[str, Any], max_concurrency: Optional[int] = None):
+        self.config = config
+        self.providers: Dict[str, AsyncBaseAffiliateProvider] = {}
+        self.max_concurrency = max_concurrency or config.get("async_max_concurrency") or 100
+        self.provider_timeout = config.get("provider_timeout") or 20.0
+        self.provider_timeouts: Dict[str, float] = config.get("provider_timeouts") or {}
+        self.total_timeout = config.get("search_timeout") or 30.0
+        self.last_status: Dict[str, PlatformResult] = {}
+        # Created lazily so it binds to the loop that actually runs the calls
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        self._initialize_providers()
+
+    def _create_breaker(self, name: str) -> Optional[CircuitBreaker]:
+        breaker = breaker_from_config(name, self.config)
+        if breaker is not None:
+            self.breakers[name] = breaker
+        return breaker
+
+    def _initialize_providers(self):
+        """Initialize available async affiliate providers."""
+        if self.config.get("amazon_associate_tag"):
+            self.providers["amazon"] = AsyncAmazonAffiliate(
+                {
+                    "amazon_associate_tag": self.config["amazon_associate_tag"],
+                    "amazon_html_parser": self.config.get("amazon_html_parser"),
+                    "amazon_rate_limit": self.config.get("amazon_rate_limit"),
+                    "amazon_rate_burst": self.config.get("amazon_rate_burst"),
+                    "circuit_breaker": self._create_breaker("amazon"),
+                    "http_pool_connections": self.config.get("http_pool_connections"),
+                    "http_pool_maxsize": self.config.get("http_pool_maxsize"),
+                    "http_keep_alive": self.config.get("http_keep_alive", True),
+                }
+            )
+            logger.info("Async Amazon affiliate provider initialized")
+
+        if self.config.get("flipkart_affiliate_id"):
+            self.providers["flipkart"] = AsyncFlipkartAffiliate(
+                {
+                    "flipkart_affiliate_id": self.config["flipkart_affiliate_id"],
+                    "flipkart_affiliate_token": self.config["flipkart_affiliate_token"],
+                    "flipkart_rate_limit": self.config.get("flipkart_rate_limit"),
+                    "flipkart_rate_burst": self.config.get("flipkart_rate_burst"),
+                    "circuit_breaker": self._create_breaker("flipkart"),
+                    "http_pool_connections": self.config.get("http_pool_connections"),
+                    "http_pool_maxsize": self.config.get("http_pool_maxsize"),
+                    "http_keep_alive": self.config.get("http_keep_alive", True),
+                }
+            )
+            logger.info("Async Flipkart affiliate provider initialized")
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    def _get_provider_timeout(self, platform_name: str) -> float:
+        return self.provider_timeouts.get(platform_name, self.provider_timeout)
+
+    async def _call_provider(
+        self, platform_name: str, method: str, *args, **kwargs
+    ) -> PlatformResult:
+        """Await a provider method under the concurrency limit and its deadline.
+
+        Providers whose circuit is open are skipped without taking a slot.
+        """
+        breaker = self.breakers.get(platform_name)
+        if breaker is not None and breaker.state == OPEN:
+            return PlatformResult(platform_name, STATUS_OPEN, error="circuit open")
+        async with self._get_semaphore():
+            start = time.monotonic()
+            timeout = self._get_provider_timeout(platform_name)
+            try:
+                with deadline_scope(timeout):
+                    value = await asyncio.wait_for(
+                        getattr(self.providers[platform_name], method)(*args, **kwargs),
+                        timeout=timeout,
+                    )
+                return PlatformResult(
+                    platform_name, STATUS_OK, value=value, elapsed=time.monotonic() - start
+                )
+            except asyncio.TimeoutError:
+                logger.warning(f"{platform_name} did not answer {method} in time")
+                return PlatformResult(
+                    platform_name,
+                    STATUS_TIMEOUT,
+                    error="deadline exceeded",
+                    elapsed=time.monotonic() - start,
+                )
+            except Exception as e:
+                logger.error(f"Error calling {method} on {platform_name}: {e}")
+                return PlatformResult(
+                    platform_name, STATUS_ERROR, error=str(e), elapsed=time.monotonic() - start
+                )
+
+    async def fan_out(
+        self, method: str, *args, timeout: Optional[float] = None, **kwargs
+    ) -> Dict[str, PlatformResult]:
+        """Call ``method`` on every provider concurrently within a global budget."""
+        budget = self.total_timeout if timeout is None else timeout
+        tasks = {
+            name: asyncio.ensure_future(self._call_provider(name, method, *args, **kwargs))
+            for name in self.providers
+        }
+        if tasks:
+            await asyncio.wait(tasks.values(), timeout=budget)
+
+        results = {}
+        for name, task in tasks.items():
+            if task.done():
+                results[name] = task.result()
+            else:
+                task.cancel()
+                results[name] = PlatformResult(
+                    name, STATUS_TIMEOUT, error="deadline exceeded", elapsed=budget
+                )
+
+        self.last_status = results
+        return results
+
+    async def search_all_platforms(
+        self, query: str, max_per_platform: int = 5
+    ) -> Dict[str, List[Product]]:
+        """Search products across all platforms."""
+        results = await self.fan_out("search_products", query, max_results=max_per_platform)
+        return {name: result.value if result.ok else [] for name, result in results.items()}
+
+    async def get_best_deals(
+        self,
+        category: Optional[str] = None,
+        min_discount: float = 10.0,
+        limit: Optional[int] = None,
+    ) -> List[Product]:
+        """Get best deals across all platforms; with ``limit`` only the top ones."""
+        results = (await self.fan_out("get_trending_products", category)).values()
+        product_lists = [result.value for result in results if result.ok]
+        if limit is not None:
+            return top_deals(product_lists, min_discount, limit)
+
+        all_deals = [
+            p
+            for products in product_lists
+            for p in products
+            if p.discount_percentage and p.discount_percentage >= min_discount
+        ]
+        all_deals.sort(key=lambda x: x.discount_percentage or 0, reverse=True)
+        return all_deals
+
+    async def compare_prices(self, product_name: str) -> Dict[str, Product]:
+        """Compare prices for similar products across platforms."""
+        results = await self.fan_out("search_products", product_name, max_results=1)
+        return {
+            name: result.value[0] for name, result in results.items() if result.ok and result.value
+        }
+
+    async def search_many(
+        self, queries: Iterable[str], max_per_platform: int = 5
+    ) -> Dict[str, Dict[str, List[Product]]]:
+        """Run many searches concurrently, keyed by query then platform."""
+        queries = list(dict.fromkeys(queries))
+        calls = [
+            self._call_provider(name, "search_products", query, max_results=max_per_platform)
+            for query in queries
+            for name in self.providers
+        ]
+        results: Dict[str, Dict[str, List[Product]]] = {query: {} for query in queries}
+        pairs = [(query, name) for query in queries for name in self.providers]
+        for (query, name), result in zip(pairs, await asyncio.gather(*calls)):
+            results[query][name] = result.value if result.ok else []
+        return results
+
+    async def lookup_many(
+        self, items: Iterable[Tuple[str, str]]
+    ) -> Dict[Tuple[str, str], Optional[Product]]:
+        """Fetch product details for many ``(platform, product_id)`` pairs."""
+        keys = [key for key in dict.fromkeys(items) if key[0] in self.providers]
+        results = await asyncio.gather(
+            *(self._call_provider(platform, "get_product_details", pid) for platform, pid in keys)
+        )
+        return {key: result.value if result.ok else None for key, result in zip(keys, results)}
+
+    async def close(self):
+        """Close all provider sessions."""
+        for provider in self.providers.values():
+            await provider.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
@@ -1,10 +1,34 @@
+import contextvars
+import json
+import sys
 from abc import ABC, abstractmethod
-from dataclasses import dataclass, field
-from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from dataclasses import dataclass, field, fields
+from datetime import datetime, timedelta, timezone
+from operator import attrgetter
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+from urllib.parse import urlparse
 
+import requests
 
-@dataclass
+from ..utils.cache import ResponseCache
+from ..utils.circuit_breaker import CircuitBreaker, CircuitOpenError
+from ..utils.http import session_from_config
+from ..utils.rate_limit import rate_limiters
+
+# Slotted on Python 3.10+ so products carry no per-instance __dict__
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+# Product.to_bytes format: this version byte, then a compact JSON array of the field
+# values in declaration order with last_updated as integer microseconds since the epoch
+_CODEC_VERSION = b"\x01"
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+_encode_json = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False).encode
+
+
+@dataclass(**_SLOTS)
 class Product:
     """Universal product model for all platforms."""
 
@@ -41,6 +65,51 @@ class Product:
             "last_updated": self.last_updated.isoformat(),
         }
 
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Product":
+        """Build a product from ``to_dict`` output; keys that are not fields are ignored."""
+        values = {name: data[name] for name in _PRODUCT_FIELDS if name in data}
+        last_updated = values.get("last_updated")
+        if isinstance(last_updated, str):
+            values["last_updated"] = datetime.fromisoformat(last_updated)
+        return cls(**values)
+
+    def to_bytes(self) -> bytes:
+        """Compact binary encoding for caches, queues and exports (see ``from_bytes``).
+
+        A naive ``last_updated`` is taken as UTC, which is how the database stores it;
+        decoding always returns an aware UTC timestamp.
+        """
+        last_updated = self.last_updated
+        if last_updated.tzinfo is None:
+            last_updated = last_updated.replace(tzinfo=timezone.utc)
+        micros = (last_updated - _EPOCH) // _MICROSECOND
+        return _CODEC_VERSION + _encode_json((*_codec_values(self), micros)).encode()
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "Product":
+        if data[:1] != _CODEC_VERSION:
+            raise ValueError(f"Unsupported product encoding {data[:1]!r}")
+        *values, micros = json.loads(data[1:])
+        return cls(*values, _EPOCH + timedelta(microseconds=micros))
+
+
+_PRODUCT_FIELDS = tuple(f.name for f in fields(Product))
+# Every field but last_updated, which is encoded separately
+_codec_values = attrgetter(*_PRODUCT_FIELDS[:-1])
+
+
+@dataclass
+class LookupResult:
+    """Outcome of one ID in a batch product lookup."""
+
+    product: Optional[Product] = None
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.product is not None
+
 
 class BaseAffiliateProvider(ABC):
     """Abstract base class for affiliate providers."""
@@ -48,17 +117,134 @@ class BaseAffiliateProvider(ABC):
     def __init__(self, config: Dict[str, Any]):
         self.config = config
         self.platform_name = self.__class__.__name__.replace("Affiliate", "")
+        # A session handed in through the config is shared with other providers and
+        # owned by the caller; otherwise the provider lazily creates its own pool.
+        self._session: Optional[requests.Session] = config.get("http_session")
+        self._owns_session = self._session is None
+        self.cache: Optional[ResponseCache] = config.get("response_cache")
+        self.breaker: Optional[CircuitBreaker] = config.get("circuit_breaker")
+
+    def _configure_rate_limit(self, url: str, prefix: str):
+        """Register the ``<prefix>_rate_limit``/``_rate_burst`` settings for the URL's host."""
+        rate = self.config.get(f"{prefix}_rate_limit")
+        if rate:
+            host = urlparse(url).hostname
+            rate_limiters.configure(host, rate, self.config.get(f"{prefix}_rate_burst") or 1)
+
+    @property
+    def session(self) -> requests.Session:
+        """Pooled keep-alive HTTP session used for all requests of this provider."""
+        if self._session is None:
+            self._session = session_from_config(self.config)
+        return self._session
+
+    def _http_get(
+        self,
+        url: str,
+        params: Optional[Dict] = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: float = 30,
+        validate: Optional[Callable[[bytes], None]] = None,
+    ) -> bytes:
+        """GET a URL through the response cache (when configured) and return the body.
+
+        ``validate`` may raise to reject a body. With a circuit breaker configured
+        every request that reaches the provider counts towards its health (fresh
+        cache hits do not); while the circuit is open requests fail fast with
+        ``CircuitOpenError``, or are answered from a cached copy of the response,
+        however stale.
+        """
+        try:
+            return self._fetch(url, params, headers, timeout, validate)
+        except CircuitOpenError:
+            entry = self.cache.get(self.cache.make_key(url, params)) if self.cache else None
+            if entry is None:
+                raise
+            return entry.body
+
+    def _fetch(
+        self,
+        url: str,
+        params: Optional[Dict],
+        headers: Optional[Dict[str, str]],
+        timeout: float,
+        validate: Optional[Callable[[bytes], None]],
+    ) -> bytes:
+        guard = self.breaker.guard if self.breaker is not None else None
+        if self.cache is not None:
+            return self.cache.fetch(
+                self.session,
+                url,
+                params=params,
+                headers=headers,
+                timeout=timeout,
+                validate=validate,
+                guard=guard,
+            )
+        with guard() if guard is not None else nullcontext():
+            response = self.session.get(url, headers=headers, params=params, timeout=timeout)
+            response.raise_for_status()
+            if validate is not None:
+                validate(response.content)
+        return response.content
+
+    def close(self):
+        """Close the HTTP session if this provider created it."""
+        if self._owns_session and self._session is not None:
+            self._session.close()
+            self._session = None
 
     @abstractmethod
     def search_products(self, query: str, **kwargs) -> List[Product]:
         """Search for products on the platform."""
         pass
 
+    def iter_search_products(
+        self, query: str, max_results: int = 10, **kwargs
+    ) -> Iterator[Product]:
+        """Yield search results one at a time as they are parsed.
+
+        The default implementation falls back to ``search_products``; providers that
+        can parse incrementally override it.
+        """
+        yield from self.search_products(query, max_results=max_results, **kwargs)
+
     @abstractmethod
     def get_product_details(self, product_id: str) -> Optional[Product]:
         """Get detailed information about a specific product."""
         pass
 
+    def _lookup_product(self, product_id: str) -> Optional[Product]:
+        """Fetch one product, letting errors propagate so batch lookups can report them."""
+        return self.get_product_details(product_id)
+
+    def get_product_details_many(
+        self, product_ids: Iterable[str], max_workers: Optional[int] = None
+    ) -> Dict[str, LookupResult]:
+        """Get details for many products, keyed by product ID.
+
+        IDs are deduplicated and fetched with bounded concurrency; failures are
+        reported per ID instead of aborting the batch. Providers with a native
+        multi-ID endpoint override this method.
+        """
+        ids = list(dict.fromkeys(pid for pid in product_ids if pid))
+        if not ids:
+            return {}
+
+        def lookup(product_id: str) -> LookupResult:
+            try:
+                product = self._lookup_product(product_id)
+            except Exception as e:
+                return LookupResult(error=str(e))
+            return LookupResult(product=product, error=None if product else "not found")
+
+        workers = max_workers or self.config.get("detail_max_workers") or 8
+        # Run each lookup in a copy of the caller's context so its deadline applies
+        contexts = [contextvars.copy_context() for _ in ids]
+        with ThreadPoolExecutor(max_workers=min(workers, len(ids))) as executor:
+            results = executor.map(lambda ctx, pid: ctx.run(lookup, pid), contexts, ids)
+            return dict(zip(ids, results))
+
     @abstractmethod
     def generate_affiliate_link(self, product_url: str) -> str:
         """Generate affiliate link for a product."""
@@ -0,0 +1,149 @@
+from typing import Dict, Iterable, List, Optional, Sequence, Union
+
+import numpy as np
+
+from .base_affiliate import Product
+
+# Stored as float64 columns; missing values are NaN
+NUMERIC_FIELDS = ("price", "original_price", "discount_percentage", "rating", "review_count")
+STRING_FIELDS = ("id", "title", "platform", "category")
+
+Key = Union[str, np.ndarray]
+
+
+class ProductBatch:
+    """Column-oriented view of many products for vectorized filtering and ranking.
+
+    Numeric fields are float64 NumPy arrays (NaN where a product has no value)
+    and string fields object arrays. A column is built from the products the
+    first time it is used and shared by every batch derived from this one, so
+    filtering by discount only ever converts ``discount_percentage``. Derived
+    batches hold an index into the original products; ``to_products`` returns
+    those objects, not copies. Orderings are stable: products that tie keep
+    their input order, exactly like ``list.sort``.
+    """
+
+    def __init__(
+        self,
+        products: Sequence[Product],
+        index: Optional[np.ndarray] = None,
+        _columns: Optional[Dict[str, np.ndarray]] = None,
+    ):
+        self._products = products
+        self.index = np.arange(len(products)) if index is None else index
+        self._columns = {} if _columns is None else _columns
+
+    @classmethod
+    def from_products(cls, products: Iterable[Product]) -> "ProductBatch":
+        return cls(list(products))
+
+    def to_products(self) -> List[Product]:
+        products = self._products
+        return [products[i] for i in self.index.tolist()]
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def __getitem__(self, selection: Union[np.ndarray, slice, Sequence[int]]) -> "ProductBatch":
+        """Subset by boolean mask, index array or slice."""
+        return ProductBatch(self._products, self.index[selection], self._columns)
+
+    def column(self, name: str) -> np.ndarray:
+        """Values of one field for the products in this batch."""
+        values = self._columns.get(name)
+        if values is None:
+            if name in NUMERIC_FIELDS:
+                # float64 conversion turns None into NaN
+                values = np.array([getattr(p, name) for p in self._products], dtype=np.float64)
+            elif name in STRING_FIELDS:
+                values = np.empty(len(self._products), dtype=object)
+                values[:] = [getattr(p, name) for p in self._products]
+            else:
+                raise KeyError(name)
+            self._columns[name] = values
+        return values[self.index]
+
+    def __getattr__(self, name: str) -> np.ndarray:
+        if name in NUMERIC_FIELDS or name in STRING_FIELDS:
+            return self.column(name)
+        raise AttributeError(name)
+
+    def mask(
+        self,
+        min_discount: Optional[float] = None,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        min_rating: Optional[float] = None,
+        min_reviews: Optional[int] = None,
+        platform: Optional[str] = None,
+        category: Optional[str] = None,
+    ) -> np.ndarray:
+        """Boolean mask of the products meeting every given condition.
+
+        Products missing a value never meet a condition on it, and with
+        ``min_discount`` products without any discount are left out.
+        """
+        keep = np.ones(len(self), dtype=bool)
+        if min_discount is not None:
+            discount = self.column("discount_percentage")
+            keep &= (discount >= min_discount) & (discount != 0)
+        if min_price is not None:
+            keep &= self.column("price") >= min_price
+        if max_price is not None:
+            keep &= self.column("price") <= max_price
+        if min_rating is not None:
+            keep &= self.column("rating") >= min_rating
+        if min_reviews is not None:
+            keep &= self.column("review_count") >= min_reviews
+        if platform is not None:
+            keep &= self.column("platform") == platform
+        if category is not None:
+            keep &= self.column("category") == category
+        return keep
+
+    def filter(self, **conditions) -> "ProductBatch":
+        """Products meeting every condition (see ``mask``), in their current order."""
+        return self[self.mask(**conditions)]
+
+    def score(self, weights: Dict[str, float]) -> np.ndarray:
+        """Weighted sum of numeric columns, with missing values counting as 0."""
+        total = np.zeros(len(self))
+        for name, weight in weights.items():
+            total += weight * np.nan_to_num(self.column(name))
+        return total
+
+    def _sort_values(self, key: Key, descending: bool) -> np.ndarray:
+        """Values whose stable ascending order is the wanted order, missing values last."""
+        values = self.column(key) if isinstance(key, str) else np.array(key, dtype=np.float64)
+        if descending:
+            np.negative(values, out=values)
+        values[np.isnan(values)] = np.inf
+        return values
+
+    def order(self, key: Key = "discount_percentage", descending: bool = True) -> np.ndarray:
+        """Stable index order by a numeric column name or an array of scores."""
+        return np.argsort(self._sort_values(key, descending), kind="stable")
+
+    def rank(self, key: Key = "discount_percentage", descending: bool = True) -> "ProductBatch":
+        """All products sorted by ``key``; missing values sort last."""
+        return self[self.order(key, descending)]
+
+    def top_k(
+        self, k: int, key: Key = "discount_percentage", descending: bool = True
+    ) -> "ProductBatch":
+        """The first ``k`` products of ``rank(key)`` without sorting the whole batch.
+
+        ``argpartition`` finds the k-th value in linear time; everything before it
+        plus the earliest products tied with it are then sorted.
+        """
+        if k >= len(self):
+            return self.rank(key, descending)
+        if k <= 0:
+            return self[np.array([], dtype=np.intp)]
+        values = self._sort_values(key, descending)
+        kth = values[np.argpartition(values, k - 1)[k - 1]]
+        ahead = np.flatnonzero(values < kth)
+        tied = np.flatnonzero(values == kth)[: k - len(ahead)]
+        chosen = np.concatenate([ahead, tied])
+        chosen.sort()  # input order, so the stable sort below breaks ties like rank()
+        return self[chosen[np.argsort(values[chosen], kind="stable")]]
@@ -1,14 +1,182 @@
+import heapq
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from itertools import chain, islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 
 from ..platforms.amazon.amazon_affiliate import AmazonAffiliate
+from ..platforms.amazon.async_amazon_affiliate import AsyncAmazonAffiliate
+from ..platforms.flipkart.async_flipkart_affiliate import AsyncFlipkartAffiliate
 from ..platforms.flipkart.flipkart_affiliate import FlipkartAffiliate
-from ..utils.database import Database
+from ..utils.cache import cache_from_config
+from ..utils.circuit_breaker import OPEN, CircuitBreaker, breaker_from_config
+from ..utils.database import PriceDrop, ProductPage, SaveStats, database_from_config
+from ..utils.deadline import deadline_scope
+from ..utils.http import session_from_config
 from ..utils.logger import get_logger
-from .base_affiliate import BaseAffiliateProvider, Product
+from ..utils.write_behind import writer_from_config
+from .async_base_affiliate import SyncProviderAdapter
+from .base_affiliate import BaseAffiliateProvider, LookupResult, Product
+from .product_batch import ProductBatch
 
 logger = get_logger(__name__)
 
+STATUS_OK = "ok"
+STATUS_ERROR = "error"
+STATUS_TIMEOUT = "timeout"
+# The provider's circuit is open; ``value`` holds saved products instead
+STATUS_OPEN = "circuit_open"
+
+# Marks the end of one provider's stream in iter_all_platforms
+_DONE = object()
+
+# Trending sets at least this large are filtered and ranked as a ProductBatch
+BATCH_MIN_PRODUCTS = 1_000_000
+
+
+def _discount(product: Product) -> Optional[float]:
+    return product.discount_percentage
+
+
+def _deals(products: Iterable[Product], min_discount: float) -> Iterator[Product]:
+    return (p for p in products if p.discount_percentage and p.discount_percentage >= min_discount)
+
+
+def top_deals(
+    product_lists: Iterable[Iterable[Product]], min_discount: float, limit: int
+) -> List[Product]:
+    """The ``limit`` highest-discount products of at least ``min_discount`` percent.
+
+    Each list is cut to its own best ``limit`` deals with a bounded heap, then the
+    sorted runs are merged lazily and the merge stops after ``limit`` products, so
+    the lists are never concatenated or fully sorted. Ties keep their input order:
+    the result equals the first ``limit`` of the stably sorted concatenation.
+    """
+    runs = [
+        heapq.nlargest(limit, _deals(products, min_discount), key=_discount)
+        for products in product_lists
+    ]
+    return list(islice(heapq.merge(*runs, key=_discount, reverse=True), limit))
+
+
+@dataclass
+class PlatformResult:
+    """Outcome of a single provider call made during a fan-out."""
+
+    platform: str
+    status: str
+    value: Any = None
+    error: Optional[str] = None
+    elapsed: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.status == STATUS_OK
+
+    @property
+    def usable(self) -> bool:
+        """True when ``value`` holds data, fresh or served from the database fallback."""
+        return self.status in (STATUS_OK, STATUS_OPEN) and self.value is not None
+
+
+class _PlatformStreams:
+    """Fan-in behind ``iter_all_platforms``: providers stream into one bounded buffer.
+
+    ``produce`` runs once per provider on the worker pool. Iterating yields
+    ``(platform, product)`` pairs in arrival order until every provider has
+    finished or missed its deadline; per-platform outcomes are kept in ``status``.
+    Setting ``stop`` makes the producers give up at their next product.
+    """
+
+    def __init__(
+        self,
+        manager: "ProductManager",
+        query: str,
+        max_per_platform: int,
+        deadlines: Dict[str, float],
+        start: float,
+    ):
+        self.manager = manager
+        self.query = query
+        self.max_per_platform = max_per_platform
+        self.deadlines = deadlines
+        self.start = start
+        self.buffer: queue.Queue = queue.Queue(maxsize=manager.stream_buffer)
+        self.stop = threading.Event()
+        self.open_circuits = {name for name in manager.providers if manager._circuit_open(name)}
+        self.status = {
+            name: PlatformResult(
+                name, STATUS_OPEN if name in self.open_circuits else STATUS_OK, value=0
+            )
+            for name in manager.providers
+        }
+        self.pending = set(manager.providers)
+
+    def _put(self, item) -> bool:
+        while not self.stop.is_set():
+            try:
+                self.buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce(self, name: str):
+        try:
+            with deadline_scope(self.deadlines[name] - time.monotonic()):
+                for product in self.manager._stream_source(
+                    name, self.query, self.max_per_platform, name in self.open_circuits
+                ):
+                    if not self._put((name, product)):
+                        return
+            self._put((name, _DONE))
+        except Exception as e:
+            self._put((name, e))
+
+    def _finish(self, name: str, status: Optional[str] = None, error: Optional[str] = None):
+        result = self.status[name]
+        if status is not None:
+            result.status, result.error = status, error
+        result.elapsed = time.monotonic() - self.start
+        self.pending.discard(name)
+
+    def _expire(self):
+        now = time.monotonic()
+        for name in [n for n in self.pending if self.deadlines[n] <= now]:
+            logger.warning(f"{name} did not finish streaming within {now - self.start:.1f}s")
+            self._finish(name, STATUS_TIMEOUT, "deadline exceeded")
+
+    def _next(self) -> Optional[Tuple[str, Any]]:
+        """The next buffered item, or None if the nearest deadline passes first."""
+        wait = max(0.0, min(self.deadlines[n] for n in self.pending) - time.monotonic())
+        try:
+            return self.buffer.get(timeout=wait)
+        except queue.Empty:
+            return None
+
+    def __iter__(self) -> Iterator[Tuple[str, Product]]:
+        while True:
+            self._expire()
+            if not self.pending:
+                return
+            received = self._next()
+            if received is None or received[0] not in self.pending:
+                continue
+            name, item = received
+            if item is _DONE:
+                self._finish(name)
+            elif isinstance(item, Exception):
+                logger.error(f"Error searching {name}: {item}")
+                self._finish(name, STATUS_ERROR, str(item))
+            else:
+                self.status[name].value += 1
+                yield name, item
+
 
 class ProductManager:
     """Manages products across multiple affiliate platforms."""
@@ -16,67 +184,304 @@ class ProductManager:
     def __init__(self, config: Dict[str, Any]):
         self.config = config
         self.providers: Dict[str, BaseAffiliateProvider] = {}
-        self.db = Database(config.get("database_url"))
+        self.db = database_from_config(config)
+        # save_product queues here; reads flush it first so they see every save
+        self.writer = writer_from_config(self.db.save_products, config)
+
+        # Fan-out settings: providers are queried in parallel on a bounded pool, each
+        # with its own deadline, and the whole call is capped by a global budget.
+        self.concurrent = config.get("concurrent_providers", True)
+        self.max_workers = config.get("provider_max_workers") or 4
+        self.provider_timeout = config.get("provider_timeout") or 20.0
+        self.provider_timeouts: Dict[str, float] = config.get("provider_timeouts") or {}
+        self.total_timeout = config.get("search_timeout") or 30.0
+        self.stream_buffer = config.get("stream_buffer") or 100
+        self.last_status: Dict[str, PlatformResult] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+        # One keep-alive connection pool shared by every provider this manager creates
+        self.http_session = (
+            session_from_config(config) if config.get("share_http_session", True) else None
+        )
+        self.response_cache = cache_from_config(config)
+        # Per-provider circuit breakers, fed by the providers' HTTP layer
+        self.breakers: Dict[str, CircuitBreaker] = {}
+
         self._initialize_providers()
 
+    def _provider_config(self, **fields) -> Dict[str, Any]:
+        """Build a provider config carrying the shared HTTP pool settings."""
+        return {
+            "http_session": self.http_session,
+            "response_cache": self.response_cache,
+            "http_pool_connections": self.config.get("http_pool_connections"),
+            "http_pool_maxsize": self.config.get("http_pool_maxsize"),
+            "http_keep_alive": self.config.get("http_keep_alive", True),
+            **fields,
+        }
+
+    def _create_breaker(self, name: str) -> Optional[CircuitBreaker]:
+        breaker = breaker_from_config(name, self.config)
+        if breaker is not None:
+            self.breakers[name] = breaker
+        return breaker
+
+    def _create_provider(self, sync_cls, async_cls, config: Dict[str, Any]):
+        """Create a blocking provider, or an async one behind the sync adapter."""
+        if self.config.get("async_providers"):
+            return SyncProviderAdapter(async_cls(config))
+        return sync_cls(config)
+
     def _initialize_providers(self):
         """Initialize available affiliate providers."""
         # Amazon
         if self.config.get("amazon_associate_tag"):
-            self.providers["amazon"] = AmazonAffiliate(
-                {
-                    "amazon_associate_tag": self.config["amazon_associate_tag"],
-                    "amazon_access_key": self.config.get("amazon_access_key"),
-                    "amazon_secret_key": self.config.get("amazon_secret_key"),
-                }
+            self.providers["amazon"] = self._create_provider(
+                AmazonAffiliate,
+                AsyncAmazonAffiliate,
+                self._provider_config(
+                    amazon_associate_tag=self.config["amazon_associate_tag"],
+                    amazon_access_key=self.config.get("amazon_access_key"),
+                    amazon_secret_key=self.config.get("amazon_secret_key"),
+                    amazon_html_parser=self.config.get("amazon_html_parser"),
+                    amazon_rate_limit=self.config.get("amazon_rate_limit"),
+                    amazon_rate_burst=self.config.get("amazon_rate_burst"),
+                    circuit_breaker=self._create_breaker("amazon"),
+                ),
             )
             logger.info("Amazon affiliate provider initialized")
 
         # Flipkart
         if self.config.get("flipkart_affiliate_id"):
-            self.providers["flipkart"] = FlipkartAffiliate(
-                {
-                    "flipkart_affiliate_id": self.config["flipkart_affiliate_id"],
-                    "flipkart_affiliate_token": self.config["flipkart_affiliate_token"],
-                }
+            self.providers["flipkart"] = self._create_provider(
+                FlipkartAffiliate,
+                AsyncFlipkartAffiliate,
+                self._provider_config(
+                    flipkart_affiliate_id=self.config["flipkart_affiliate_id"],
+                    flipkart_affiliate_token=self.config["flipkart_affiliate_token"],
+                    flipkart_rate_limit=self.config.get("flipkart_rate_limit"),
+                    flipkart_rate_burst=self.config.get("flipkart_rate_burst"),
+                    circuit_breaker=self._create_breaker("flipkart"),
+                ),
             )
             logger.info("Flipkart affiliate provider initialized")
 
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="provider"
+            )
+        return self._executor
+
+    def _get_provider_timeout(self, platform_name: str) -> float:
+        return self.provider_timeouts.get(platform_name, self.provider_timeout)
+
+    def _circuit_open(self, platform_name: str) -> bool:
+        breaker = self.breakers.get(platform_name)
+        return breaker is not None and breaker.state == OPEN
+
+    def _fallback(self, platform_name: str, method: str, args: tuple, kwargs: Dict[str, Any]):
+        """Answer a call from saved products while the provider's circuit is open."""
+        platform = self.providers[platform_name].platform_name
+        try:
+            self.flush_writes()
+            if method == "search_products":
+                query = args[0] if args else kwargs.get("query")
+                limit = kwargs.get("max_results") or 10
+                return self.db.search_saved(query, platform=platform, limit=limit)
+            if method == "get_trending_products":
+                category = args[0] if args else kwargs.get("category")
+                return self.db.search_saved(platform=platform, category=category, limit=50)
+        except Exception as e:
+            logger.error(f"Error reading saved {platform_name} products: {e}")
+        return None
+
+    def _call_provider(
+        self,
+        platform_name: str,
+        method: str,
+        args: tuple,
+        kwargs: Dict[str, Any],
+        timeout: Optional[float] = None,
+    ) -> PlatformResult:
+        """Invoke a provider method and wrap the outcome in a PlatformResult.
+
+        ``timeout`` becomes the deadline seen by the provider's retry engine, so
+        retries and per-request timeouts shrink to fit the caller's budget.
+        """
+        if self._circuit_open(platform_name):
+            logger.info(f"{platform_name} circuit is open, skipping {method}")
+            return PlatformResult(
+                platform_name,
+                STATUS_OPEN,
+                value=self._fallback(platform_name, method, args, kwargs),
+                error="circuit open",
+            )
+
+        start = time.monotonic()
+        try:
+            with deadline_scope(timeout):
+                value = getattr(self.providers[platform_name], method)(*args, **kwargs)
+            return PlatformResult(
+                platform_name, STATUS_OK, value=value, elapsed=time.monotonic() - start
+            )
+        except Exception as e:
+            logger.error(f"Error calling {method} on {platform_name}: {e}")
+            return PlatformResult(
+                platform_name, STATUS_ERROR, error=str(e), elapsed=time.monotonic() - start
+            )
+
+    def fan_out(
+        self, method: str, *args, timeout: Optional[float] = None, **kwargs
+    ) -> Dict[str, PlatformResult]:
+        """Call ``method`` on every provider and collect per-platform results.
+
+        In concurrent mode all providers are queried at once; each result is awaited
+        until the earlier of the provider's own deadline and the global budget
+        (``timeout`` or ``search_timeout``). Providers that miss their deadline are
+        reported with status ``timeout`` so callers get partial results. Calls that
+        overrun cannot be interrupted and finish in the background.
+        """
+        if not self.concurrent:
+            results = {
+                name: self._call_provider(
+                    name, method, args, kwargs, self._get_provider_timeout(name)
+                )
+                for name in self.providers
+            }
+            self.last_status = results
+            return results
+
+        budget = self.total_timeout if timeout is None else timeout
+        start = time.monotonic()
+        executor = self._get_executor()
+        timeouts = {name: min(self._get_provider_timeout(name), budget) for name in self.providers}
+        futures = {
+            name: executor.submit(self._call_provider, name, method, args, kwargs, timeouts[name])
+            for name in self.providers
+        }
+
+        results = {}
+        for name, future in futures.items():
+            deadline = start + timeouts[name]
+            try:
+                results[name] = future.result(timeout=max(0.0, deadline - time.monotonic()))
+            except FutureTimeoutError:
+                future.cancel()
+                elapsed = time.monotonic() - start
+                logger.warning(f"{name} did not answer {method} within {elapsed:.1f}s")
+                results[name] = PlatformResult(
+                    name, STATUS_TIMEOUT, error="deadline exceeded", elapsed=elapsed
+                )
+
+        self.last_status = results
+        return results
+
     def search_all_platforms(
         self, query: str, max_per_platform: int = 5
     ) -> Dict[str, List[Product]]:
         """Search products across all platforms."""
         results = {}
 
-        for platform_name, provider in self.providers.items():
-            try:
-                products = provider.search_products(query, max_results=max_per_platform)
-                results[platform_name] = products
-                logger.info(f"Found {len(products)} products on {platform_name}")
-            except Exception as e:
-                logger.error(f"Error searching {platform_name}: {e}")
-                results[platform_name] = []
+        for platform_name, result in self.fan_out(
+            "search_products", query, max_results=max_per_platform
+        ).items():
+            results[platform_name] = result.value if result.usable else []
+            if result.usable:
+                logger.info(f"Found {len(result.value)} products on {platform_name}")
 
         return results
 
+    def iter_all_platforms(
+        self, query: str, max_per_platform: int = 5, timeout: Optional[float] = None
+    ) -> Iterator[Tuple[str, Product]]:
+        """Yield ``(platform, product)`` pairs as soon as any provider parses one.
+
+        Providers stream into a bounded buffer, so results from different platforms
+        are interleaved in arrival order and a slow consumer applies backpressure
+        instead of piling products up in memory. Deadlines work as in ``fan_out``;
+        once the generator is closed the producers stop at their next product.
+        The per-platform outcome, with the number of products yielded as ``value``,
+        is left in ``last_status``.
+        """
+        if not self.concurrent:
+            yield from self._iter_all_platforms_sequential(query, max_per_platform)
+            return
+
+        budget = self.total_timeout if timeout is None else timeout
+        start = time.monotonic()
+        deadlines = {
+            name: start + min(self._get_provider_timeout(name), budget) for name in self.providers
+        }
+        streams = _PlatformStreams(self, query, max_per_platform, deadlines, start)
+        executor = self._get_executor()
+        for name in self.providers:
+            executor.submit(streams.produce, name)
+        try:
+            yield from streams
+        finally:
+            streams.stop.set()
+            self.last_status = streams.status
+
+    def _stream_source(
+        self, platform_name: str, query: str, max_per_platform: int, circuit_open: bool
+    ) -> Iterable[Product]:
+        if circuit_open:
+            logger.info(f"{platform_name} circuit is open, streaming saved products")
+            args, kwargs = (query,), {"max_results": max_per_platform}
+            return self._fallback(platform_name, "search_products", args, kwargs) or []
+        return self.providers[platform_name].iter_search_products(
+            query, max_results=max_per_platform
+        )
+
+    def _iter_all_platforms_sequential(
+        self, query: str, max_per_platform: int
+    ) -> Iterator[Tuple[str, Product]]:
+        status = {}
+        try:
+            for name in self.providers:
+                start = time.monotonic()
+                circuit_open = self._circuit_open(name)
+                status[name] = PlatformResult(
+                    name, STATUS_OPEN if circuit_open else STATUS_OK, value=0
+                )
+                try:
+                    for product in self._stream_source(name, query, max_per_platform, circuit_open):
+                        status[name].value += 1
+                        yield name, product
+                except Exception as e:
+                    logger.error(f"Error searching {name}: {e}")
+                    status[name].status = STATUS_ERROR
+                    status[name].error = str(e)
+                status[name].elapsed = time.monotonic() - start
+        finally:
+            self.last_status = status
+
     def get_best_deals(
-        self, category: Optional[str] = None, min_discount: float = 10.0
+        self,
+        category: Optional[str] = None,
+        min_discount: float = 10.0,
+        limit: Optional[int] = None,
     ) -> List[Product]:
-        """Get best deals across all platforms."""
-        all_deals = []
+        """Get best deals across all platforms, highest discount first.
 
-        for platform_name, provider in self.providers.items():
-            try:
-                products = provider.get_trending_products(category)
-                # Filter by discount
-                deals = [
-                    p
-                    for p in products
-                    if p.discount_percentage and p.discount_percentage >= min_discount
-                ]
-                all_deals.extend(deals)
-            except Exception as e:
-                logger.error(f"Error getting deals from {platform_name}: {e}")
+        With ``limit`` only the top deals are kept, via ``top_deals``. Otherwise large
+        trending sets go through ``ProductBatch`` so the discount filter and sort run
+        vectorized; every path returns the same products in the same order.
+        """
+        results = self.fan_out("get_trending_products", category).values()
+        product_lists = [result.value for result in results if result.usable]
+        if limit is not None:
+            return top_deals(product_lists, min_discount, limit)
+
+        trending = list(chain.from_iterable(product_lists))
+
+        if len(trending) >= BATCH_MIN_PRODUCTS:
+            batch = ProductBatch.from_products(trending)
+            return batch.filter(min_discount=min_discount).rank("discount_percentage").to_products()
+
+        # Filter by discount
+        all_deals = list(_deals(trending, min_discount))
 
         # Sort by discount percentage
         all_deals.sort(key=lambda x: x.discount_percentage or 0, reverse=True)
@@ -87,20 +492,123 @@ class ProductManager:
         """Compare prices for similar products across platforms."""
         comparison = {}
 
-        for platform_name, provider in self.providers.items():
-            try:
-                products = provider.search_products(product_name, max_results=1)
-                if products:
-                    comparison[platform_name] = products[0]
-            except Exception as e:
-                logger.error(f"Error comparing prices on {platform_name}: {e}")
+        for platform_name, result in self.fan_out(
+            "search_products", product_name, max_results=1
+        ).items():
+            if result.usable and result.value:
+                comparison[platform_name] = result.value[0]
 
         return comparison
 
+    def get_product_details_many(
+        self, platform: str, product_ids: Iterable[str]
+    ) -> Dict[str, LookupResult]:
+        """Batch product lookup on one platform, keyed by product ID."""
+        return self.providers[platform].get_product_details_many(product_ids)
+
+    def refresh_saved_products(self, platform: Optional[str] = None) -> Dict[str, LookupResult]:
+        """Re-fetch saved products in batches and store the fresh copies.
+
+        ``platform`` is a provider key such as ``"amazon"``. Results are keyed by
+        ``"<provider>:<product id>"``.
+        """
+        results = {}
+        for name, provider in self.providers.items():
+            if platform and name != platform:
+                continue
+            ids = [p.id for p in self.iter_saved_products(provider.platform_name)]
+            fetched = provider.get_product_details_many(ids)
+            self.save_products(result.product for result in fetched.values() if result.ok)
+            for product_id, result in fetched.items():
+                results[f"{name}:{product_id}"] = result
+        return results
+
     def save_product(self, product: Product):
-        """Save product to database."""
-        self.db.save_product(product)
+        """Save product to database, in the background when write-behind is enabled."""
+        if self.writer is not None:
+            self.writer.put(product)
+        else:
+            self.db.save_product(product)
+
+    def save_products(self, products: Iterable[Product]) -> SaveStats:
+        """Save many products in one database transaction."""
+        self.flush_writes()
+        return self.db.save_products(products)
+
+    def flush_writes(self) -> int:
+        """Write products still queued by ``save_product``.
+
+        Returns how many queued products could not be saved since the last flush.
+        """
+        if self.writer is None:
+            return 0
+        return self.writer.flush()
 
     def get_saved_products(self, platform: Optional[str] = None) -> List[Product]:
         """Get saved products from database."""
+        self.flush_writes()
         return self.db.get_products(platform)
+
+    def iter_saved_products(
+        self, platform: Optional[str] = None, batch_size: int = 1000
+    ) -> Iterator[Product]:
+        """Stream saved products from the database in batches."""
+        self.flush_writes()
+        return self.db.iter_products(platform, batch_size=batch_size)
+
+    def search_saved(
+        self,
+        query: str,
+        platform: Optional[str] = None,
+        category: Optional[str] = None,
+        limit: int = 20,
+    ) -> List[Product]:
+        """Full-text search of saved products, best matches first (see ``Database.search_saved``)."""
+        self.flush_writes()
+        return self.db.search_saved(query, platform=platform, category=category, limit=limit)
+
+    def query_saved_products(self, **filters) -> ProductPage:
+        """Filter, sort and page saved products in the database (see ``Database.query_products``)."""
+        self.flush_writes()
+        return self.db.query_products(**filters)
+
+    def export_parquet(self, directory: str, **options) -> Dict[str, int]:
+        """Export saved products and price history to Parquet (see ``utils.parquet_io``)."""
+        from ..utils.parquet_io import export_parquet
+
+        self.flush_writes()
+        return export_parquet(self.db, directory, **options)
+
+    def import_parquet(self, directory: str, **options) -> Dict[str, int]:
+        """Load a Parquet export back into the database through the bulk upsert."""
+        from ..utils.parquet_io import import_parquet
+
+        self.flush_writes()
+        return import_parquet(self.db, directory, **options)
+
+    def largest_price_drops(
+        self, hours: float = 24, limit: int = 10, platform: Optional[str] = None
+    ) -> List[PriceDrop]:
+        """Saved products whose price fell the most in the last ``hours``."""
+        self.flush_writes()
+        return self.db.largest_price_drops(hours=hours, limit=limit, platform=platform)
+
+    def circuit_states(self) -> Dict[str, Dict[str, Any]]:
+        """State and recent failure rate of each provider's circuit breaker."""
+        return {name: breaker.stats() for name, breaker in self.breakers.items()}
+
+    def cache_stats(self) -> Dict[str, float]:
+        """Hit/miss counters of the shared response cache."""
+        return self.response_cache.stats() if self.response_cache else {}
+
+    def close(self):
+        """Write queued products and release the provider worker pool and HTTP connections."""
+        if self.writer is not None and self.writer.close():
+            logger.error("Some queued products could not be saved before closing")
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        for provider in self.providers.values():
+            provider.close()
+        if self.http_session is not None:
+            self.http_session.close()
@@ -1,4 +1,4 @@
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional
 from urllib.parse import parse_qs, quote_plus, urlencode, urlparse
 
 import requests
@@ -6,10 +6,23 @@ from bs4 import BeautifulSoup
 
 from ...core.base_affiliate import BaseAffiliateProvider, Product
 from ...utils.logger import get_logger
-from ...utils.retry import retry_on_failure
+from ...utils.retry import RetryBudget, retry_on_failure
+from ...utils.singleflight import coalesce
+from .lxml_extractor import extract_product_fields, extract_search_fields, iter_search_results
 
 logger = get_logger(__name__)
 
+# Markers of the robot-check page Amazon serves (with status 200) to throttled clients
+CAPTCHA_MARKERS = (b"/errors/validateCaptcha", b"Type the characters you see in this image")
+
+
+class CaptchaError(requests.RequestException):
+    """Amazon answered with a captcha page instead of the requested content."""
+
+
+# At most ~20% of page fetches may be retries, shared by the sync and async providers
+RETRY_BUDGET = RetryBudget(ratio=0.2)
+
 
 class AmazonAffiliate(BaseAffiliateProvider):
     """Amazon affiliate provider implementation."""
@@ -27,73 +40,129 @@ class AmazonAffiliate(BaseAffiliateProvider):
     def __init__(self, config: Dict[str, Any]):
         super().__init__(config)
         self.associate_tag = config.get("amazon_associate_tag")
+        # "lxml" uses the incremental fast path; "html.parser" the BeautifulSoup one
+        self.html_parser = config.get("amazon_html_parser") or "lxml"
         self.validate_config()
+        self._configure_rate_limit(self.BASE_URL, "amazon")
 
     def get_required_config_fields(self) -> List[str]:
         return ["amazon_associate_tag"]
 
-    @retry_on_failure(max_retries=3, exceptions=(requests.RequestException,))
-    def _fetch_page(self, url: str) -> bytes:
-        """Fetch a page with retry logic."""
-        response = requests.get(url, headers=self.HEADERS, timeout=30)
-        response.raise_for_status()
-        return response.content
-
+    @retry_on_failure(
+        max_retries=3,
+        exceptions=(requests.RequestException,),
+        jitter=True,
+        max_delay=30,
+        budget=RETRY_BUDGET,
+        timeout_arg="timeout",
+        name="amazon",
+    )
+    def _fetch_page(self, url: str, timeout: float = 30) -> bytes:
+        """Fetch a page with retry logic; ``timeout`` is shrunk to the caller's deadline."""
+        return self._http_get(url, headers=self.HEADERS, timeout=timeout, validate=self._check_page)
+
+    @staticmethod
+    def _check_page(content: bytes):
+        """Reject captcha pages so they are neither cached nor parsed as empty results."""
+        if any(marker in content for marker in CAPTCHA_MARKERS):
+            raise CaptchaError("Amazon served a captcha page")
+
+    @coalesce(case_insensitive=True)
     def search_products(self, query: str, max_results: int = 10, **kwargs) -> List[Product]:
         """Search Amazon products."""
-        products = []
         try:
-            search_url = f"{self.BASE_URL}/s?k={quote_plus(query)}"
-            content = self._fetch_page(search_url)
-            soup = BeautifulSoup(content, 'html.parser')
-
-            items = soup.find_all('div', {'data-component-type': 's-search-result'})[:max_results]
-
-            for item in items:
-                try:
-                    product = self._parse_search_item(item)
-                    if product:
-                        products.append(product)
-                except Exception as e:
-                    logger.error(f"Error parsing product: {e}")
+            content = self._fetch_page(self._search_url(query))
+            return self._parse_search_page(content, max_results)
+        except Exception as e:
+            logger.error(f"Error searching Amazon products: {e}")
+            return []
 
+    def iter_search_products(
+        self, query: str, max_results: int = 10, **kwargs
+    ) -> Iterator[Product]:
+        """Yield Amazon search results as each result container is parsed."""
+        try:
+            content = self._fetch_page(self._search_url(query))
         except Exception as e:
             logger.error(f"Error searching Amazon products: {e}")
+            return
+        yield from self._iter_search_page(content, max_results)
 
-        return products
+    def _search_url(self, query: str) -> str:
+        return f"{self.BASE_URL}/s?k={quote_plus(query)}"
 
-    def _parse_search_item(self, item) -> Optional[Product]:
-        """Parse individual search result item."""
-        try:
-            title_elem = item.find('h2', class_='s-size-mini-headline')
-            if not title_elem:
-                return None
+    def _product_url(self, product_id: str) -> str:
+        return f"{self.BASE_URL}/dp/{product_id}"
 
-            title = title_elem.text.strip()
-            asin = item.get('data-asin', '')
+    def _parse_search_page(self, content: bytes, max_results: int = 10) -> List[Product]:
+        """Parse products out of a search results page."""
+        return list(self._iter_search_page(content, max_results))
 
-            price_elem = item.find('span', class_='a-price-whole')
-            price = float(price_elem.text.replace(',', '').replace('.', '')) if price_elem else 0.0
+    def _iter_search_page(self, content: bytes, max_results: int = 10) -> Iterator[Product]:
+        """Yield products from a search results page in document order."""
+        if self.html_parser == "lxml":
+            items = iter_search_results(content, max_results)
+            extract = extract_search_fields
+        else:
+            soup = BeautifulSoup(content, 'html.parser')
+            items = soup.find_all('div', {'data-component-type': 's-search-result'})[:max_results]
+            extract = self._extract_search_item
 
-            link_elem = item.find('a', class_='a-link-normal')
-            url = f"{self.BASE_URL}{link_elem.get('href', '')}" if link_elem else ""
+        for item in items:
+            try:
+                product = self._build_search_product(extract(item))
+            except Exception as e:
+                logger.error(f"Error parsing product: {e}")
+                continue
+            if product:
+                yield product
 
-            affiliate_url = self.generate_affiliate_link(url)
+    def _parse_search_item(self, item) -> Optional[Product]:
+        """Parse individual search result item."""
+        try:
+            fields = self._extract_search_item(item)
+        except Exception as e:
+            logger.error(f"Error parsing search item: {e}")
+            return None
+        return self._build_search_product(fields)
 
-            img_elem = item.find('img', class_='s-image')
-            image_url = img_elem.get('src', '') if img_elem else ""
+    def _extract_search_item(self, item) -> Optional[Dict[str, Optional[str]]]:
+        """Read the raw fields of a BeautifulSoup search result item."""
+        title_elem = item.find('h2', class_='s-size-mini-headline')
+        if not title_elem:
+            return None
 
-            rating_elem = item.find('span', class_='a-icon-alt')
-            rating = float(rating_elem.text.split()[0]) if rating_elem else None
+        price_elem = item.find('span', class_='a-price-whole')
+        link_elem = item.find('a', class_='a-link-normal')
+        img_elem = item.find('img', class_='s-image')
+        rating_elem = item.find('span', class_='a-icon-alt')
+
+        return {
+            "asin": item.get('data-asin', ''),
+            "title": title_elem.text,
+            "price": price_elem.text if price_elem else None,
+            "href": link_elem.get('href', '') if link_elem else None,
+            "image_url": img_elem.get('src', '') if img_elem else None,
+            "rating": rating_elem.text if rating_elem else None,
+        }
+
+    def _build_search_product(
+        self, fields: Optional[Dict[str, Optional[str]]]
+    ) -> Optional[Product]:
+        """Build a Product from raw search result fields; shared by both HTML parsers."""
+        if not fields:
+            return None
+        try:
+            url = f"{self.BASE_URL}{fields['href']}" if fields["href"] is not None else ""
 
             return Product(
-                id=asin,
-                title=title,
-                price=price,
+                id=fields["asin"],
+                title=fields["title"].strip(),
+                price=self._parse_price(fields["price"]),
                 url=url,
-                affiliate_url=affiliate_url,
-                image_url=image_url,
-                rating=rating,
+                affiliate_url=self.generate_affiliate_link(url),
+                image_url=fields["image_url"] or "",
+                rating=self._parse_rating(fields["rating"]),
                 platform="Amazon",
             )
 
@@ -101,49 +170,71 @@ class AmazonAffiliate(BaseAffiliateProvider):
             logger.error(f"Error parsing search item: {e}")
             return None
 
+    @staticmethod
+    def _parse_price(text: Optional[str]) -> float:
+        return float(text.replace(',', '').replace('.', '')) if text is not None else 0.0
+
+    @staticmethod
+    def _parse_rating(text: Optional[str]) -> Optional[float]:
+        return float(text.split()[0]) if text is not None else None
+
     def get_product_details(self, product_id: str) -> Optional[Product]:
         """Get detailed product information."""
         try:
-            product_url = f"{self.BASE_URL}/dp/{product_id}"
-            content = self._fetch_page(product_url)
-            soup = BeautifulSoup(content, 'html.parser')
-
-            title = soup.find('span', id='productTitle')
-            title = title.text.strip() if title else ""
-
-            price_elem = soup.find('span', class_='a-price-whole')
-            price = float(price_elem.text.replace(',', '').replace('.', '')) if price_elem else 0.0
-
-            feature_bullets = soup.find('div', id='feature-bullets')
-            description = ""
-            if feature_bullets:
-                bullets = feature_bullets.find_all('span', class_='a-list-item')
-                description = "\n".join([b.text.strip() for b in bullets if b.text.strip()])
-
-            img_elem = soup.find('img', id='landingImage')
-            image_url = img_elem.get('src', '') if img_elem else ""
-
-            rating_elem = soup.find('span', class_='a-icon-alt')
-            rating = float(rating_elem.text.split()[0]) if rating_elem else None
-
-            affiliate_url = self.generate_affiliate_link(product_url)
-
-            return Product(
-                id=product_id,
-                title=title,
-                price=price,
-                url=product_url,
-                affiliate_url=affiliate_url,
-                image_url=image_url,
-                rating=rating,
-                description=description,
-                platform="Amazon",
-            )
-
+            return self._lookup_product(product_id)
         except Exception as e:
             logger.error(f"Error getting product details: {e}")
             return None
 
+    @coalesce()
+    def _lookup_product(self, product_id: str) -> Optional[Product]:
+        content = self._fetch_page(self._product_url(product_id))
+        return self._parse_product_page(content, product_id)
+
+    def _parse_product_page(self, content: bytes, product_id: str) -> Product:
+        """Parse a product detail page."""
+        if self.html_parser == "lxml":
+            fields = extract_product_fields(content)
+        else:
+            fields = self._extract_product_page(content)
+
+        product_url = self._product_url(product_id)
+        bullets = [b.strip() for b in fields["bullets"] or []]
+
+        return Product(
+            id=product_id,
+            title=fields["title"].strip() if fields["title"] is not None else "",
+            price=self._parse_price(fields["price"]),
+            url=product_url,
+            affiliate_url=self.generate_affiliate_link(product_url),
+            image_url=fields["image_url"] or "",
+            rating=self._parse_rating(fields["rating"]),
+            description="\n".join([b for b in bullets if b]),
+            platform="Amazon",
+        )
+
+    def _extract_product_page(self, content: bytes) -> Dict[str, Any]:
+        """Read the raw fields of a product detail page with BeautifulSoup."""
+        soup = BeautifulSoup(content, 'html.parser')
+
+        title = soup.find('span', id='productTitle')
+        price_elem = soup.find('span', class_='a-price-whole')
+        feature_bullets = soup.find('div', id='feature-bullets')
+        img_elem = soup.find('img', id='landingImage')
+        rating_elem = soup.find('span', class_='a-icon-alt')
+
+        return {
+            "title": title.text if title else None,
+            "price": price_elem.text if price_elem else None,
+            "bullets": (
+                [b.text for b in feature_bullets.find_all('span', class_='a-list-item')]
+                if feature_bullets
+                else None
+            ),
+            "image_url": img_elem.get('src', '') if img_elem else None,
+            "rating": rating_elem.text if rating_elem else None,
+        }
+
     def generate_affiliate_link(self, product_url: str) -> str:
         """Generate Amazon affiliate link."""
         if not product_url or not self.associate_tag:
@@ -156,6 +247,7 @@ class AmazonAffiliate(BaseAffiliateProvider):
         new_query = urlencode(params, doseq=True)
         return f"{parsed.scheme}://{parsed.netloc}{parsed.path}?{new_query}"
 
+    @coalesce(case_insensitive=True)
     def get_trending_products(self, category: Optional[str] = None) -> List[Product]:
         """Get trending products from Amazon."""
         query = f"best sellers {category}" if category else "best sellers"
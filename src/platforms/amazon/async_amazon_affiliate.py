@@ -0,0 +1,69 @@
+import asyncio
+from typing import Any, Dict, List, Optional
+
+import aiohttp
+
+from ...core.async_base_affiliate import DEFAULT_TIMEOUT, AsyncBaseAffiliateProvider
+from ...core.base_affiliate import Product
+from ...utils.logger import get_logger
+from ...utils.retry import retry_on_failure
+from ...utils.singleflight import coalesce
+from .amazon_affiliate import RETRY_BUDGET, AmazonAffiliate
+
+logger = get_logger(__name__)
+
+
+class AsyncAmazonAffiliate(AsyncBaseAffiliateProvider):
+    """Asyncio Amazon provider; parsing and link building are shared with AmazonAffiliate."""
+
+    def __init__(self, config: Dict[str, Any]):
+        super().__init__(config)
+        self.parser = AmazonAffiliate(config)
+
+    @retry_on_failure(
+        max_retries=3,
+        exceptions=(aiohttp.ClientError, asyncio.TimeoutError),
+        jitter=True,
+        max_delay=30,
+        budget=RETRY_BUDGET,
+        timeout_arg="timeout",
+        name="amazon",
+    )
+    async def _fetch_page(self, url: str, timeout: float = DEFAULT_TIMEOUT) -> bytes:
+        """Fetch a page with retry logic; ``timeout`` is shrunk to the caller's deadline."""
+        return await self._http_get(
+            url, headers=AmazonAffiliate.HEADERS, timeout=timeout, validate=self.parser._check_page
+        )
+
+    @coalesce(case_insensitive=True)
+    async def search_products(self, query: str, max_results: int = 10, **kwargs) -> List[Product]:
+        """Search Amazon products."""
+        try:
+            content = await self._fetch_page(self.parser._search_url(query))
+            # HTML parsing is CPU bound; keep it off the event loop
+            return await asyncio.to_thread(self.parser._parse_search_page, content, max_results)
+        except Exception as e:
+            logger.error(f"Error searching Amazon products: {e}")
+            return []
+
+    async def get_product_details(self, product_id: str) -> Optional[Product]:
+        """Get detailed product information."""
+        try:
+            return await self._lookup_product(product_id)
+        except Exception as e:
+            logger.error(f"Error getting product details: {e}")
+            return None
+
+    @coalesce()
+    async def _lookup_product(self, product_id: str) -> Optional[Product]:
+        content = await self._fetch_page(self.parser._product_url(product_id))
+        return await asyncio.to_thread(self.parser._parse_product_page, content, product_id)
+
+    def generate_affiliate_link(self, product_url: str) -> str:
+        return self.parser.generate_affiliate_link(product_url)
+
+    @coalesce(case_insensitive=True)
+    async def get_trending_products(self, category: Optional[str] = None) -> List[Product]:
+        """Get trending products from Amazon."""
+        query = f"best sellers {category}" if category else "best sellers"
+        return await self.search_products(query, max_results=20)
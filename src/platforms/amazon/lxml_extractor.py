@@ -0,0 +1,111 @@
+from typing import Any, Dict, Iterator, Optional
+
+from lxml import etree
+
+SEARCH_RESULT_TYPE = "s-search-result"
+CHUNK_SIZE = 64 * 1024
+DEFAULT_ENCODING = "utf-8"
+
+
+def _by_class(tag: str, css_class: str) -> etree.XPath:
+    return etree.XPath(
+        f".//{tag}[contains(concat(' ', normalize-space(@class), ' '), ' {css_class} ')]"
+    )
+
+
+_TITLE = _by_class("h2", "s-size-mini-headline")
+_PRICE = _by_class("span", "a-price-whole")
+_LINK = _by_class("a", "a-link-normal")
+_IMAGE = _by_class("img", "s-image")
+_RATING = _by_class("span", "a-icon-alt")
+_LIST_ITEM = _by_class("span", "a-list-item")
+_PRODUCT_TITLE = etree.XPath(".//span[@id='productTitle']")
+_FEATURE_BULLETS = etree.XPath(".//div[@id='feature-bullets']")
+_LANDING_IMAGE = etree.XPath(".//img[@id='landingImage']")
+
+
+def _first(xpath: etree.XPath, element) -> Optional[etree._Element]:
+    matches = xpath(element)
+    return matches[0] if matches else None
+
+
+def _text(element) -> Optional[str]:
+    return "".join(element.itertext()) if element is not None else None
+
+
+def _attr(element, name: str) -> Optional[str]:
+    return element.get(name, "") if element is not None else None
+
+
+def iter_search_results(
+    content: bytes, max_results: Optional[int] = None, encoding: str = DEFAULT_ENCODING
+) -> Iterator[etree._Element]:
+    """Yield ``s-search-result`` containers in document order.
+
+    The page is fed to an incremental lxml parser in chunks and feeding stops as
+    soon as ``max_results`` containers were seen, so the tail of a large results
+    page is never parsed. Each container is cleared once the consumer moves on to
+    the next one; read what you need before advancing the iterator.
+    """
+    if max_results is not None and max_results <= 0:
+        return
+
+    parser = etree.HTMLPullParser(events=("end",), tag="div", encoding=encoding)
+    count = 0
+
+    def matching_events():
+        for _, element in parser.read_events():
+            if element.get("data-component-type") == SEARCH_RESULT_TYPE:
+                yield element
+
+    for offset in range(0, len(content), CHUNK_SIZE):
+        parser.feed(content[offset : offset + CHUNK_SIZE])
+        for element in matching_events():
+            yield element
+            count += 1
+            if max_results is not None and count >= max_results:
+                return
+            element.clear()
+
+    parser.close()
+    for element in matching_events():
+        yield element
+        count += 1
+        if max_results is not None and count >= max_results:
+            return
+
+
+def extract_search_fields(element) -> Optional[Dict[str, Optional[str]]]:
+    """Read the raw fields of one search result; ``None`` when it has no title."""
+    title = _first(_TITLE, element)
+    if title is None:
+        return None
+
+    return {
+        "asin": element.get("data-asin", ""),
+        "title": _text(title),
+        "price": _text(_first(_PRICE, element)),
+        "href": _attr(_first(_LINK, element), "href"),
+        "image_url": _attr(_first(_IMAGE, element), "src"),
+        "rating": _text(_first(_RATING, element)),
+    }
+
+
+def extract_product_fields(content: bytes, encoding: str = DEFAULT_ENCODING) -> Dict[str, Any]:
+    """Read the raw fields of a product detail page."""
+    root = etree.fromstring(content, etree.HTMLParser(encoding=encoding))
+    if root is None:
+        return {"title": None, "price": None, "bullets": None, "image_url": None, "rating": None}
+
+    feature_bullets = _first(_FEATURE_BULLETS, root)
+    bullets = (
+        [_text(b) for b in _LIST_ITEM(feature_bullets)] if feature_bullets is not None else None
+    )
+
+    return {
+        "title": _text(_first(_PRODUCT_TITLE, root)),
+        "price": _text(_first(_PRICE, root)),
+        "bullets": bullets,
+        "image_url": _attr(_first(_LANDING_IMAGE, root), "src"),
+        "rating": _text(_first(_RATING, root)),
+    }
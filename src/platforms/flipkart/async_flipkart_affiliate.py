@@ -0,0 +1,82 @@
+import asyncio
+import json
+from typing import Any, Dict, List, Optional
+
+import aiohttp
+
+from ...core.async_base_affiliate import DEFAULT_TIMEOUT, AsyncBaseAffiliateProvider
+from ...core.base_affiliate import Product
+from ...utils.logger import get_logger
+from ...utils.retry import retry_on_failure
+from ...utils.singleflight import coalesce
+from .flipkart_affiliate import RETRY_BUDGET, FlipkartAffiliate
+
+logger = get_logger(__name__)
+
+
+class AsyncFlipkartAffiliate(AsyncBaseAffiliateProvider):
+    """Asyncio Flipkart provider; response parsing is shared with FlipkartAffiliate."""
+
+    BASE_URL = FlipkartAffiliate.BASE_URL
+
+    def __init__(self, config: Dict[str, Any]):
+        super().__init__(config)
+        self.parser = FlipkartAffiliate(config)
+
+    @retry_on_failure(
+        max_retries=3,
+        exceptions=(aiohttp.ClientError, asyncio.TimeoutError),
+        jitter=True,
+        max_delay=30,
+        budget=RETRY_BUDGET,
+        timeout_arg="timeout",
+        name="flipkart",
+    )
+    async def _api_get(
+        self, url: str, params: Optional[Dict] = None, timeout: float = DEFAULT_TIMEOUT
+    ) -> Dict:
+        """Make an API GET request with retry logic; ``timeout`` is shrunk to the deadline."""
+        content = await self._http_get(
+            url, params=params, headers=self.parser._get_headers(), timeout=timeout
+        )
+        return json.loads(content)
+
+    @coalesce(case_insensitive=True)
+    async def search_products(self, query: str, max_results: int = 10, **kwargs) -> List[Product]:
+        """Search Flipkart products."""
+        try:
+            url = f"{self.BASE_URL}/search/json"
+            params = {"query": query, "resultCount": max_results}
+
+            data = await self._api_get(url, params=params)
+            return self.parser._parse_search_results(data)
+
+        except Exception as e:
+            logger.error(f"Error searching Flipkart products: {e}")
+            return []
+
+    async def get_product_details(self, product_id: str) -> Optional[Product]:
+        """Get detailed product information from Flipkart."""
+        try:
+            return await self._lookup_product(product_id)
+        except Exception as e:
+            logger.error(f"Error getting Flipkart product details: {e}")
+            return None
+
+    @coalesce()
+    async def _lookup_product(self, product_id: str) -> Optional[Product]:
+        data = await self._api_get(f"{self.BASE_URL}/products/{product_id}")
+        return self.parser._parse_product(data)
+
+    def generate_affiliate_link(self, product_url: str) -> str:
+        return self.parser.generate_affiliate_link(product_url)
+
+    @coalesce(case_insensitive=True)
+    async def get_trending_products(self, category: Optional[str] = None) -> List[Product]:
+        """Get trending products from Flipkart."""
+        try:
+            data = await self._api_get(f"{self.BASE_URL}/offers/v1/top/json")
+            return self.parser._parse_offers(data)
+        except Exception as e:
+            logger.error(f"Error getting Flipkart trending products: {e}")
+            return []
@@ -1,13 +1,18 @@
-from typing import Any, Dict, List, Optional
+import json
+from typing import Any, Dict, Iterator, List, Optional
 
 import requests
 
 from ...core.base_affiliate import BaseAffiliateProvider, Product
 from ...utils.logger import get_logger
-from ...utils.retry import retry_on_failure
+from ...utils.retry import RetryBudget, retry_on_failure
+from ...utils.singleflight import coalesce
 
 logger = get_logger(__name__)
 
+# At most ~20% of API calls may be retries, shared by the sync and async providers
+RETRY_BUDGET = RetryBudget(ratio=0.2)
+
 
 class FlipkartAffiliate(BaseAffiliateProvider):
     """Flipkart affiliate provider implementation."""
@@ -19,39 +24,67 @@ class FlipkartAffiliate(BaseAffiliateProvider):
         self.affiliate_id = config.get("flipkart_affiliate_id")
         self.affiliate_token = config.get("flipkart_affiliate_token")
         self.validate_config()
+        self._configure_rate_limit(self.BASE_URL, "flipkart")
+        self._headers = {
+            "Fk-Affiliate-Id": self.affiliate_id,
+            "Fk-Affiliate-Token": self.affiliate_token,
+        }
 
     def get_required_config_fields(self) -> List[str]:
         return ["flipkart_affiliate_id", "flipkart_affiliate_token"]
 
     def _get_headers(self) -> Dict[str, str]:
-        return {"Fk-Affiliate-Id": self.affiliate_id, "Fk-Affiliate-Token": self.affiliate_token}
-
-    @retry_on_failure(max_retries=3, exceptions=(requests.RequestException,))
-    def _api_get(self, url: str, params: Optional[Dict] = None) -> Dict:
-        """Make an API GET request with retry logic."""
-        response = requests.get(url, headers=self._get_headers(), params=params, timeout=30)
-        response.raise_for_status()
-        return response.json()
-
+        return self._headers
+
+    @retry_on_failure(
+        max_retries=3,
+        exceptions=(requests.RequestException,),
+        jitter=True,
+        max_delay=30,
+        budget=RETRY_BUDGET,
+        timeout_arg="timeout",
+        name="flipkart",
+    )
+    def _api_get(self, url: str, params: Optional[Dict] = None, timeout: float = 30) -> Dict:
+        """Make an API GET request with retry logic; ``timeout`` is shrunk to the deadline."""
+        content = self._http_get(url, params=params, headers=self._get_headers(), timeout=timeout)
+        return json.loads(content)
+
+    @coalesce(case_insensitive=True)
     def search_products(self, query: str, max_results: int = 10, **kwargs) -> List[Product]:
         """Search Flipkart products."""
-        products = []
         try:
             url = f"{self.BASE_URL}/search/json"
             params = {"query": query, "resultCount": max_results}
 
             data = self._api_get(url, params=params)
-            products_data = data.get("products", [])
+            return self._parse_search_results(data)
 
-            for item in products_data:
-                product = self._parse_product(item)
-                if product:
-                    products.append(product)
+        except Exception as e:
+            logger.error(f"Error searching Flipkart products: {e}")
+            return []
 
+    def iter_search_products(
+        self, query: str, max_results: int = 10, **kwargs
+    ) -> Iterator[Product]:
+        """Yield Flipkart search results as each API item is parsed."""
+        try:
+            url = f"{self.BASE_URL}/search/json"
+            data = self._api_get(url, params={"query": query, "resultCount": max_results})
         except Exception as e:
             logger.error(f"Error searching Flipkart products: {e}")
+            return
+        yield from self._iter_search_results(data)
 
-        return products
+    def _parse_search_results(self, data: Dict[str, Any]) -> List[Product]:
+        """Parse Flipkart search API response."""
+        return list(self._iter_search_results(data))
+
+    def _iter_search_results(self, data: Dict[str, Any]) -> Iterator[Product]:
+        for item in data.get("products", []):
+            product = self._parse_product(item)
+            if product:
+                yield product
 
     def _parse_product(self, data: Dict[str, Any]) -> Optional[Product]:
         """Parse Flipkart product data."""
@@ -91,17 +124,22 @@ class FlipkartAffiliate(BaseAffiliateProvider):
     def get_product_details(self, product_id: str) -> Optional[Product]:
         """Get detailed product information from Flipkart."""
         try:
-            url = f"{self.BASE_URL}/products/{product_id}"
-            data = self._api_get(url)
-            return self._parse_product(data)
+            return self._lookup_product(product_id)
         except Exception as e:
             logger.error(f"Error getting Flipkart product details: {e}")
             return None
 
+    @coalesce()
+    def _lookup_product(self, product_id: str) -> Optional[Product]:
+        # The affiliate API has no multi-ID product endpoint, so batches fan out per ID
+        data = self._api_get(f"{self.BASE_URL}/products/{product_id}")
+        return self._parse_product(data)
+
     def generate_affiliate_link(self, product_url: str) -> str:
         """Flipkart URLs already contain affiliate information when fetched via API."""
         return product_url
 
+    @coalesce(case_insensitive=True)
     def get_trending_products(self, category: Optional[str] = None) -> List[Product]:
         """Get trending products from Flipkart."""
         try:
@@ -0,0 +1,332 @@
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from contextlib import nullcontext
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Awaitable, Callable, ContextManager, Dict, Mapping, Optional, Tuple, Union
+from urllib.parse import urlencode
+
+import requests
+
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+# URL patterns (regular expressions) mapped to TTLs in seconds; first match wins
+DEFAULT_TTL_RULES: Dict[str, float] = {
+    r"amazon\.[^/]+/s\?": 600,
+    r"amazon\.[^/]+/dp/": 300,
+    r"/search/json": 600,
+    r"/products/": 300,
+    r"/offers/": 900,
+}
+
+
+@dataclass
+class CacheEntry:
+    """Cached response body with its freshness and validators."""
+
+    body: bytes
+    expires_at: float
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+    @property
+    def fresh(self) -> bool:
+        return time.time() < self.expires_at
+
+    @property
+    def revalidatable(self) -> bool:
+        return bool(self.etag or self.last_modified)
+
+
+class ResponseCache:
+    """TTL + LRU cache for upstream GET responses.
+
+    Entries live in a size-bounded in-memory LRU tier and, when ``disk_path`` is
+    set, in a size-bounded on-disk tier that survives between CLI runs. Stale
+    entries that carry an ETag or Last-Modified header are revalidated with a
+    conditional request instead of being refetched.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 512,
+        max_bytes: int = 64 * 1024 * 1024,
+        default_ttl: float = 300,
+        ttl_rules: Optional[Dict[str, float]] = None,
+        disk_path: Optional[Union[str, Path]] = None,
+        disk_max_bytes: int = 256 * 1024 * 1024,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        # Configured rules are checked before the defaults and replace a default
+        # with the same pattern
+        rules = dict(ttl_rules or {})
+        for pattern, ttl in DEFAULT_TTL_RULES.items():
+            rules.setdefault(pattern, ttl)
+        self.ttl_rules = [(re.compile(pattern), ttl) for pattern, ttl in rules.items()]
+        self.disk_path = Path(disk_path) if disk_path else None
+        self.disk_max_bytes = disk_max_bytes
+
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.evictions = 0
+
+        self._disk_bytes = 0
+        if self.disk_path:
+            self.disk_path.mkdir(parents=True, exist_ok=True)
+            self._disk_bytes = sum(p.stat().st_size for p in self.disk_path.glob("*.cache"))
+
+    @staticmethod
+    def make_key(url: str, params: Optional[Dict] = None) -> str:
+        return f"{url}?{urlencode(sorted(params.items()), doseq=True)}" if params else url
+
+    def ttl_for(self, url: str) -> float:
+        for pattern, ttl in self.ttl_rules:
+            if pattern.search(url):
+                return ttl
+        return self.default_ttl
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """Look a key up in memory, then on disk (promoting disk hits to memory)."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry
+
+        entry = self._disk_get(key)
+        if entry is not None:
+            self._memory_put(key, entry)
+        return entry
+
+    def put(self, key: str, entry: CacheEntry):
+        self._memory_put(key, entry)
+        self._disk_put(key, entry)
+
+    def fetch(
+        self,
+        session: requests.Session,
+        url: str,
+        params: Optional[Dict] = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: float = 30,
+        validate: Optional[Callable[[bytes], None]] = None,
+        guard: Optional[Callable[[], ContextManager]] = None,
+    ) -> bytes:
+        """GET ``url`` through the cache and return the response body.
+
+        ``validate`` is called with a freshly downloaded body before it is cached
+        and may raise to reject it (e.g. a captcha page served with status 200).
+        ``guard`` (e.g. ``CircuitBreaker.guard``) is entered around the network
+        request only, so fresh hits neither need nor count as an upstream call.
+        """
+        key = self.make_key(url, params)
+        entry = self.get(key)
+        if entry is not None and entry.fresh:
+            self.hits += 1
+            return entry.body
+
+        request_headers = self._request_headers(entry, headers)
+        with guard() if guard is not None else nullcontext():
+            response = session.get(url, headers=request_headers, params=params, timeout=timeout)
+            revalidated = response.status_code == 304 and entry is not None
+            if not revalidated:
+                self.misses += 1
+                response.raise_for_status()
+                if validate is not None:
+                    validate(response.content)
+
+        if revalidated:
+            return self._revalidated(key, url, entry)
+        return self._store(key, url, response.headers, response.content)
+
+    async def fetch_async(
+        self,
+        send: Callable[[Dict[str, str]], Awaitable[Tuple[int, Mapping[str, str], bytes]]],
+        url: str,
+        params: Optional[Dict] = None,
+        headers: Optional[Dict[str, str]] = None,
+        validate: Optional[Callable[[bytes], None]] = None,
+        guard: Optional[Callable[[], ContextManager]] = None,
+    ) -> bytes:
+        """Asyncio counterpart of ``fetch`` for clients other than ``requests``.
+
+        ``send`` performs the GET of ``url`` with ``params`` and the given request
+        headers and returns ``(status, response headers, body)``; it raises for
+        error statuses itself, leaving a 304 to the cache. ``validate`` and
+        ``guard`` behave as in ``fetch``.
+        """
+        key = self.make_key(url, params)
+        entry = self.get(key)
+        if entry is not None and entry.fresh:
+            self.hits += 1
+            return entry.body
+
+        request_headers = self._request_headers(entry, headers)
+        with guard() if guard is not None else nullcontext():
+            status, response_headers, body = await send(request_headers)
+            revalidated = status == 304 and entry is not None
+            if not revalidated:
+                self.misses += 1
+                if validate is not None:
+                    validate(body)
+
+        if revalidated:
+            return self._revalidated(key, url, entry)
+        return self._store(key, url, response_headers, body)
+
+    @staticmethod
+    def _request_headers(
+        entry: Optional[CacheEntry], headers: Optional[Dict[str, str]]
+    ) -> Dict[str, str]:
+        """Request headers, made conditional when a stale entry can be revalidated."""
+        request_headers = dict(headers or {})
+        if entry is not None and entry.revalidatable:
+            if entry.etag:
+                request_headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                request_headers["If-Modified-Since"] = entry.last_modified
+        return request_headers
+
+    def _revalidated(self, key: str, url: str, entry: CacheEntry) -> bytes:
+        """Renew an entry the upstream confirmed with a 304 and return its body."""
+        self.revalidations += 1
+        entry.expires_at = time.time() + self.ttl_for(url)
+        self.put(key, entry)
+        return entry.body
+
+    def _store(self, key: str, url: str, headers: Mapping[str, str], body: bytes) -> bytes:
+        """Cache a downloaded body unless the response forbids it, and return it."""
+        if "no-store" not in headers.get("Cache-Control", ""):
+            self.put(
+                key,
+                CacheEntry(
+                    body=body,
+                    expires_at=time.time() + self.ttl_for(url),
+                    etag=headers.get("ETag"),
+                    last_modified=headers.get("Last-Modified"),
+                ),
+            )
+        return body
+
+    def stats(self) -> Dict[str, float]:
+        """Return hit/miss counters and current memory tier usage."""
+        lookups = self.hits + self.misses + self.revalidations
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "revalidations": self.revalidations,
+            "evictions": self.evictions,
+            "hit_ratio": (self.hits + self.revalidations) / lookups if lookups else 0.0,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+        }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+        if self.disk_path:
+            for path in self.disk_path.glob("*.cache"):
+                path.unlink(missing_ok=True)
+            self._disk_bytes = 0
+
+    def _memory_put(self, key: str, entry: CacheEntry):
+        size = len(entry.body)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= len(previous.body)
+            self._entries[key] = entry
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted.body)
+                self.evictions += 1
+
+    def _disk_file(self, key: str) -> Path:
+        return self.disk_path / f"{hashlib.sha256(key.encode()).hexdigest()}.cache"
+
+    def _disk_get(self, key: str) -> Optional[CacheEntry]:
+        if not self.disk_path:
+            return None
+        path = self._disk_file(key)
+        try:
+            with open(path, "rb") as f:
+                meta = json.loads(f.readline())
+                body = f.read()
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        if meta.get("key") != key:
+            return None
+        return CacheEntry(
+            body=body,
+            expires_at=meta["expires_at"],
+            etag=meta.get("etag"),
+            last_modified=meta.get("last_modified"),
+        )
+
+    def _disk_put(self, key: str, entry: CacheEntry):
+        if not self.disk_path:
+            return
+        meta = {
+            "key": key,
+            "expires_at": entry.expires_at,
+            "etag": entry.etag,
+            "last_modified": entry.last_modified,
+        }
+        path = self._disk_file(key)
+        tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+        data = json.dumps(meta).encode() + b"\n" + entry.body
+        try:
+            previous = path.stat().st_size if path.exists() else 0
+            tmp_path.write_bytes(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not write cache entry to disk: {e}")
+            return
+
+        with self._lock:
+            self._disk_bytes += len(data) - previous
+            if self._disk_bytes > self.disk_max_bytes:
+                self._disk_evict()
+
+    def _disk_evict(self):
+        files = [(p.stat(), p) for p in self.disk_path.glob("*.cache")]
+        self._disk_bytes = sum(stat.st_size for stat, _ in files)
+        # Least recently used first: reads refresh the mtime
+        for stat, path in sorted(files, key=lambda item: item[0].st_mtime):
+            if self._disk_bytes <= self.disk_max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            self._disk_bytes -= stat.st_size
+            self.evictions += 1
+
+
+def cache_from_config(config: Dict) -> Optional[ResponseCache]:
+    """Create a ResponseCache from ``cache_*`` configuration keys, or None if disabled."""
+    if not config.get("cache_enabled", True):
+        return None
+    return ResponseCache(
+        max_entries=config.get("cache_max_entries") or 512,
+        max_bytes=config.get("cache_max_bytes") or 64 * 1024 * 1024,
+        default_ttl=config.get("cache_default_ttl") or 300,
+        ttl_rules=config.get("cache_ttls"),
+        disk_path=config.get("cache_dir"),
+        disk_max_bytes=config.get("cache_disk_max_bytes") or 256 * 1024 * 1024,
+    )
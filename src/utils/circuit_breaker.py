@@ -0,0 +1,187 @@
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+from .deadline import DeadlineExceeded
+from .logger import get_logger
+from .metrics import metrics
+
+logger = get_logger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# Reported as the ``circuit.<name>.state`` gauge
+_STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a provider whose circuit is open."""
+
+
+def _status_code(exc: BaseException) -> Optional[int]:
+    response = getattr(exc, "response", None)
+    status = getattr(response, "status_code", None)
+    if status is None:
+        status = getattr(exc, "status", None)  # aiohttp.ClientResponseError
+    return status if isinstance(status, int) else None
+
+
+def counts_as_failure(exc: BaseException) -> bool:
+    """Client errors such as a 404 for an unknown product say nothing about provider health."""
+    status = _status_code(exc)
+    return status is None or status >= 500 or status == 429
+
+
+class CircuitBreaker:
+    """Failure-rate circuit breaker for one upstream.
+
+    The outcomes of the last ``window_size`` calls are kept; once at least
+    ``min_calls`` have been seen and the failure rate reaches
+    ``failure_threshold`` the circuit opens and calls are rejected. After
+    ``reset_timeout`` seconds it turns half-open and lets up to
+    ``half_open_max_calls`` probe calls through: a successful probe closes the
+    circuit, a failed one opens it again.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: float = 0.5,
+        window_size: int = 20,
+        min_calls: int = 5,
+        reset_timeout: float = 30.0,
+        half_open_max_calls: int = 1,
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.min_calls = min_calls
+        self.reset_timeout = reset_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self._outcomes: deque = deque(maxlen=window_size)
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probes = 0
+        self._lock = threading.Lock()
+        metrics.gauge(f"circuit.{name}.state", _STATE_VALUES[CLOSED])
+
+    def _transition(self, state: str):
+        if state == self._state:
+            return
+        previous, self._state = self._state, state
+        if state == OPEN:
+            self._opened_at = time.monotonic()
+            metrics.incr(f"circuit.{self.name}.opened")
+            logger.warning(
+                f"Circuit for {self.name} opened ({previous} -> open), "
+                f"failing fast for {self.reset_timeout:.0f}s"
+            )
+        else:
+            logger.info(f"Circuit for {self.name}: {previous} -> {state}")
+        if state != CLOSED:
+            self._probes = 0
+        if state == CLOSED:
+            self._outcomes.clear()
+        metrics.gauge(f"circuit.{self.name}.state", _STATE_VALUES[state])
+
+    def _refresh(self):
+        if self._state == OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+            self._transition(HALF_OPEN)
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            self._refresh()
+            return self._state
+
+    def allow_request(self) -> bool:
+        """Return whether a call may go out; half-open circuits hand out probe permits."""
+        with self._lock:
+            self._refresh()
+            if self._state == CLOSED:
+                return True
+            if self._state == HALF_OPEN and self._probes < self.half_open_max_calls:
+                self._probes += 1
+                return True
+        metrics.incr(f"circuit.{self.name}.rejected")
+        return False
+
+    def record_success(self):
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._transition(CLOSED)
+            else:
+                self._outcomes.append(False)
+
+    def record_failure(self):
+        with self._lock:
+            metrics.incr(f"circuit.{self.name}.failures")
+            if self._state == HALF_OPEN:
+                self._transition(OPEN)
+                return
+            self._outcomes.append(True)
+            if self._state == CLOSED and len(self._outcomes) >= self.min_calls:
+                if sum(self._outcomes) / len(self._outcomes) >= self.failure_threshold:
+                    self._transition(OPEN)
+
+    def record_cancelled(self):
+        """Record a call that ended before the provider answered.
+
+        That happens when it is cancelled (``asyncio.wait_for``) or its deadline runs
+        out while it waits for a rate-limit token. A half-open probe ending this way
+        counts as failed and reopens the circuit, which hands its permit back after
+        ``reset_timeout``. Other calls are not recorded.
+        """
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._transition(OPEN)
+
+    @contextmanager
+    def guard(self) -> Iterator[None]:
+        """Run the block as one call: reject it when open and record its outcome."""
+        if not self.allow_request():
+            raise CircuitOpenError(f"Circuit for {self.name} is open")
+        try:
+            yield
+        except DeadlineExceeded:
+            # Given up locally before the provider answered; says nothing about its health
+            self.record_cancelled()
+            raise
+        except Exception as e:
+            if counts_as_failure(e):
+                self.record_failure()
+            else:
+                self.record_success()
+            raise
+        except BaseException:
+            # asyncio.CancelledError; without this the probe permit would never return
+            self.record_cancelled()
+            raise
+        self.record_success()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            self._refresh()
+            failures = sum(self._outcomes)
+            return {
+                "state": self._state,
+                "calls": len(self._outcomes),
+                "failure_rate": failures / len(self._outcomes) if self._outcomes else 0.0,
+            }
+
+
+def breaker_from_config(name: str, config: Dict[str, Any]) -> Optional[CircuitBreaker]:
+    """Build a provider's breaker from the ``circuit_*`` settings, or None when disabled."""
+    if not config.get("circuit_breaker_enabled", True):
+        return None
+    return CircuitBreaker(
+        name,
+        failure_threshold=config.get("circuit_failure_threshold") or 0.5,
+        window_size=config.get("circuit_window_size") or 20,
+        min_calls=config.get("circuit_min_calls") or 5,
+        reset_timeout=config.get("circuit_reset_timeout") or 30.0,
+        half_open_max_calls=config.get("circuit_half_open_max_calls") or 1,
+    )
@@ -1,10 +1,43 @@
-from datetime import datetime, timezone
-from typing import List, Optional
+import hashlib
+import re
+from dataclasses import dataclass, fields
+from datetime import datetime, timedelta, timezone
+from itertools import starmap
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 
-from sqlalchemy import Column, DateTime, Float, Integer, String, Text, create_engine
-from sqlalchemy.orm import DeclarativeBase, Session, sessionmaker
+from sqlalchemy import (
+    Column,
+    DateTime,
+    Float,
+    Index,
+    Integer,
+    String,
+    Text,
+    column,
+    create_engine,
+    event,
+    exists,
+    func,
+    insert,
+    literal_column,
+    select,
+    table,
+    text,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import DeclarativeBase, Session, aliased, sessionmaker
+from sqlalchemy.pool import StaticPool
 
 from ..core.base_affiliate import Product
+from .logger import get_logger
+from .metrics import metrics
+
+logger = get_logger(__name__)
 
 
 class Base(DeclarativeBase):
@@ -28,6 +61,20 @@ class ProductModel(Base):
     category = Column(String)
     description = Column(Text)
     last_updated = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+    # Hash of the stored product data (see product_fingerprint); last_updated only moves
+    # when it changes, while last_seen records every save
+    fingerprint = Column(String(32))
+    last_seen = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+
+    # Back query_products: each sort column is followed by the keyset tie-breakers
+    __table_args__ = (
+        Index("ix_products_last_updated", "last_updated", "platform", "id"),
+        Index("ix_products_platform_updated", "platform", "last_updated", "id"),
+        Index("ix_products_discount", "discount_percentage", "platform", "id"),
+        Index("ix_products_category_discount", "category", "discount_percentage", "platform", "id"),
+        Index("ix_products_price", "price", "platform", "id"),
+        Index("ix_products_rating", "rating", "platform", "id"),
+    )
 
     def to_product(self) -> Product:
         return Product(
@@ -48,16 +95,277 @@ class ProductModel(Base):
         )
 
 
+class PriceHistoryModel(Base):
+    """Append-only price log: one row per observed price change."""
+
+    __tablename__ = 'price_history'
+
+    platform = Column(String, primary_key=True)
+    id = Column(String, primary_key=True)
+    ts = Column(DateTime, primary_key=True)
+    price = Column(Float, nullable=False)
+
+    __table_args__ = (
+        # Covering indexes: per-product lookups and time-window scans never touch the table
+        Index("ix_price_history_product", "platform", "id", "ts", "price"),
+        Index("ix_price_history_ts", "ts", "platform", "id", "price"),
+    )
+
+
+@dataclass
+class PriceDrop:
+    """Price change of one product over a time window."""
+
+    platform: str
+    id: str
+    old_price: float
+    new_price: float
+
+    @property
+    def drop(self) -> float:
+        return self.old_price - self.new_price
+
+    @property
+    def drop_percentage(self) -> float:
+        return self.drop / self.old_price * 100 if self.old_price else 0.0
+
+
+@dataclass
+class SaveStats:
+    """Outcome of a ``save_products`` batch."""
+
+    new: int = 0
+    changed: int = 0
+    unchanged: int = 0
+
+    @property
+    def total(self) -> int:
+        return self.new + self.changed + self.unchanged
+
+
+@dataclass
+class ProductPage:
+    """One page of ``query_products`` results.
+
+    ``next_cursor`` is passed back as ``after`` to fetch the following page and
+    is None on the last page.
+    """
+
+    products: List[Product]
+    next_cursor: Optional[Tuple[Any, str, str]] = None
+
+
+# Product fields in declaration order: a row selected with these unpacks straight
+# into ``Product(*row)``, skipping ORM identity-map bookkeeping and ``to_product``
+PRODUCT_COLUMNS = tuple(ProductModel.__table__.c[f.name] for f in fields(Product))
+
+# SQLite FTS5 index over the searchable product text (see migrations/versions/0002). It
+# is an external-content table: the text lives only in ``products``, synced by triggers.
+PRODUCTS_FTS = table("products_fts", column("rowid"))
+FTS_COLUMNS = ("title", "description", "category")
+# bm25 column weights: a title hit outranks a category hit, which outranks the description
+FTS_WEIGHTS = (10.0, 1.0, 4.0)
+
+
+def fts_query(text_query: str) -> Optional[str]:
+    """Turn free text into an FTS5 query matching every word as a prefix.
+
+    Words are quoted so FTS5 operators and punctuation in user input are taken
+    literally; returns None when there is nothing to search for.
+    """
+    terms = [term.replace('"', '""') for term in text_query.split()]
+    return " ".join(f'"{term}"*' for term in terms) or None
+
+
+# Columns query_products can order by
+SORT_COLUMNS = {
+    "last_updated": ProductModel.last_updated,
+    "price": ProductModel.price,
+    "discount_percentage": ProductModel.discount_percentage,
+    "rating": ProductModel.rating,
+}
+
+# Columns refreshed when an existing (id, platform) row is upserted
+UPSERT_COLUMNS = (
+    "title",
+    "price",
+    "original_price",
+    "discount_percentage",
+    "url",
+    "affiliate_url",
+    "image_url",
+    "rating",
+    "review_count",
+    "category",
+    "description",
+    "last_updated",
+    "fingerprint",
+    "last_seen",
+)
+
+# Product fields covered by the fingerprint: everything but the key and timestamps
+FINGERPRINT_FIELDS = tuple(
+    f.name for f in fields(Product) if f.name not in ("id", "platform", "last_updated")
+)
+
+
+def product_fingerprint(product: Product) -> str:
+    """Hash of a product's stored data, used to skip saves that change nothing."""
+    values = repr(tuple(getattr(product, name) for name in FINGERPRINT_FIELDS))
+    return hashlib.blake2b(values.encode(), digest_size=16).hexdigest()
+
+
+# Dialects with INSERT ... ON CONFLICT DO UPDATE
+_UPSERT_INSERTS = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}
+
+
+def _product_row(product: Product, now: datetime, keep_timestamp: bool = False) -> Dict[str, Any]:
+    updated = product.last_updated if keep_timestamp and product.last_updated else now
+    return {
+        "id": product.id,
+        "platform": product.platform,
+        "title": product.title,
+        "price": product.price,
+        "original_price": product.original_price,
+        "discount_percentage": product.discount_percentage,
+        "url": product.url,
+        "affiliate_url": product.affiliate_url,
+        "image_url": product.image_url,
+        "rating": product.rating,
+        "review_count": product.review_count,
+        "category": product.category,
+        "description": product.description,
+        "last_updated": updated,
+        "fingerprint": product_fingerprint(product),
+        "last_seen": updated,
+    }
+
+
+# Alembic revision this code expects (the head of migrations/versions). Bump it with
+# every new migration: Database runs the migrations whenever the stored revision differs.
+SCHEMA_VERSION = "0003"
+MIGRATIONS_DIR = Path(__file__).resolve().parents[2] / "migrations"
+
+
+# Applied to every new SQLite connection, in this order. WAL lets the scheduler and the
+# CLI read while the other writes; synchronous=NORMAL is durable in WAL mode except for
+# the last transactions on power loss. cache_size is negative for KiB.
+DEFAULT_SQLITE_PRAGMAS: Dict[str, Any] = {
+    "busy_timeout": 5000,
+    "journal_mode": "wal",
+    "synchronous": "normal",
+    "cache_size": -64 * 1024,
+    "mmap_size": 256 * 1024 * 1024,
+    "temp_store": "memory",
+}
+
+_PRAGMA_VALUE = re.compile(r"-?\w+")
+
+
+def _apply_sqlite_pragmas(dbapi_connection, pragmas: Dict[str, Any]):
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+    finally:
+        cursor.close()
+
+
 class Database:
-    """Database handler for product storage and retrieval."""
+    """Database handler for product storage and retrieval.
+
+    For SQLite URLs ``sqlite_pragmas`` (default ``DEFAULT_SQLITE_PRAGMAS``; pass
+    ``{}`` for SQLite's own defaults) is applied to each pooled connection. The
+    pool options are handed to ``create_engine`` for file and server databases.
+    """
 
-    def __init__(self, database_url: str):
-        self.engine = create_engine(database_url)
-        Base.metadata.create_all(self.engine)
+    def __init__(
+        self,
+        database_url: str,
+        sqlite_pragmas: Optional[Dict[str, Any]] = None,
+        pool_size: Optional[int] = None,
+        max_overflow: Optional[int] = None,
+        pool_timeout: Optional[float] = None,
+    ):
+        url = make_url(database_url)
+        in_memory = url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:")
+        engine_options = {
+            key: value
+            for key, value in (
+                ("pool_size", pool_size),
+                ("max_overflow", max_overflow),
+                ("pool_timeout", pool_timeout),
+            )
+            if value is not None and not in_memory
+        }
+        if in_memory:
+            # One shared connection: each new one would be a separate, empty database,
+            # e.g. in the write-behind thread
+            engine_options.update(poolclass=StaticPool, connect_args={"check_same_thread": False})
+        self.engine = create_engine(url, **engine_options)
+        if url.get_backend_name() == "sqlite":
+            self._configure_sqlite(
+                DEFAULT_SQLITE_PRAGMAS if sqlite_pragmas is None else sqlite_pragmas, in_memory
+            )
+        self.full_text = self._check_schema()
         self.SessionLocal = sessionmaker(bind=self.engine)
 
+    def _read_schema_state(self) -> Tuple[Optional[str], bool]:
+        """Return the stored schema revision (None if unversioned) and whether FTS5 is set up."""
+        with self.engine.connect() as conn:
+            try:
+                version = conn.execute(text("SELECT version_num FROM alembic_version")).scalar()
+            except DBAPIError:
+                return None, False
+            full_text = self.engine.dialect.name == "sqlite" and (
+                conn.execute(
+                    text(
+                        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'products_fts'"
+                    )
+                ).first()
+                is not None
+            )
+        return version, full_text
+
+    def _check_schema(self) -> bool:
+        """Make sure the schema is at ``SCHEMA_VERSION`` and report whether FTS5 is available.
+
+        An up-to-date database costs one or two tiny queries. Otherwise the
+        Alembic migrations are run, which also creates a new database and adopts
+        one created before migrations existed; Alembic is only imported then.
+        """
+        version, full_text = self._read_schema_state()
+        if version == SCHEMA_VERSION:
+            return full_text
+        from alembic import command
+        from alembic.config import Config
+
+        logger.info(
+            f"Migrating database schema from {version or 'unversioned'} to {SCHEMA_VERSION}"
+        )
+        config = Config()
+        config.set_main_option("script_location", str(MIGRATIONS_DIR))
+        with self.engine.begin() as conn:
+            config.attributes["connection"] = conn
+            command.upgrade(config, SCHEMA_VERSION)
+        return self._read_schema_state()[1]
+
+    def _configure_sqlite(self, pragmas: Dict[str, Any], in_memory: bool):
+        if in_memory:
+            # WAL and memory mapping only apply to database files
+            pragmas = {k: v for k, v in pragmas.items() if k not in ("journal_mode", "mmap_size")}
+        for name, value in pragmas.items():
+            if not _PRAGMA_VALUE.fullmatch(str(value)):
+                raise ValueError(f"Invalid value for PRAGMA {name}: {value!r}")
+        if pragmas:
+            event.listen(
+                self.engine,
+                "connect",
+                lambda dbapi_connection, _: _apply_sqlite_pragmas(dbapi_connection, pragmas),
+            )
+
     def save_product(self, product: Product):
-        """Save or update product in database."""
+        """Save or update product in database; unchanged products only get ``last_seen`` bumped."""
         with self.SessionLocal() as session:
             existing = (
                 session.query(ProductModel)
@@ -65,6 +373,20 @@ class Database:
                 .first()
             )
 
+            now = datetime.now(timezone.utc)
+            fingerprint = product_fingerprint(product)
+            if existing is not None and existing.fingerprint == fingerprint:
+                existing.last_seen = now
+                session.commit()
+                return
+
+            if product.price is not None and (existing is None or existing.price != product.price):
+                session.add(
+                    PriceHistoryModel(
+                        platform=product.platform, id=product.id, ts=now, price=product.price
+                    )
+                )
+
             if existing:
                 existing.title = product.title
                 existing.price = product.price
@@ -77,7 +399,9 @@ class Database:
                 existing.review_count = product.review_count
                 existing.category = product.category
                 existing.description = product.description
-                existing.last_updated = datetime.now(timezone.utc)
+                existing.last_updated = now
+                existing.fingerprint = fingerprint
+                existing.last_seen = now
             else:
                 new_product = ProductModel(
                     id=product.id,
@@ -93,25 +417,418 @@ class Database:
                     review_count=product.review_count,
                     category=product.category,
                     description=product.description,
+                    fingerprint=fingerprint,
                 )
                 session.add(new_product)
 
             session.commit()
 
+    def save_products(
+        self,
+        products: Iterable[Product],
+        chunk_size: int = 500,
+        record_history: bool = True,
+        keep_timestamps: bool = False,
+    ) -> SaveStats:
+        """Upsert many products in a single transaction and count new/changed/unchanged rows.
+
+        Rows whose fingerprint matches the stored one are not rewritten; only their
+        ``last_seen`` is bumped, in one statement per chunk. On SQLite and PostgreSQL
+        new and changed rows are sent in chunks of ``chunk_size`` through one
+        prepared ``INSERT ... ON CONFLICT (id, platform) DO UPDATE`` statement;
+        other dialects fall back to ``merge``.
+        When a batch contains the same product twice the last copy wins. Prices that
+        differ from the stored ones are appended to the price history unless
+        ``record_history`` is False (when the history is loaded separately).
+        New and changed rows are stamped with the current time unless
+        ``keep_timestamps`` is set, which keeps each product's ``last_updated``
+        (e.g. when importing an export).
+        """
+        now = datetime.now(timezone.utc)
+        rows = list(
+            {(p.id, p.platform): _product_row(p, now, keep_timestamps) for p in products}.values()
+        )
+        stats = SaveStats()
+        if not rows:
+            return stats
+
+        upsert_insert = _UPSERT_INSERTS.get(self.engine.dialect.name)
+        if upsert_insert is None:
+            with self.SessionLocal() as session:
+                for row in self._changed_rows(
+                    session.connection(), rows, now, stats, record_history
+                ):
+                    session.merge(ProductModel(**row))
+                session.commit()
+        else:
+            stmt = upsert_insert(ProductModel)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["id", "platform"],
+                set_={column: stmt.excluded[column] for column in UPSERT_COLUMNS},
+            )
+            with self.engine.begin() as conn:
+                for start in range(0, len(rows), chunk_size):
+                    changed = self._changed_rows(
+                        conn, rows[start : start + chunk_size], now, stats, record_history
+                    )
+                    if changed:
+                        conn.execute(stmt, changed)
+
+        for outcome in ("new", "changed", "unchanged"):
+            metrics.incr(f"db.products.{outcome}", getattr(stats, outcome))
+        logger.debug(
+            f"Saved {stats.total} products: {stats.new} new, {stats.changed} changed, "
+            f"{stats.unchanged} unchanged"
+        )
+        return stats
+
+    @staticmethod
+    def _changed_rows(
+        conn,
+        rows: List[Dict[str, Any]],
+        now: datetime,
+        stats: SaveStats,
+        record_history: bool = True,
+    ) -> List[Dict[str, Any]]:
+        """Return the rows that are new or differ from the stored ones.
+
+        Unchanged rows only get ``last_seen`` bumped. New products and price
+        changes are appended to the price history.
+        """
+        keys = [(row["id"], row["platform"]) for row in rows]
+        current = {
+            (pid, platform): (price, fingerprint)
+            for pid, platform, price, fingerprint in conn.execute(
+                select(
+                    ProductModel.id,
+                    ProductModel.platform,
+                    ProductModel.price,
+                    ProductModel.fingerprint,
+                ).where(tuple_(ProductModel.id, ProductModel.platform).in_(keys))
+            )
+        }
+        changed, unchanged, history = [], [], []
+        for key, row in zip(keys, rows):
+            price, fingerprint = current.get(key, (None, None))
+            if key in current and fingerprint == row["fingerprint"]:
+                unchanged.append(key)
+                continue
+            changed.append(row)
+            if key in current:
+                stats.changed += 1
+            else:
+                stats.new += 1
+            if not record_history or row["price"] is None:
+                continue
+            if key not in current or price != row["price"]:
+                history.append(
+                    {
+                        "platform": row["platform"],
+                        "id": row["id"],
+                        "ts": row["last_updated"],
+                        "price": row["price"],
+                    }
+                )
+
+        if unchanged:
+            stats.unchanged += len(unchanged)
+            conn.execute(
+                update(ProductModel)
+                .where(tuple_(ProductModel.id, ProductModel.platform).in_(unchanged))
+                .values(last_seen=now)
+            )
+        if history:
+            conn.execute(insert(PriceHistoryModel), history)
+        return changed
+
+    def save_price_history(self, rows: Iterable[Dict[str, Any]], chunk_size: int = 500) -> int:
+        """Insert ``{platform, id, ts, price}`` history rows, skipping ones already stored.
+
+        Used to load exported history; returns the number of rows sent.
+        """
+        rows = list(rows)
+        if not rows:
+            return 0
+        upsert_insert = _UPSERT_INSERTS.get(self.engine.dialect.name)
+        if upsert_insert is None:
+            with self.SessionLocal() as session:
+                for row in rows:
+                    session.merge(PriceHistoryModel(**row))
+                session.commit()
+            return len(rows)
+
+        stmt = upsert_insert(PriceHistoryModel).on_conflict_do_nothing()
+        with self.engine.begin() as conn:
+            for start in range(0, len(rows), chunk_size):
+                conn.execute(stmt, rows[start : start + chunk_size])
+        return len(rows)
+
     def get_products(self, platform: Optional[str] = None) -> List[Product]:
         """Get products from database."""
-        with self.SessionLocal() as session:
-            query = session.query(ProductModel)
-            if platform:
-                query = query.filter_by(platform=platform)
+        query = select(*PRODUCT_COLUMNS)
+        if platform:
+            query = query.where(ProductModel.platform == platform)
+        with self.engine.connect() as conn:
+            return list(starmap(Product, conn.execute(query)))
+
+    def iter_products(
+        self, platform: Optional[str] = None, batch_size: int = 1000
+    ) -> Iterator[Product]:
+        """Stream saved products, fetching ``batch_size`` rows at a time.
+
+        Unlike ``get_products`` nothing is materialized up front: rows are fetched
+        in chunks (a server-side cursor where the driver supports one) and turned
+        into ``Product`` objects as they are consumed, so memory stays flat however
+        large the table is. The connection stays open until the generator is
+        exhausted or closed.
+        """
+        query = select(*PRODUCT_COLUMNS)
+        if platform:
+            query = query.where(ProductModel.platform == platform)
+        with self.engine.connect() as conn:
+            result = conn.execution_options(yield_per=batch_size).execute(query)
+            yield from starmap(Product, result)
+
+    def query_products(
+        self,
+        platform: Optional[str] = None,
+        category: Optional[str] = None,
+        min_discount: Optional[float] = None,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        min_rating: Optional[float] = None,
+        updated_after: Optional[datetime] = None,
+        updated_before: Optional[datetime] = None,
+        seen_before: Optional[datetime] = None,
+        order_by: str = "last_updated",
+        descending: bool = True,
+        limit: int = 50,
+        after: Optional[Tuple[Any, str, str]] = None,
+    ) -> ProductPage:
+        """Filter, sort and page saved products in SQL.
+
+        Pages are keyset-paginated on ``(order_by, platform, id)``: pass the
+        returned ``next_cursor`` as ``after`` to continue, which stays an index
+        range scan however deep the page. Products with no value in the sort
+        column come last, in either direction: once the valued rows run out they
+        are read as a second range on ``(platform, id)``, and their cursors carry
+        ``None`` as the value. ``updated_after``/``updated_before`` select rows by
+        when their data last changed, ``seen_before`` rows not saved since.
+        """
+        if order_by not in SORT_COLUMNS:
+            raise ValueError(f"Cannot order products by {order_by!r}")
+        sort_column = SORT_COLUMNS[order_by]
+
+        filters = (
+            (platform, lambda v: ProductModel.platform == v),
+            (category, lambda v: ProductModel.category == v),
+            (min_discount, lambda v: ProductModel.discount_percentage >= v),
+            (min_price, lambda v: ProductModel.price >= v),
+            (max_price, lambda v: ProductModel.price <= v),
+            (min_rating, lambda v: ProductModel.rating >= v),
+            (updated_after, lambda v: ProductModel.last_updated >= v),
+            (updated_before, lambda v: ProductModel.last_updated < v),
+            (seen_before, lambda v: ProductModel.last_seen < v),
+        )
+        conditions = [make(value) for value, make in filters if value is not None]
+        key = (ProductModel.platform, ProductModel.id)
 
-            return [p.to_product() for p in query.all()]
+        def page(conn, columns, cursor, count, *where):
+            """Up to ``count`` rows of one index range, after ``cursor`` when given."""
+            if cursor is not None:
+                keyset, cursor = tuple_(*columns), tuple_(*cursor)
+                where += (keyset < cursor if descending else keyset > cursor,)
+            query = (
+                select(*PRODUCT_COLUMNS)
+                .where(*conditions, *where)
+                .order_by(*(c.desc() if descending else c.asc() for c in columns))
+                .limit(count)
+            )
+            return list(starmap(Product, conn.execute(query)))
+
+        # Valued rows first, then the NULL tail: one range each, so SQLite can
+        # seek on the index instead of OR-ing the two together
+        in_tail = after is not None and after[0] is None
+        products: List[Product] = []
+        with self.engine.connect() as conn:
+            if not in_tail:
+                products += page(
+                    conn, (sort_column, *key), after, limit + 1, sort_column.is_not(None)
+                )
+            if len(products) <= limit:
+                products += page(
+                    conn,
+                    key,
+                    after[1:] if in_tail else None,
+                    limit + 1 - len(products),
+                    sort_column.is_(None),
+                )
+
+        next_cursor = None
+        if len(products) > limit:
+            products = products[:limit]
+            last = products[-1]
+            next_cursor = (getattr(last, order_by), last.platform, last.id)
+        return ProductPage(products, next_cursor)
 
     def get_product(self, product_id: str, platform: str) -> Optional[Product]:
         """Get single product from database."""
-        with self.SessionLocal() as session:
-            product_model = (
-                session.query(ProductModel).filter_by(id=product_id, platform=platform).first()
+        with self.engine.connect() as conn:
+            row = conn.execute(
+                select(*PRODUCT_COLUMNS).where(
+                    ProductModel.id == product_id, ProductModel.platform == platform
+                )
+            ).first()
+        return Product(*row) if row else None
+
+    def search_saved(
+        self,
+        query: Optional[str] = None,
+        platform: Optional[str] = None,
+        category: Optional[str] = None,
+        limit: int = 20,
+    ) -> List[Product]:
+        """Find saved products matching every word of ``query``.
+
+        On SQLite the ``products_fts`` index is searched: words match as prefixes
+        in the title, description or category and results are ranked by bm25
+        (title hits weigh most). Elsewhere, or without a query, titles are matched
+        with LIKE and the most recently updated products come first. Used for
+        offline search and as the fallback while a provider is unavailable.
+        """
+        match = fts_query(query or "") if self.full_text else None
+        q = select(*PRODUCT_COLUMNS)
+        if match:
+            fts = literal_column("products_fts")
+            q = (
+                q.join(PRODUCTS_FTS, PRODUCTS_FTS.c.rowid == literal_column("products.rowid"))
+                .where(fts.op("MATCH")(match))
+                .order_by(func.bm25(fts, *FTS_WEIGHTS), ProductModel.last_updated.desc())
             )
+        else:
+            for term in (query or "").split():
+                q = q.where(ProductModel.title.ilike(f"%{term}%"))
+            q = q.order_by(ProductModel.last_updated.desc())
+        if platform:
+            q = q.where(ProductModel.platform == platform)
+        if category:
+            q = q.where(ProductModel.category == category)
+        with self.engine.connect() as conn:
+            return list(starmap(Product, conn.execute(q.limit(limit))))
+
+    def price_history(self, product_id: str, platform: str) -> List[Tuple[datetime, float]]:
+        """All recorded ``(timestamp, price)`` changes of a product, oldest first."""
+        with self.engine.connect() as conn:
+            rows = conn.execute(
+                select(PriceHistoryModel.ts, PriceHistoryModel.price)
+                .where(PriceHistoryModel.platform == platform, PriceHistoryModel.id == product_id)
+                .order_by(PriceHistoryModel.ts)
+            )
+            return [(ts, price) for ts, price in rows]
+
+    def price_at(self, product_id: str, platform: str, at: datetime) -> Optional[float]:
+        """Price in effect at ``at``: the last change recorded at or before it."""
+        with self.engine.connect() as conn:
+            return conn.execute(
+                select(PriceHistoryModel.price)
+                .where(
+                    PriceHistoryModel.platform == platform,
+                    PriceHistoryModel.id == product_id,
+                    PriceHistoryModel.ts <= at,
+                )
+                .order_by(PriceHistoryModel.ts.desc())
+                .limit(1)
+            ).scalar()
+
+    def price_range(
+        self,
+        product_id: str,
+        platform: str,
+        start: datetime,
+        end: Optional[datetime] = None,
+    ) -> Optional[Tuple[float, float]]:
+        """``(min, max)`` price between ``start`` and ``end`` (default: now).
+
+        The price in effect at ``start`` counts, since history only stores changes.
+        """
+        conditions = [
+            PriceHistoryModel.platform == platform,
+            PriceHistoryModel.id == product_id,
+            PriceHistoryModel.ts > start,
+        ]
+        if end is not None:
+            conditions.append(PriceHistoryModel.ts <= end)
+        with self.engine.connect() as conn:
+            low, high = conn.execute(
+                select(func.min(PriceHistoryModel.price), func.max(PriceHistoryModel.price)).where(
+                    *conditions
+                )
+            ).one()
+        prices = [
+            p for p in (low, high, self.price_at(product_id, platform, start)) if p is not None
+        ]
+        return (min(prices), max(prices)) if prices else None
+
+    def largest_price_drops(
+        self, hours: float = 24, limit: int = 10, platform: Optional[str] = None
+    ) -> List[PriceDrop]:
+        """Products whose price fell the most over the last ``hours``.
+
+        Each product's latest change inside the window is compared with the price in
+        effect when the window opened (or, for products first seen inside the
+        window, their first price). The window is read through the ``ts`` index and
+        every per-product lookup is a seek on the covering product index.
+        """
+        since = datetime.now(timezone.utc) - timedelta(hours=hours)
+        latest, newer, earlier = (aliased(PriceHistoryModel) for _ in range(3))
+
+        def old_price(before_window: bool):
+            return (
+                select(earlier.price)
+                .where(
+                    earlier.platform == latest.platform,
+                    earlier.id == latest.id,
+                    earlier.ts < since if before_window else earlier.ts >= since,
+                )
+                .order_by(earlier.ts.desc() if before_window else earlier.ts)
+                .limit(1)
+                .scalar_subquery()
+            )
+
+        is_latest = ~exists().where(
+            newer.platform == latest.platform, newer.id == latest.id, newer.ts > latest.ts
+        )
+        changes = select(
+            latest.platform,
+            latest.id,
+            func.coalesce(old_price(True), old_price(False)).label("old"),
+            latest.price.label("new"),
+        ).where(latest.ts >= since, is_latest)
+        if platform:
+            changes = changes.where(latest.platform == platform)
+        changes = changes.subquery()
+
+        query = (
+            select(changes)
+            .where(changes.c.new < changes.c.old)
+            .order_by((changes.c.old - changes.c.new).desc())
+            .limit(limit)
+        )
+        with self.engine.connect() as conn:
+            return [PriceDrop(*row) for row in conn.execute(query)]
+
 
-            return product_model.to_product() if product_model else None
+def database_from_config(config: Dict[str, Any]) -> Database:
+    """Build the Database from ``database_url`` and the ``sqlite_*``/``db_pool_*`` settings."""
+    pragmas: Dict[str, Any] = {}
+    if config.get("sqlite_tuning", True):
+        for name, default in DEFAULT_SQLITE_PRAGMAS.items():
+            value = config.get(f"sqlite_{name}")
+            pragmas[name] = default if value is None else value
+    return Database(
+        config.get("database_url"),
+        sqlite_pragmas=pragmas,
+        pool_size=config.get("db_pool_size"),
+        max_overflow=config.get("db_max_overflow"),
+        pool_timeout=config.get("db_pool_timeout"),
+    )
@@ -0,0 +1,58 @@
+import contextvars
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+# Absolute time.monotonic() value by which the current operation must finish.
+_deadline: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar(
+    "deadline", default=None
+)
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when there is no time left in the caller's deadline."""
+
+
+def current_deadline() -> Optional[float]:
+    return _deadline.get()
+
+
+def remaining() -> Optional[float]:
+    """Seconds left before the active deadline, or None when there is none."""
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return max(0.0, deadline - time.monotonic())
+
+
+def clamp_timeout(timeout: Optional[float]) -> Optional[float]:
+    """Shrink ``timeout`` so it does not run past the active deadline."""
+    left = remaining()
+    if left is None:
+        return timeout
+    if timeout is None:
+        return left
+    return min(timeout, left)
+
+
+@contextmanager
+def deadline_scope(seconds: Optional[float]) -> Iterator[Optional[float]]:
+    """Run the block under a deadline ``seconds`` from now.
+
+    Deadlines only ever tighten: an enclosing scope that ends sooner wins. The
+    deadline lives in a context variable, so coroutines and tasks inherit it;
+    code handing work to threads must copy the context (``contextvars.copy_context``)
+    or open its own scope.
+    """
+    if seconds is None:
+        yield current_deadline()
+        return
+    deadline = time.monotonic() + seconds
+    outer = _deadline.get()
+    if outer is not None:
+        deadline = min(deadline, outer)
+    token = _deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _deadline.reset(token)
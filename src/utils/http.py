@@ -0,0 +1,70 @@
+from typing import Any, Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .rate_limit import RateLimiterRegistry, parse_retry_after, rate_limiters
+
+DEFAULT_POOL_CONNECTIONS = 10
+DEFAULT_POOL_MAXSIZE = 10
+THROTTLE_STATUS_CODES = (429, 503)
+
+
+class RateLimitedAdapter(HTTPAdapter):
+    """HTTPAdapter that takes a token from the request host's bucket before sending.
+
+    Throttling responses carrying Retry-After pause the whole host bucket, so every
+    thread backs off together instead of retrying in lockstep.
+    """
+
+    def __init__(self, limiters: Optional[RateLimiterRegistry] = None, **kwargs):
+        self.limiters = limiters or rate_limiters
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        bucket = self.limiters.for_url(request.url)
+        if bucket is not None:
+            bucket.acquire()
+        response = super().send(request, **kwargs)
+        if bucket is not None and response.status_code in THROTTLE_STATUS_CODES:
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            if retry_after:
+                bucket.pause(retry_after)
+        return response
+
+
+def create_session(
+    pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+    pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+    keep_alive: bool = True,
+    pool_block: bool = False,
+) -> requests.Session:
+    """Create a pooled HTTP session.
+
+    ``pool_connections`` is the number of per-host pools kept alive and
+    ``pool_maxsize`` the number of connections kept per host. Retries are left to
+    ``retry_on_failure`` so the adapter itself never retries. Requests go through
+    the shared per-host rate limiters.
+    """
+    session = requests.Session()
+    adapter = RateLimitedAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        pool_block=pool_block,
+        max_retries=0,
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers["Accept-Encoding"] = "gzip, deflate"
+    session.headers["Connection"] = "keep-alive" if keep_alive else "close"
+    return session
+
+
+def session_from_config(config: Dict[str, Any]) -> requests.Session:
+    """Create a pooled HTTP session from ``http_*`` configuration keys."""
+    return create_session(
+        pool_connections=config.get("http_pool_connections") or DEFAULT_POOL_CONNECTIONS,
+        pool_maxsize=config.get("http_pool_maxsize") or DEFAULT_POOL_MAXSIZE,
+        keep_alive=config.get("http_keep_alive", True),
+        pool_block=config.get("http_pool_block", False),
+    )
@@ -0,0 +1,43 @@
+import threading
+from collections import Counter
+from typing import Dict
+
+
+class Metrics:
+    """Minimal in-process counters and gauges.
+
+    Names are dotted strings such as ``retry.amazon.attempts``; ``snapshot``
+    returns a copy that can be logged or exported by whatever reporting the
+    deployment uses.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Counter = Counter()
+        self._gauges: Dict[str, float] = {}
+
+    def incr(self, name: str, value: float = 1):
+        with self._lock:
+            self._counters[name] += value
+
+    def gauge(self, name: str, value: float):
+        with self._lock:
+            self._gauges[name] = value
+
+    def get(self, name: str) -> float:
+        with self._lock:
+            if name in self._gauges:
+                return self._gauges[name]
+            return self._counters.get(name, 0)
+
+    def snapshot(self) -> Dict[str, float]:
+        with self._lock:
+            return {**self._counters, **self._gauges}
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+
+
+metrics = Metrics()
@@ -0,0 +1,203 @@
+import shutil
+from itertools import groupby
+from operator import itemgetter
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Union
+from urllib.parse import quote
+
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from sqlalchemy import select
+
+from ..core.base_affiliate import Product
+from .database import PRODUCT_COLUMNS, Database, PriceHistoryModel, ProductModel, SaveStats
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+TIMESTAMP = pa.timestamp("us", tz="UTC")
+
+# Column types of the exported files; ``platform`` is the partition key, not a column
+PRODUCT_SCHEMA = pa.schema(
+    [
+        ("id", pa.string()),
+        ("title", pa.string()),
+        ("price", pa.float64()),
+        ("original_price", pa.float64()),
+        ("discount_percentage", pa.float64()),
+        ("url", pa.string()),
+        ("affiliate_url", pa.string()),
+        ("image_url", pa.string()),
+        ("rating", pa.float64()),
+        ("review_count", pa.int64()),
+        ("category", pa.string()),
+        ("description", pa.string()),
+        ("last_updated", TIMESTAMP),
+    ]
+)
+PRICE_HISTORY_SCHEMA = pa.schema([("id", pa.string()), ("ts", TIMESTAMP), ("price", pa.float64())])
+PARTITIONING = ds.partitioning(pa.schema([("platform", pa.string())]), flavor="hive")
+
+DEFAULT_CHUNK_SIZE = 50_000
+
+
+class _PartitionWriter:
+    """Write rows sorted by platform to one Parquet file per platform."""
+
+    def __init__(self, directory: Path, schema: pa.Schema, compression: str):
+        self.directory = directory
+        self.schema = schema
+        self.compression = compression
+        self.platform: Optional[str] = None
+        self.writer: Optional[pq.ParquetWriter] = None
+
+    def write(self, platform: str, rows: List[tuple]):
+        if platform != self.platform:
+            self.close()
+            path = self.directory / f"platform={quote(platform, safe='')}" / "part-0.parquet"
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self.writer = pq.ParquetWriter(path, self.schema, compression=self.compression)
+            self.platform = platform
+        columns = zip(*rows)
+        self.writer.write_table(
+            pa.Table.from_arrays(
+                [pa.array(values, type=field.type) for values, field in zip(columns, self.schema)],
+                schema=self.schema,
+            )
+        )
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+
+
+def _export_table(
+    db: Database, query, directory: Path, schema: pa.Schema, chunk_size: int, compression: str
+) -> int:
+    """Stream ``query`` (platform first, then the schema's columns, platform-ordered) to files."""
+    writer = _PartitionWriter(directory, schema, compression)
+    count = 0
+    try:
+        with db.engine.connect() as conn:
+            result = conn.execution_options(yield_per=chunk_size).execute(query)
+            for chunk in result.partitions():
+                for platform, rows in groupby(chunk, key=itemgetter(0)):
+                    rows = [row[1:] for row in rows]
+                    writer.write(platform, rows)
+                    count += len(rows)
+    finally:
+        writer.close()
+    return count
+
+
+def _prepare(directory: Path, overwrite: bool):
+    if directory.exists() and any(directory.iterdir()):
+        if not overwrite:
+            raise FileExistsError(f"{directory} is not empty; pass overwrite=True to replace it")
+        shutil.rmtree(directory)
+
+
+def export_parquet(
+    db: Database,
+    directory: Union[str, Path],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    include_history: bool = True,
+    overwrite: bool = False,
+    compression: str = "zstd",
+) -> Dict[str, int]:
+    """Export saved products (and price history) to partitioned Parquet files::
+
+        <directory>/products/platform=<platform>/part-0.parquet
+        <directory>/price_history/platform=<platform>/part-0.parquet
+
+    The layout is hive-style, so ``pandas.read_parquet(directory / "products")``
+    or ``pyarrow.dataset`` read it back with ``platform`` as a column. Rows are
+    streamed from the database ``chunk_size`` at a time and each chunk becomes a
+    row group, so memory is bounded by the chunk size, not the catalog. Returns
+    the number of rows written per table; an existing export in ``directory`` is
+    only replaced with ``overwrite``.
+    """
+    directory = Path(directory)
+    tables = {
+        "products": (
+            select(
+                ProductModel.platform,
+                *(ProductModel.__table__.c[name] for name in PRODUCT_SCHEMA.names),
+            ).order_by(ProductModel.platform, ProductModel.last_updated, ProductModel.id),
+            PRODUCT_SCHEMA,
+        )
+    }
+    if include_history:
+        tables["price_history"] = (
+            select(
+                PriceHistoryModel.platform,
+                PriceHistoryModel.id,
+                PriceHistoryModel.ts,
+                PriceHistoryModel.price,
+            ).order_by(PriceHistoryModel.platform, PriceHistoryModel.id, PriceHistoryModel.ts),
+            PRICE_HISTORY_SCHEMA,
+        )
+
+    counts = {}
+    for name, (query, schema) in tables.items():
+        target = directory / name
+        _prepare(target, overwrite)
+        counts[name] = _export_table(db, query, target, schema, chunk_size, compression)
+    logger.info(f"Exported {counts} to {directory}")
+    return counts
+
+
+def _batches(path: Path, chunk_size: int) -> Iterator[pa.RecordBatch]:
+    if not path.exists():
+        return iter(())
+    dataset = ds.dataset(path, format="parquet", partitioning=PARTITIONING)
+    return dataset.to_batches(batch_size=chunk_size)
+
+
+def iter_parquet_products(
+    directory: Union[str, Path], chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[List[Product]]:
+    """Read exported products back as lists of at most ``chunk_size`` products."""
+    names = [column.name for column in PRODUCT_COLUMNS]
+    for batch in _batches(Path(directory) / "products", chunk_size):
+        columns = [batch.column(name).to_pylist() for name in names]
+        yield [Product(*row) for row in zip(*columns)]
+
+
+def import_parquet(
+    db: Database,
+    directory: Union[str, Path],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    include_history: bool = True,
+) -> Dict[str, int]:
+    """Load an ``export_parquet`` directory through the bulk upsert path.
+
+    Each chunk of products is one ``save_products`` transaction that keeps the
+    exported ``last_updated`` times; history rows already present are skipped.
+    Returns the number of rows read per table. Importing into a database that
+    already has newer prices for the same products overwrites them with the
+    exported ones.
+    """
+    directory = Path(directory)
+    counts = {"products": 0}
+    stats = SaveStats()
+    for products in iter_parquet_products(directory, chunk_size):
+        # With the history imported below, new products need no history row of their own
+        saved = db.save_products(products, record_history=not include_history, keep_timestamps=True)
+        stats.new += saved.new
+        stats.changed += saved.changed
+        stats.unchanged += saved.unchanged
+        counts["products"] += len(products)
+
+    if include_history:
+        counts["price_history"] = 0
+        for batch in _batches(directory / "price_history", chunk_size):
+            counts["price_history"] += db.save_price_history(batch.to_pylist())
+
+    logger.info(
+        f"Imported {counts} from {directory}: {stats.new} new, {stats.changed} changed, "
+        f"{stats.unchanged} unchanged products"
+    )
+    return counts
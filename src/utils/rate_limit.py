@@ -0,0 +1,119 @@
+import asyncio
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+from .deadline import DeadlineExceeded, remaining
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class TokenBucket:
+    """Thread-safe token bucket refilled at ``rate`` tokens per second up to ``capacity``.
+
+    Callers reserve a token and are told how long to wait for it, so waiting
+    happens outside the lock and works for both threads and coroutines. ``acquire``
+    never waits past the caller's deadline (see ``utils.deadline``): when the token
+    would come too late it is handed back and ``DeadlineExceeded`` is raised.
+    """
+
+    def __init__(self, rate: float, capacity: int = 1):
+        self.rate = rate
+        self.capacity = max(1, capacity)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take one token and return the number of seconds to wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            return max(wait, self._paused_until - now)
+
+    def _reserve_within_deadline(self) -> float:
+        wait = self.reserve()
+        left = remaining()
+        if left is not None and wait > left:
+            with self._lock:
+                self._tokens = min(self.capacity, self._tokens + 1)
+            raise DeadlineExceeded(
+                f"Rate limit wait of {wait:.2f}s exceeds the {left:.2f}s left in the deadline"
+            )
+        return wait
+
+    def acquire(self):
+        wait = self._reserve_within_deadline()
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self):
+        wait = self._reserve_within_deadline()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def pause(self, seconds: float):
+        """Hold every caller back for ``seconds``, e.g. after a Retry-After response."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+
+class RateLimiterRegistry:
+    """Per-host token buckets shared by every provider in the process."""
+
+    def __init__(self):
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def configure(self, host: str, rate: float, burst: int = 1):
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None or bucket.rate != rate or bucket.capacity != max(1, burst):
+                self._buckets[host] = TokenBucket(rate, burst)
+                logger.debug(f"Rate limit for {host}: {rate}/s, burst {burst}")
+
+    def get(self, host: Optional[str]) -> Optional[TokenBucket]:
+        return self._buckets.get(host) if host else None
+
+    def for_url(self, url: str) -> Optional[TokenBucket]:
+        return self.get(urlparse(url).hostname)
+
+    def clear(self):
+        with self._lock:
+            self._buckets.clear()
+
+
+rate_limiters = RateLimiterRegistry()
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header given in seconds or as an HTTP date."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+def retry_after_from_exception(exc: BaseException) -> Optional[float]:
+    """Extract Retry-After from a requests or aiohttp HTTP error, if present."""
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None) or getattr(exc, "headers", None)
+    if not headers:
+        return None
+    return parse_retry_after(headers.get("Retry-After"))
@@ -1,38 +1,224 @@
+import asyncio
+import inspect
+import random
+import threading
 import time
 from functools import wraps
-from typing import Tuple, Type
+from typing import Any, Callable, Dict, Optional, Tuple, Type
 
+from .deadline import DeadlineExceeded, clamp_timeout, remaining
 from .logger import get_logger
+from .metrics import metrics
+from .rate_limit import retry_after_from_exception
 
 logger = get_logger(__name__)
 
 
+def _backoff_delay(
+    attempt: int,
+    base_delay: float,
+    jitter: bool,
+    max_delay: Optional[float],
+    exc: BaseException,
+) -> float:
+    """Exponential backoff, optionally with full jitter, never shorter than Retry-After."""
+    delay = base_delay * (2**attempt)
+    if max_delay is not None:
+        delay = min(delay, max_delay)
+    if jitter:
+        delay = random.uniform(0, delay)  # nosec B311 - not used for security
+    retry_after = retry_after_from_exception(exc)
+    if retry_after is not None:
+        delay = max(delay, retry_after)
+    return delay
+
+
+class RetryBudget:
+    """Cap retries at a fraction of calls so an outage cannot multiply traffic.
+
+    Every call deposits ``ratio`` tokens and every retry withdraws one. The
+    balance starts at, and never exceeds, ``min_retries`` so that a quiet
+    process can still retry the occasional failure.
+    """
+
+    def __init__(self, ratio: float = 0.2, min_retries: int = 10):
+        self.ratio = ratio
+        self.min_retries = min_retries
+        self._balance = float(min_retries)
+        self._lock = threading.Lock()
+
+    def deposit(self):
+        with self._lock:
+            self._balance = min(self.min_retries, self._balance + self.ratio)
+
+    def try_spend(self) -> bool:
+        with self._lock:
+            if self._balance < 1:
+                return False
+            self._balance -= 1
+            return True
+
+
+class Retrier:
+    """Retry engine shared by sync and async callables.
+
+    Each attempt is bounded by the caller's deadline (see ``utils.deadline``):
+    when ``timeout_arg`` names a keyword argument of the wrapped function, its
+    value is shrunk to the time remaining, and no retry is scheduled whose
+    backoff would end past the deadline. ``DeadlineExceeded`` from the attempt
+    itself is never retried, even when ``exceptions`` includes ``TimeoutError``.
+    Retries are also refused once the optional ``budget`` is spent. Calls,
+    attempts and give-ups are counted under ``retry.<name>.*`` in
+    ``utils.metrics``.
+    """
+
+    def __init__(
+        self,
+        max_retries: int = 3,
+        base_delay: float = 1.0,
+        exceptions: Tuple[Type[Exception], ...] = (Exception,),
+        jitter: bool = False,
+        max_delay: Optional[float] = None,
+        budget: Optional[RetryBudget] = None,
+        timeout_arg: Optional[str] = None,
+        default_timeout: Optional[float] = None,
+        name: str = "default",
+    ):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.exceptions = exceptions
+        self.jitter = jitter
+        self.max_delay = max_delay
+        self.budget = budget
+        self.timeout_arg = timeout_arg
+        self.default_timeout = default_timeout
+        self.name = name
+
+    def _metric(self, event: str):
+        metrics.incr(f"retry.{self.name}.{event}")
+
+    def _begin(self):
+        self._metric("calls")
+        if self.budget is not None:
+            self.budget.deposit()
+
+    def _prepare_attempt(self, func_name: str, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """Fail fast on an expired deadline and fit the attempt timeout into what is left."""
+        if remaining() == 0:
+            self._metric("deadline_exceeded")
+            raise DeadlineExceeded(f"{func_name}: deadline exceeded before attempt")
+        self._metric("attempts")
+        if self.timeout_arg:
+            timeout = kwargs.get(self.timeout_arg, self.default_timeout)
+            kwargs = {**kwargs, self.timeout_arg: clamp_timeout(timeout)}
+        return kwargs
+
+    def _next_delay(self, func_name: str, attempt: int, exc: BaseException) -> Optional[float]:
+        """Return how long to wait before the next attempt, or None to give up."""
+        if attempt >= self.max_retries - 1:
+            self._metric("exhausted")
+            logger.error(f"{func_name} failed after {self.max_retries} attempts: {exc}")
+            return None
+
+        delay = _backoff_delay(attempt, self.base_delay, self.jitter, self.max_delay, exc)
+        left = remaining()
+        if left is not None and delay >= left:
+            self._metric("deadline_exceeded")
+            logger.error(f"{func_name} failed, no time left in deadline to retry: {exc}")
+            return None
+        if self.budget is not None and not self.budget.try_spend():
+            self._metric("budget_exhausted")
+            logger.error(f"{func_name} failed, retry budget exhausted: {exc}")
+            return None
+
+        self._metric("retries")
+        logger.warning(
+            f"{func_name} failed (attempt {attempt + 1}/{self.max_retries}), "
+            f"retrying in {delay:.2f}s: {exc}"
+        )
+        return delay
+
+    def call(self, func: Callable, *args, **kwargs) -> Any:
+        self._begin()
+        for attempt in range(self.max_retries):
+            attempt_kwargs = self._prepare_attempt(func.__name__, kwargs)
+            try:
+                return func(*args, **attempt_kwargs)
+            except DeadlineExceeded:
+                raise
+            except self.exceptions as e:
+                delay = self._next_delay(func.__name__, attempt, e)
+                if delay is None:
+                    raise
+                time.sleep(delay)
+
+    async def call_async(self, func: Callable, *args, **kwargs) -> Any:
+        self._begin()
+        for attempt in range(self.max_retries):
+            attempt_kwargs = self._prepare_attempt(func.__name__, kwargs)
+            try:
+                return await func(*args, **attempt_kwargs)
+            except DeadlineExceeded:
+                raise
+            except self.exceptions as e:
+                delay = self._next_delay(func.__name__, attempt, e)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+
+
 def retry_on_failure(
     max_retries: int = 3,
     base_delay: float = 1.0,
     exceptions: Tuple[Type[Exception], ...] = (Exception,),
+    jitter: bool = False,
+    max_delay: Optional[float] = None,
+    budget: Optional[RetryBudget] = None,
+    timeout_arg: Optional[str] = None,
+    name: Optional[str] = None,
 ):
-    """Retry a function with exponential backoff."""
+    """Retry a function with exponential backoff.
+
+    With ``jitter`` each delay is drawn uniformly from ``[0, backoff]`` so that
+    concurrent callers do not retry in lockstep. A Retry-After header on the
+    raised HTTP error sets a lower bound for the delay. Coroutine functions are
+    supported as well; they back off with ``asyncio.sleep`` so the event loop is
+    never blocked. Deadlines, retry budgets and metrics are handled by
+    ``Retrier``; ``name`` defaults to the function's qualified name.
+    """
 
     def decorator(func):
+        default_timeout = None
+        if timeout_arg:
+            param = inspect.signature(func).parameters[timeout_arg]
+            if param.default is not inspect.Parameter.empty:
+                default_timeout = param.default
+        retrier = Retrier(
+            max_retries=max_retries,
+            base_delay=base_delay,
+            exceptions=exceptions,
+            jitter=jitter,
+            max_delay=max_delay,
+            budget=budget,
+            timeout_arg=timeout_arg,
+            default_timeout=default_timeout,
+            name=name or func.__qualname__,
+        )
+
+        if asyncio.iscoroutinefunction(func):
+
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                return await retrier.call_async(func, *args, **kwargs)
+
+            async_wrapper.retrier = retrier
+            return async_wrapper
+
         @wraps(func)
         def wrapper(*args, **kwargs):
-            last_exception = None
-            for attempt in range(max_retries):
-                try:
-                    return func(*args, **kwargs)
-                except exceptions as e:
-                    last_exception = e
-                    if attempt < max_retries - 1:
-                        delay = base_delay * (2**attempt)
-                        logger.warning(
-                            f"{func.__name__} failed (attempt {attempt + 1}/{max_retries}), "
-                            f"retrying in {delay}s: {e}"
-                        )
-                        time.sleep(delay)
-            logger.error(f"{func.__name__} failed after {max_retries} attempts: {last_exception}")
-            raise last_exception
+            return retrier.call(func, *args, **kwargs)
 
+        wrapper.retrier = retrier
         return wrapper
 
     return decorator
@@ -0,0 +1,179 @@
+import asyncio
+import inspect
+import threading
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from functools import wraps
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from .deadline import DeadlineExceeded, current_deadline, remaining
+
+
+class SingleFlight:
+    """Collapse concurrent identical calls into a single execution.
+
+    The first caller for a key runs the function; callers arriving while it is
+    still in flight wait for and share its result (or exception). Waiters give
+    up with ``DeadlineExceeded`` when their own deadline passes, and one left
+    with time after the leader ran out of its deadline runs the call again.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._inflight: Dict[Hashable, Tuple[Future, Optional[float]]] = {}
+        self.executions = 0
+        self.coalesced = 0
+
+    def do(self, key: Hashable, fn: Callable, *args, **kwargs) -> Any:
+        deadline = current_deadline()
+        with self._lock:
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[key] = (Future(), deadline)
+                self.executions += 1
+            else:
+                self.coalesced += 1
+        future, leader_deadline = flight
+
+        if not leader:
+            try:
+                return future.result(timeout=remaining())
+            except DeadlineExceeded:
+                if not _outlives(deadline, leader_deadline):
+                    raise
+                return self.do(key, fn, *args, **kwargs)
+            except FutureTimeoutError:
+                if future.done():
+                    return future.result()
+                raise DeadlineExceeded(
+                    f"Deadline passed waiting for in-flight call {key!r}"
+                ) from None
+
+        # The flight is dropped before waiters wake, so one running the call
+        # again starts a new flight instead of rejoining this one
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException as e:
+            self._land(key)
+            future.set_exception(e)
+            raise
+        self._land(key)
+        future.set_result(result)
+        return result
+
+    def _land(self, key: Hashable) -> None:
+        with self._lock:
+            self._inflight.pop(key, None)
+
+    def stats(self) -> Dict[str, int]:
+        return {"executions": self.executions, "coalesced": self.coalesced}
+
+
+class AsyncSingleFlight:
+    """Asyncio variant of SingleFlight; in-flight calls are tracked per event loop."""
+
+    def __init__(self):
+        self._inflight: Dict[Tuple[int, Hashable], Tuple[asyncio.Future, Optional[float]]] = {}
+        self.executions = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, fn: Callable, *args, **kwargs) -> Any:
+        deadline = current_deadline()
+        loop_key = (id(asyncio.get_running_loop()), key)
+        flight = self._inflight.get(loop_key)
+        if flight is None:
+            task = asyncio.ensure_future(fn(*args, **kwargs))
+            flight = self._inflight[loop_key] = (task, deadline)
+            task.add_done_callback(lambda _: self._inflight.pop(loop_key, None))
+            self.executions += 1
+        else:
+            self.coalesced += 1
+        task, leader_deadline = flight
+        try:
+            # A cancelled waiter must not cancel the shared call for everyone else
+            return await asyncio.wait_for(asyncio.shield(task), remaining())
+        except DeadlineExceeded:
+            if not _outlives(deadline, leader_deadline):
+                raise
+            return await self.do(key, fn, *args, **kwargs)
+        except asyncio.TimeoutError:
+            if task.done():
+                return task.result()
+            raise DeadlineExceeded(f"Deadline passed waiting for in-flight call {key!r}") from None
+
+    def stats(self) -> Dict[str, int]:
+        return {"executions": self.executions, "coalesced": self.coalesced}
+
+
+def _outlives(deadline: Optional[float], leader_deadline: Optional[float]) -> bool:
+    """Whether a waiter with ``deadline`` has time left after the leader's ran out."""
+    if leader_deadline is None:
+        return False
+    return deadline is None or deadline > leader_deadline
+
+
+flights = SingleFlight()
+async_flights = AsyncSingleFlight()
+
+
+def _normalize(value: Any, case_insensitive: bool) -> Any:
+    if isinstance(value, str):
+        value = " ".join(value.split())
+        return value.casefold() if case_insensitive else value
+    if isinstance(value, dict):
+        return tuple(sorted((k, _normalize(v, case_insensitive)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_normalize(v, case_insensitive) for v in value)
+    return value
+
+
+def coalesce(case_insensitive: bool = False):
+    """Share one upstream call between concurrent identical calls of a provider method.
+
+    Calls are keyed on ``(provider instance, method, normalized arguments)``:
+    defaults are applied, whitespace in strings is collapsed and, with
+    ``case_insensitive``, strings are case-folded. List results are copied per
+    caller; the Product objects inside are shared.
+    """
+
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        def make_key(self, args, kwargs) -> Hashable:
+            bound = signature.bind(self, *args, **kwargs)
+            bound.apply_defaults()
+            arguments = list(bound.arguments.items())[1:]
+            key = (
+                self,
+                func.__name__,
+                tuple((name, _normalize(value, case_insensitive)) for name, value in arguments),
+            )
+            hash(key)
+            return key
+
+        if asyncio.iscoroutinefunction(func):
+
+            @wraps(func)
+            async def async_wrapper(self, *args, **kwargs):
+                try:
+                    key = make_key(self, args, kwargs)
+                except TypeError:
+                    return await func(self, *args, **kwargs)
+                result = await async_flights.do(key, func, self, *args, **kwargs)
+                return list(result) if isinstance(result, list) else result
+
+            return async_wrapper
+
+        @wraps(func)
+        def wrapper(self, *args, **kwargs):
+            try:
+                key = make_key(self, args, kwargs)
+            except TypeError:
+                return func(self, *args, **kwargs)
+            result = flights.do(key, func, self, *args, **kwargs)
+            return list(result) if isinstance(result, list) else result
+
+        return wrapper
+
+    return decorator
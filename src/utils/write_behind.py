@@ -0,0 +1,178 @@
+import threading
+import time
+from itertools import islice
+from queue import Full
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from ..core.base_affiliate import Product
+from .logger import get_logger
+from .metrics import metrics
+
+logger = get_logger(__name__)
+
+
+class WriteBehindWriter:
+    """Buffer product upserts and write them in batches from a background thread.
+
+    ``put`` returns as soon as the product is queued. Pending products are keyed
+    by ``(id, platform)``, so a product written again before it is flushed only
+    replaces the queued copy (the intermediate price never reaches the price
+    history). The worker calls ``save_batch`` with up to ``batch_size`` products
+    once that many are pending or the oldest has waited ``flush_interval``
+    seconds. When ``max_pending`` distinct products are queued, ``put`` blocks
+    until the worker catches up, raising ``queue.Full`` after ``put_timeout``
+    seconds if one is set.
+
+    A batch whose write fails is logged and dropped. ``flush`` writes everything
+    pending before returning and ``close`` drains the queue and stops the thread;
+    both return how many products were dropped since the last of them returned.
+    Counters are reported under ``write_behind.*`` in ``utils.metrics``.
+    """
+
+    def __init__(
+        self,
+        save_batch: Callable[[List[Product]], Any],
+        batch_size: int = 500,
+        flush_interval: float = 1.0,
+        max_pending: int = 10_000,
+        put_timeout: Optional[float] = None,
+    ):
+        self.save_batch = save_batch
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_pending = max(max_pending, batch_size)
+        self.put_timeout = put_timeout
+
+        self._pending: Dict[Tuple[str, str], Product] = {}
+        self._oldest: Optional[float] = None
+        self._closed = False
+        self._dropped = 0
+        self._lock = threading.Lock()
+        self._ready = threading.Condition(self._lock)
+        self._space = threading.Condition(self._lock)
+        # Held while a batch is taken and written, so batches land in queue order
+        self._write_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="write-behind", daemon=True)
+        self._thread.start()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    def put(self, product: Product):
+        """Queue ``product`` for saving, waiting for room while the queue is full."""
+        key = (product.id, product.platform)
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Write-behind writer is closed")
+            if key in self._pending:
+                metrics.incr("write_behind.coalesced")
+            elif len(self._pending) >= self.max_pending:
+                metrics.incr("write_behind.blocked")
+                self._ready.notify()
+                if not self._space.wait_for(
+                    lambda: len(self._pending) < self.max_pending or self._closed,
+                    timeout=self.put_timeout,
+                ):
+                    raise Full(f"{self.max_pending} products waiting to be saved")
+                if self._closed:
+                    raise RuntimeError("Write-behind writer is closed")
+            self._pending.pop(key, None)
+            self._pending[key] = product
+            metrics.incr("write_behind.queued")
+            if self._oldest is None:
+                self._oldest = time.monotonic()
+                self._ready.notify()  # start the flush timer
+            elif len(self._pending) >= self.batch_size:
+                self._ready.notify()
+
+    def put_many(self, products: Iterable[Product]) -> int:
+        count = 0
+        for product in products:
+            self.put(product)
+            count += 1
+        return count
+
+    def _take(self) -> List[Product]:
+        with self._lock:
+            keys = list(islice(self._pending, self.batch_size))
+            batch = [self._pending.pop(key) for key in keys]
+            self._oldest = time.monotonic() if self._pending else None
+            metrics.gauge("write_behind.pending", len(self._pending))
+            self._space.notify_all()
+        return batch
+
+    def _write(self, batch: List[Product]):
+        try:
+            self.save_batch(batch)
+            metrics.incr("write_behind.flushed", len(batch))
+        except Exception as e:
+            metrics.incr("write_behind.dropped", len(batch))
+            with self._lock:
+                self._dropped += len(batch)
+            logger.error(f"Error saving {len(batch)} buffered products: {e}")
+
+    def _wait_for_batch(self) -> bool:
+        """Block until a batch is due; False once closed with nothing left to write."""
+        with self._lock:
+            while len(self._pending) < self.batch_size and not self._closed:
+                if self._oldest is None:
+                    self._ready.wait()
+                    continue
+                wait = self._oldest + self.flush_interval - time.monotonic()
+                if wait <= 0:
+                    break
+                self._ready.wait(wait)
+            return bool(self._pending) or not self._closed
+
+    def _run(self):
+        while self._wait_for_batch():
+            with self._write_lock:
+                batch = self._take()
+                if batch:
+                    self._write(batch)
+
+    def flush(self) -> int:
+        """Write every pending product before returning.
+
+        Returns the number of products dropped by failed writes since the last
+        ``flush`` or ``close``, including batches written by the background thread.
+        """
+        with self._write_lock:
+            while True:
+                batch = self._take()
+                if not batch:
+                    break
+                self._write(batch)
+            with self._lock:
+                dropped, self._dropped = self._dropped, 0
+        return dropped
+
+    def close(self, timeout: Optional[float] = None) -> int:
+        """Stop accepting products, write what is pending and stop the thread.
+
+        Returns the number of dropped products, like ``flush``.
+        """
+        with self._lock:
+            if self._closed:
+                return 0
+            self._closed = True
+            self._ready.notify_all()
+            self._space.notify_all()
+        self._thread.join(timeout)
+        return self.flush()
+
+
+def writer_from_config(
+    save_batch: Callable[[List[Product]], Any], config: Dict[str, Any]
+) -> Optional[WriteBehindWriter]:
+    """Build the write-behind writer from the ``write_behind_*`` settings, or None when disabled."""
+    if not config.get("write_behind_enabled", True):
+        return None
+    return WriteBehindWriter(
+        save_batch,
+        batch_size=config.get("write_behind_batch_size") or 500,
+        flush_interval=config.get("write_behind_flush_interval") or 1.0,
+        max_pending=config.get("write_behind_max_pending") or 10_000,
+        put_timeout=config.get("write_behind_put_timeout"),
+    )
@@ -1,9 +1,17 @@
+from pathlib import Path
 from unittest.mock import Mock, patch
 
 import pytest
 
 from src.core.base_affiliate import Product
 from src.platforms.amazon.amazon_affiliate import AmazonAffiliate
+from src.platforms.amazon.lxml_extractor import iter_search_results
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def _comparable(products):
+    return [{k: v for k, v in p.to_dict().items() if k != "last_updated"} for p in products]
 
 
 class TestAmazonAffiliate:
@@ -20,20 +28,108 @@ class TestAmazonAffiliate:
         assert "tag=test-tag-20" in affiliate_url
         assert "amazon.com" in affiliate_url
 
-    @patch('requests.get')
-    def test_search_products(self, mock_get, amazon_affiliate):
+    def test_search_products(self, amazon_affiliate):
         """Test product search."""
         # Mock response
         mock_response = Mock()
         mock_response.status_code = 200
         mock_response.content = b'<html>Mock Amazon search results</html>'
-        mock_get.return_value = mock_response
 
-        products = amazon_affiliate.search_products("laptop")
+        with patch.object(amazon_affiliate.session, 'get', return_value=mock_response) as mock_get:
+            products = amazon_affiliate.search_products("laptop")
 
         assert isinstance(products, list)
         mock_get.assert_called_once()
 
+    def test_shared_session(self):
+        """Test providers reuse a session passed through the config."""
+        session = Mock()
+        amazon = AmazonAffiliate({"amazon_associate_tag": "test-tag-20", "http_session": session})
+
+        assert amazon.session is session
+        amazon.close()
+        session.close.assert_not_called()
+
+    def test_lxml_search_matches_html_parser(self):
+        """Test the lxml fast path builds the same products as BeautifulSoup."""
+        content = (FIXTURES / "amazon_search.html").read_bytes()
+        fast = AmazonAffiliate({"amazon_associate_tag": "test-tag-20"})
+        slow = AmazonAffiliate(
+            {"amazon_associate_tag": "test-tag-20", "amazon_html_parser": "html.parser"}
+        )
+
+        fast_products = fast._parse_search_page(content, max_results=10)
+        slow_products = slow._parse_search_page(content, max_results=10)
+
+        assert _comparable(fast_products) == _comparable(slow_products)
+        assert [p.id for p in fast_products] == [
+            "B0TEST0001",
+            "B0TEST0002",
+            "B0TEST0004",
+            "B0TEST0005",
+        ]
+        assert fast_products[0].title == "Café Wireless Headphones™ – Noise Cancelling"
+        assert fast_products[0].price == 1299.0
+        assert fast_products[1].price == 0.0
+        assert fast_products[2].url == "https://www.amazon.com"
+
+    def test_lxml_search_respects_max_results(self):
+        """Test the fast path stops at max_results result containers."""
+        content = (FIXTURES / "amazon_search.html").read_bytes()
+        fast = AmazonAffiliate({"amazon_associate_tag": "test-tag-20"})
+        slow = AmazonAffiliate(
+            {"amazon_associate_tag": "test-tag-20", "amazon_html_parser": "html.parser"}
+        )
+
+        for limit in range(6):
+            assert _comparable(fast._parse_search_page(content, limit)) == _comparable(
+                slow._parse_search_page(content, limit)
+            )
+
+    def test_iter_search_results_stops_early(self):
+        """Test the pull parser is not fed past the requested results."""
+        content = (FIXTURES / "amazon_search.html").read_bytes()
+        padding = b"<div>" + b"x" * 200_000 + b"</div>"
+        page = content.replace(b'<div id="footer">', padding + b'<div id="footer">')
+
+        with patch("src.platforms.amazon.lxml_extractor.CHUNK_SIZE", 1024):
+            asins = [el.get("data-asin") for el in iter_search_results(page, max_results=2)]
+
+        assert asins == ["B0TEST0001", "B0TEST0002"]
+
+    def test_lxml_product_page_matches_html_parser(self):
+        """Test detail page parsing is identical for both parsers."""
+        content = (FIXTURES / "amazon_product.html").read_bytes()
+        fast = AmazonAffiliate({"amazon_associate_tag": "test-tag-20"})
+        slow = AmazonAffiliate(
+            {"amazon_associate_tag": "test-tag-20", "amazon_html_parser": "html.parser"}
+        )
+
+        fast_product = fast._parse_product_page(content, "B0TEST0001")
+        slow_product = slow._parse_product_page(content, "B0TEST0001")
+
+        assert _comparable([fast_product]) == _comparable([slow_product])
+        assert fast_product.title == "Café Wireless Headphones™ – Noise Cancelling"
+        assert fast_product.description == "40 hour battery life\nActive noise cancellation"
+        assert fast_product.rating == 4.6
+
+    def test_iter_search_products_is_lazy(self, amazon_affiliate):
+        """Test products are yielded one at a time."""
+        content = (FIXTURES / "amazon_search.html").read_bytes()
+
+        with patch.object(amazon_affiliate, '_fetch_page', return_value=content):
+            stream = amazon_affiliate.iter_search_products("headphones", max_results=10)
+            first = next(stream)
+            rest = list(stream)
+
+        assert first.id == "B0TEST0001"
+        assert [p.id for p in rest] == ["B0TEST0002", "B0TEST0004", "B0TEST0005"]
+
+    def test_iter_search_products_fetch_error(self, amazon_affiliate):
+        """Test fetch errors end the stream without raising."""
+        with patch.object(amazon_affiliate, '_fetch_page', side_effect=Exception("blocked")):
+            assert list(amazon_affiliate.iter_search_products("headphones")) == []
+
     def test_validate_config(self, amazon_affiliate):
         """Test config validation."""
         assert amazon_affiliate.validate_config()
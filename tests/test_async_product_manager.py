@@ -0,0 +1,90 @@
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from src.core.async_product_manager import AsyncProductManager
+from src.core.base_affiliate import Product
+from src.core.product_manager import STATUS_OK, STATUS_TIMEOUT
+
+
+class TestAsyncProductManager:
+    @pytest.fixture
+    def manager(self):
+        config = {
+            "amazon_associate_tag": "test-tag-20",
+            "flipkart_affiliate_id": "test-id",
+            "flipkart_affiliate_token": "test-token",
+        }
+        return AsyncProductManager(config, max_concurrency=2)
+
+    @pytest.fixture
+    def sample_products(self):
+        return [
+            Product(id="A1", title="A", price=10, discount_percentage=30.0, platform="Amazon"),
+            Product(id="A2", title="B", price=10, discount_percentage=15.0, platform="Amazon"),
+        ]
+
+    def test_search_all_platforms(self, manager, sample_products):
+        manager.providers["amazon"].search_products = AsyncMock(return_value=sample_products)
+        manager.providers["flipkart"].search_products = AsyncMock(return_value=[])
+
+        results = asyncio.run(manager.search_all_platforms("laptop"))
+
+        assert len(results["amazon"]) == 2
+        assert results["flipkart"] == []
+        assert manager.last_status["amazon"].status == STATUS_OK
+
+    def test_provider_timeout(self, manager, sample_products):
+        async def slow(*args, **kwargs):
+            await asyncio.sleep(1)
+
+        manager.providers["amazon"].search_products = AsyncMock(return_value=sample_products)
+        manager.providers["flipkart"].search_products = slow
+        manager.provider_timeouts = {"flipkart": 0.05}
+
+        results = asyncio.run(manager.search_all_platforms("laptop"))
+
+        assert len(results["amazon"]) == 2
+        assert manager.last_status["flipkart"].status == STATUS_TIMEOUT
+
+    def test_get_best_deals(self, manager, sample_products):
+        manager.providers["amazon"].get_trending_products = AsyncMock(return_value=sample_products)
+        manager.providers["flipkart"].get_trending_products = AsyncMock(return_value=[])
+
+        deals = asyncio.run(manager.get_best_deals(min_discount=20.0))
+        assert [d.id for d in deals] == ["A1"]
+
+    def test_get_best_deals_limit(self, manager, sample_products):
+        manager.providers["amazon"].get_trending_products = AsyncMock(return_value=sample_products)
+        manager.providers["flipkart"].get_trending_products = AsyncMock(
+            return_value=[
+                Product(
+                    id="F1", title="F", price=5.0, discount_percentage=40.0, platform="Flipkart"
+                )
+            ]
+        )
+
+        deals = asyncio.run(manager.get_best_deals(min_discount=10.0, limit=2))
+        assert [d.id for d in deals] == ["F1", "A1"]
+
+    def test_lookup_many_respects_concurrency_limit(self, manager):
+        in_flight = 0
+        peak = 0
+
+        async def details(product_id):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return Product(id=product_id, title=product_id, price=1.0, platform="Amazon")
+
+        manager.providers["amazon"].get_product_details = details
+        items = [("amazon", f"ID{i}") for i in range(20)] + [("amazon", "ID0"), ("ebay", "X")]
+
+        results = asyncio.run(manager.lookup_many(items))
+
+        assert len(results) == 20
+        assert results[("amazon", "ID3")].id == "ID3"
+        assert peak == 2
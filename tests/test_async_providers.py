@@ -0,0 +1,200 @@
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import aiohttp
+import pytest
+
+from src.core.async_base_affiliate import SyncProviderAdapter
+from src.platforms.amazon.amazon_affiliate import CaptchaError
+from src.platforms.amazon.async_amazon_affiliate import AsyncAmazonAffiliate
+from src.platforms.flipkart.async_flipkart_affiliate import AsyncFlipkartAffiliate
+from src.utils.cache import CacheEntry, ResponseCache
+from src.utils.circuit_breaker import CircuitBreaker
+
+SEARCH_PAGE = b"""
+<html><body>
+<div data-component-type="s-search-result" data-asin="B000TEST01">
+  <h2 class="s-size-mini-headline"><span>Test Laptop</span></h2>
+  <span class="a-price-whole">1,299.</span>
+  <a class="a-link-normal" href="/dp/B000TEST01">link</a>
+  <img class="s-image" src="https://img.example.com/1.jpg"/>
+  <span class="a-icon-alt">4.5 out of 5 stars</span>
+</div>
+</body></html>
+"""
+
+FLIPKART_PRODUCT = {
+    "productBaseInfoV1": {
+        "productId": "FK123",
+        "title": "Test Product",
+        "flipkartSellingPrice": {"amount": 999},
+        "maximumRetailPrice": {"amount": 1499},
+        "productUrl": "https://flipkart.com/product/FK123",
+        "imageUrls": {},
+        "categoryPath": "",
+        "productDescription": "",
+    }
+}
+
+
+class TestAsyncAmazonAffiliate:
+    @pytest.fixture
+    def amazon(self):
+        return AsyncAmazonAffiliate({"amazon_associate_tag": "test-tag-20"})
+
+    def test_missing_config(self):
+        with pytest.raises(ValueError):
+            AsyncAmazonAffiliate({})
+
+    def test_search_products(self, amazon):
+        with patch.object(amazon, "_fetch_page", AsyncMock(return_value=SEARCH_PAGE)):
+            products = asyncio.run(amazon.search_products("laptop"))
+
+        assert len(products) == 1
+        assert products[0].id == "B000TEST01"
+        assert products[0].rating == 4.5
+        assert "tag=test-tag-20" in products[0].affiliate_url
+
+    def test_search_products_error(self, amazon):
+        with patch.object(amazon, "_fetch_page", AsyncMock(side_effect=Exception("boom"))):
+            products = asyncio.run(amazon.search_products("laptop"))
+
+        assert products == []
+
+
+class TestAsyncFlipkartAffiliate:
+    @pytest.fixture
+    def flipkart(self):
+        return AsyncFlipkartAffiliate(
+            {"flipkart_affiliate_id": "test-id", "flipkart_affiliate_token": "test-token"}
+        )
+
+    def test_search_products(self, flipkart):
+        data = {"products": [FLIPKART_PRODUCT]}
+        with patch.object(flipkart, "_api_get", AsyncMock(return_value=data)):
+            products = asyncio.run(flipkart.search_products("laptop"))
+
+        assert len(products) == 1
+        assert products[0].id == "FK123"
+        assert products[0].discount_percentage == 33.4
+
+    def test_get_product_details(self, flipkart):
+        with patch.object(flipkart, "_api_get", AsyncMock(return_value=FLIPKART_PRODUCT)):
+            product = asyncio.run(flipkart.get_product_details("FK123"))
+
+        assert product.id == "FK123"
+
+    def test_get_product_details_many(self, flipkart):
+        async def api_get(url, params=None):
+            if url.endswith("BAD"):
+                raise ValueError("bad id")
+            return FLIPKART_PRODUCT
+
+        with patch.object(flipkart, "_api_get", side_effect=api_get):
+            results = asyncio.run(flipkart.get_product_details_many(["FK123", "BAD", "FK123"]))
+
+        assert list(results) == ["FK123", "BAD"]
+        assert results["FK123"].ok
+        assert results["BAD"].error == "bad id"
+
+
+class FakeResponse:
+    def __init__(self, body=b"", status=200, headers=None):
+        self.body, self.status, self.headers = body, status, headers or {}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def raise_for_status(self):
+        if self.status >= 400:
+            raise aiohttp.ClientError(self.status)
+
+    async def read(self):
+        return self.body
+
+
+class FakeSession:
+    """Minimal aiohttp.ClientSession stand-in returning queued responses."""
+
+    closed = False
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.calls = []
+
+    def get(self, url, headers=None, params=None, timeout=None):
+        self.calls.append(headers)
+        return self.responses.pop(0)
+
+
+class TestAsyncResponseCache:
+    URL = "https://www.amazon.com/s?k=laptop"
+
+    def _amazon(self, session, cache, breaker=None):
+        return AsyncAmazonAffiliate(
+            {
+                "amazon_associate_tag": "test-tag-20",
+                "aiohttp_session": session,
+                "response_cache": cache,
+                "circuit_breaker": breaker,
+            }
+        )
+
+    def test_fresh_hit_skips_upstream(self):
+        session = FakeSession(FakeResponse(SEARCH_PAGE))
+        amazon = self._amazon(session, ResponseCache())
+
+        assert asyncio.run(amazon._fetch_page(self.URL)) == SEARCH_PAGE
+        assert asyncio.run(amazon._fetch_page(self.URL)) == SEARCH_PAGE
+        assert len(session.calls) == 1
+
+    def test_stale_entry_revalidated_with_etag(self):
+        session = FakeSession(
+            FakeResponse(SEARCH_PAGE, headers={"ETag": '"abc"'}), FakeResponse(status=304)
+        )
+        cache = ResponseCache(ttl_rules={r"amazon": 0})
+        amazon = self._amazon(session, cache)
+
+        assert asyncio.run(amazon._fetch_page(self.URL)) == SEARCH_PAGE
+        assert asyncio.run(amazon._fetch_page(self.URL)) == SEARCH_PAGE
+        assert session.calls[1]["If-None-Match"] == '"abc"'
+        assert cache.stats()["revalidations"] == 1
+
+    def test_captcha_page_not_cached(self):
+        session = FakeSession(FakeResponse(b"<form action='/errors/validateCaptcha'>"))
+        cache = ResponseCache()
+        amazon = self._amazon(session, cache)
+
+        with pytest.raises(CaptchaError):
+            asyncio.run(amazon._fetch_page.__wrapped__(amazon, self.URL))
+        assert cache.stats()["entries"] == 0
+
+    def test_open_circuit_serves_stale_cache(self):
+        cache = ResponseCache()
+        cache.put(self.URL, CacheEntry(body=b"old page", expires_at=0))
+        breaker = CircuitBreaker("amazon", min_calls=1, reset_timeout=60)
+        breaker.record_failure()
+        session = FakeSession()
+        amazon = self._amazon(session, cache, breaker)
+
+        assert asyncio.run(amazon._fetch_page(self.URL)) == b"old page"
+        assert session.calls == []
+
+
+class TestSyncProviderAdapter:
+    def test_runs_async_provider(self):
+        provider = AsyncFlipkartAffiliate(
+            {"flipkart_affiliate_id": "test-id", "flipkart_affiliate_token": "test-token"}
+        )
+        adapter = SyncProviderAdapter(provider)
+        data = {"topOffersList": [FLIPKART_PRODUCT]}
+
+        with patch.object(provider, "_api_get", AsyncMock(return_value=data)):
+            products = adapter.get_trending_products()
+
+        assert adapter.platform_name == "Flipkart"
+        assert [p.id for p in products] == ["FK123"]
+        adapter.close()
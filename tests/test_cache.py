@@ -0,0 +1,117 @@
+import time
+from unittest.mock import Mock
+
+import pytest
+
+from src.utils.cache import CacheEntry, ResponseCache
+
+
+def _response(body=b"body", status=200, headers=None):
+    response = Mock()
+    response.content = body
+    response.status_code = status
+    response.headers = headers or {}
+    return response
+
+
+class TestResponseCache:
+    @pytest.fixture
+    def session(self):
+        return Mock()
+
+    def test_fresh_hit_skips_upstream(self, session):
+        cache = ResponseCache()
+        session.get.return_value = _response(b"page")
+
+        assert cache.fetch(session, "https://www.amazon.com/s?k=laptop") == b"page"
+        assert cache.fetch(session, "https://www.amazon.com/s?k=laptop") == b"page"
+
+        assert session.get.call_count == 1
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    def test_params_are_part_of_key(self, session):
+        cache = ResponseCache()
+        session.get.side_effect = [_response(b"a"), _response(b"b")]
+        url = "https://affiliate-api.flipkart.net/affiliate/search/json"
+
+        assert cache.fetch(session, url, params={"query": "a"}) == b"a"
+        assert cache.fetch(session, url, params={"query": "b"}) == b"b"
+
+    def test_stale_entry_revalidated_with_etag(self, session):
+        cache = ResponseCache(default_ttl=0, ttl_rules={})
+        url = "https://example.com/page"
+        session.get.side_effect = [
+            _response(b"v1", headers={"ETag": '"abc"'}),
+            _response(b"", status=304),
+        ]
+
+        assert cache.fetch(session, url) == b"v1"
+        assert cache.fetch(session, url) == b"v1"
+
+        conditional_headers = session.get.call_args_list[1].kwargs["headers"]
+        assert conditional_headers["If-None-Match"] == '"abc"'
+        assert cache.stats()["revalidations"] == 1
+
+    def test_no_store_not_cached(self, session):
+        cache = ResponseCache()
+        session.get.return_value = _response(b"x", headers={"Cache-Control": "no-store"})
+
+        cache.fetch(session, "https://example.com/a")
+        cache.fetch(session, "https://example.com/a")
+        assert session.get.call_count == 2
+
+    def test_errors_not_cached(self, session):
+        cache = ResponseCache()
+        response = _response(status=503)
+        response.raise_for_status.side_effect = Exception("503")
+        session.get.return_value = response
+
+        with pytest.raises(Exception):
+            cache.fetch(session, "https://example.com/a")
+        assert cache.stats()["entries"] == 0
+
+    def test_ttl_rules(self):
+        cache = ResponseCache(default_ttl=60, ttl_rules={r"/dp/": 5})
+
+        assert cache.ttl_for("https://www.amazon.com/dp/B000") == 5
+        assert cache.ttl_for("https://www.amazon.com/s?k=x") == 600
+        assert cache.ttl_for("https://example.com/other") == 60
+
+    def test_ttl_rules_override_default_pattern(self):
+        cache = ResponseCache(ttl_rules={"/products/": 5, "/offers/": 1800})
+        assert cache.ttl_for("https://affiliate-api.flipkart.net/products/X") == 5
+        assert cache.ttl_for("https://affiliate-api.flipkart.net/offers/v1/all") == 1800
+        assert cache.ttl_for("https://www.amazon.com/dp/B000") == 300
+
+    def test_lru_eviction_by_count_and_size(self):
+        cache = ResponseCache(max_entries=2, max_bytes=10)
+        expires = time.time() + 60
+
+        cache.put("a", CacheEntry(b"1234", expires))
+        cache.put("b", CacheEntry(b"1234", expires))
+        cache.get("a")
+        cache.put("c", CacheEntry(b"1234", expires))
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        cache.put("d", CacheEntry(b"123456789", expires))
+        assert cache.stats()["bytes"] <= 10
+        assert cache.stats()["evictions"] >= 2
+
+    def test_disk_tier_survives_new_instance(self, tmp_path, session):
+        session.get.return_value = _response(b"persisted", headers={"ETag": '"v1"'})
+        ResponseCache(disk_path=tmp_path).fetch(session, "https://www.amazon.com/dp/B000")
+
+        cache = ResponseCache(disk_path=tmp_path)
+        assert cache.fetch(session, "https://www.amazon.com/dp/B000") == b"persisted"
+        assert session.get.call_count == 1
+        assert cache.get("https://www.amazon.com/dp/B000").etag == '"v1"'
+
+    def test_disk_tier_size_bound(self, tmp_path):
+        cache = ResponseCache(disk_path=tmp_path, disk_max_bytes=600)
+        expires = time.time() + 60
+        for i in range(10):
+            cache.put(f"key{i}", CacheEntry(b"x" * 100, expires))
+
+        assert sum(p.stat().st_size for p in tmp_path.glob("*.cache")) <= 600
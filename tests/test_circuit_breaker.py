@@ -0,0 +1,241 @@
+import asyncio
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+import requests
+
+from src.core.base_affiliate import Product
+from src.core.product_manager import STATUS_OPEN, ProductManager
+from src.platforms.amazon.amazon_affiliate import AmazonAffiliate, CaptchaError
+from src.utils.cache import CacheEntry, ResponseCache
+from src.utils.circuit_breaker import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    CircuitOpenError,
+    counts_as_failure,
+)
+from src.utils.deadline import DeadlineExceeded
+from src.utils.metrics import metrics
+
+
+def _http_error(status):
+    response = requests.Response()
+    response.status_code = status
+    return requests.HTTPError(response=response)
+
+
+class TestCircuitBreaker:
+    @pytest.fixture
+    def clock(self):
+        with patch('src.utils.circuit_breaker.time.monotonic', return_value=1000.0) as clock:
+            yield clock
+
+    @pytest.fixture
+    def breaker(self, clock):
+        return CircuitBreaker("test", failure_threshold=0.5, min_calls=4, reset_timeout=10)
+
+    def test_opens_at_failure_rate(self, breaker):
+        for _ in range(2):
+            breaker.record_success()
+        breaker.record_failure()
+        assert breaker.state == CLOSED
+        breaker.record_failure()
+        assert breaker.state == OPEN
+        assert not breaker.allow_request()
+
+    def test_needs_min_calls(self, breaker):
+        for _ in range(3):
+            breaker.record_failure()
+        assert breaker.state == CLOSED
+
+    def test_half_open_probe_closes(self, breaker, clock):
+        for _ in range(4):
+            breaker.record_failure()
+        clock.return_value += 10
+        assert breaker.state == HALF_OPEN
+        assert breaker.allow_request()
+        assert not breaker.allow_request()  # only one probe at a time
+        breaker.record_success()
+        assert breaker.state == CLOSED
+
+    def test_failed_probe_reopens(self, breaker, clock):
+        for _ in range(4):
+            breaker.record_failure()
+        clock.return_value += 10
+        assert breaker.allow_request()
+        breaker.record_failure()
+        assert breaker.state == OPEN
+
+    def test_cancelled_probe_reopens(self, breaker, clock):
+        for _ in range(4):
+            breaker.record_failure()
+        clock.return_value += 10
+
+        async def probe():
+            with breaker.guard():
+                await asyncio.sleep(0)
+
+        # Cancel the probe mid-flight the way asyncio.wait_for does on timeout
+        coro = probe()
+        coro.send(None)
+        with pytest.raises(asyncio.CancelledError):
+            coro.throw(asyncio.CancelledError())
+        assert breaker.state == OPEN
+        clock.return_value += 10
+        assert breaker.allow_request()
+
+    def test_cancelled_call_is_not_recorded(self, breaker):
+        with pytest.raises(KeyboardInterrupt), breaker.guard():
+            raise KeyboardInterrupt
+        assert breaker.stats()["calls"] == 0
+
+    def test_local_deadline_is_not_a_failure(self, breaker):
+        for _ in range(4):
+            with pytest.raises(DeadlineExceeded), breaker.guard():
+                raise DeadlineExceeded("rate limit wait exceeds deadline")
+        assert breaker.state == CLOSED
+        assert breaker.stats()["calls"] == 0
+
+    def test_guard_fails_fast_when_open(self, breaker):
+        for _ in range(4):
+            breaker.record_failure()
+        called = Mock()
+        with pytest.raises(CircuitOpenError):
+            with breaker.guard():
+                called()
+        called.assert_not_called()
+
+    def test_guard_ignores_client_errors(self, breaker):
+        for _ in range(4):
+            with pytest.raises(requests.HTTPError), breaker.guard():
+                raise _http_error(404)
+        assert breaker.state == CLOSED
+
+    def test_failure_classification(self):
+        assert counts_as_failure(_http_error(503))
+        assert counts_as_failure(_http_error(429))
+        assert counts_as_failure(requests.ConnectionError())
+        assert not counts_as_failure(_http_error(404))
+
+    def test_state_reported_to_metrics(self, breaker):
+        for _ in range(4):
+            breaker.record_failure()
+        assert metrics.get("circuit.test.state") == 2
+        assert metrics.get("circuit.test.opened") >= 1
+
+
+class TestProviderBreaker:
+    @pytest.fixture
+    def open_breaker(self):
+        breaker = CircuitBreaker("amazon", min_calls=1, reset_timeout=60)
+        breaker.record_failure()
+        return breaker
+
+    def test_open_circuit_serves_stale_cache(self, open_breaker):
+        cache = ResponseCache()
+        url = "https://www.amazon.com/s?k=laptop"
+        cache.put(url, CacheEntry(body=b"old page", expires_at=0))
+        session = Mock()
+        amazon = AmazonAffiliate(
+            {
+                "amazon_associate_tag": "test-tag-20",
+                "http_session": session,
+                "response_cache": cache,
+                "circuit_breaker": open_breaker,
+            }
+        )
+
+        assert amazon._http_get(url) == b"old page"
+        session.get.assert_not_called()
+
+    def test_fresh_cache_hit_is_not_a_provider_call(self):
+        cache = ResponseCache()
+        url = "https://www.amazon.com/s?k=laptop"
+        cache.put(url, CacheEntry(body=b"cached page", expires_at=time.time() + 60))
+        session = Mock()
+        breaker = CircuitBreaker("amazon", min_calls=1, reset_timeout=0)
+        amazon = AmazonAffiliate(
+            {
+                "amazon_associate_tag": "test-tag-20",
+                "http_session": session,
+                "response_cache": cache,
+                "circuit_breaker": breaker,
+            }
+        )
+
+        # A fresh hit must not count as the half-open probe and close the circuit
+        breaker.record_failure()
+        assert breaker.state == HALF_OPEN
+        assert amazon._http_get(url) == b"cached page"
+        assert breaker.state == HALF_OPEN
+
+        # Nor fill the failure-rate window with successes while closed
+        breaker.record_success()
+        assert breaker.state == CLOSED
+        for _ in range(5):
+            assert amazon._http_get(url) == b"cached page"
+        assert breaker.stats()["calls"] == 0
+        session.get.assert_not_called()
+
+    def test_open_circuit_without_cache_fails_fast(self, open_breaker):
+        session = Mock()
+        amazon = AmazonAffiliate(
+            {
+                "amazon_associate_tag": "test-tag-20",
+                "http_session": session,
+                "circuit_breaker": open_breaker,
+            }
+        )
+        with pytest.raises(CircuitOpenError):
+            amazon._http_get("https://www.amazon.com/s?k=laptop")
+        session.get.assert_not_called()
+
+    def test_captcha_page_counts_as_failure(self):
+        breaker = CircuitBreaker("amazon", min_calls=1)
+        session = Mock()
+        session.get.return_value = Mock(
+            status_code=200, content=b"<form action='/errors/validateCaptcha'>", headers={}
+        )
+        amazon = AmazonAffiliate(
+            {
+                "amazon_associate_tag": "test-tag-20",
+                "http_session": session,
+                "circuit_breaker": breaker,
+            }
+        )
+
+        with pytest.raises(CaptchaError):
+            amazon._check_page(session.get.return_value.content)
+        # The captcha opens the circuit, so the retry fails fast instead of hitting Amazon again
+        with patch('src.utils.retry.time.sleep'), pytest.raises(CircuitOpenError):
+            amazon._fetch_page("https://www.amazon.com/s?k=laptop")
+        assert breaker.state == OPEN
+        assert session.get.call_count == 1
+
+
+class TestManagerFallback:
+    def test_open_circuit_falls_back_to_saved_products(self, tmp_path):
+        manager = ProductManager(
+            {
+                "database_url": f"sqlite:///{tmp_path / 'test.db'}",
+                "amazon_associate_tag": "test-tag-20",
+                "circuit_min_calls": 1,
+            }
+        )
+        manager.save_product(
+            Product(id="A1", title="Gaming Laptop", price=999.0, platform="Amazon")
+        )
+        manager.save_product(Product(id="A2", title="Desk Lamp", price=20.0, platform="Amazon"))
+        manager.breakers["amazon"].record_failure()
+
+        with patch.object(manager.providers["amazon"], "search_products") as search:
+            results = manager.search_all_platforms("laptop")
+
+        search.assert_not_called()
+        assert [p.id for p in results["amazon"]] == ["A1"]
+        assert manager.last_status["amazon"].status == STATUS_OPEN
+        assert manager.circuit_states()["amazon"]["state"] == OPEN
+        manager.close()
@@ -1,7 +1,25 @@
+import sqlite3
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
 import pytest
+from alembic.autogenerate import compare_metadata
+from alembic.config import Config
+from alembic.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy import event, insert, select, text
 
 from src.core.base_affiliate import Product
-from src.utils.database import Database
+from src.utils.database import (
+    MIGRATIONS_DIR,
+    SCHEMA_VERSION,
+    Base,
+    Database,
+    PriceHistoryModel,
+    ProductModel,
+    SaveStats,
+    database_from_config,
+)
 
 
 class TestDatabase:
@@ -28,6 +46,15 @@ class TestDatabase:
             platform="Amazon",
         )
 
+    def test_rows_map_to_same_product_as_orm(self, db, sample_product):
+        db.save_product(sample_product)
+
+        with db.SessionLocal() as session:
+            expected = session.query(ProductModel).one().to_product()
+        assert db.get_products() == [expected]
+        assert db.get_product("TEST123", "Amazon") == expected
+        assert list(db.iter_products()) == [expected]
+
     def test_save_and_get_product(self, db, sample_product):
         db.save_product(sample_product)
 
@@ -85,3 +112,488 @@ class TestDatabase:
     def test_get_products_empty_db(self, db):
         products = db.get_products()
         assert products == []
+
+    def test_search_saved(self, db, sample_product):
+        db.save_product(sample_product)
+        db.save_product(Product(id="X2", title="Another Gadget", price=5.0, platform="Amazon"))
+
+        assert [p.id for p in db.search_saved("test product")] == ["TEST123"]
+        assert [p.id for p in db.search_saved("PRODUCT", platform="Amazon")] == ["TEST123"]
+        assert db.search_saved("test", platform="Flipkart") == []
+        assert len(db.search_saved(platform="Amazon")) == 2
+        assert [p.id for p in db.search_saved(category="Electronics")] == ["TEST123"]
+
+    def test_save_products_bulk_upsert(self, db, sample_product):
+        db.save_product(sample_product)
+        products = [
+            Product(id=f"B{i}", title=f"Bulk {i}", price=float(i), platform="Amazon")
+            for i in range(5)
+        ]
+        updated = Product(id="TEST123", title="Renamed", price=19.99, platform="Amazon")
+
+        assert db.save_products(products + [updated], chunk_size=2) == SaveStats(new=5, changed=1)
+
+        saved = {p.id: p for p in db.get_products("Amazon")}
+        assert len(saved) == 6
+        assert saved["B3"].price == 3.0
+        assert saved["TEST123"].title == "Renamed"
+        assert saved["TEST123"].price == 19.99
+
+    def test_save_products_last_duplicate_wins(self, db):
+        first = Product(id="D1", title="First", price=1.0, platform="Amazon")
+        second = Product(id="D1", title="Second", price=2.0, platform="Amazon")
+
+        assert db.save_products([first, second]).total == 1
+        assert db.get_product("D1", "Amazon").title == "Second"
+
+    def test_save_products_empty(self, db):
+        assert db.save_products([]).total == 0
+
+
+class TestPriceHistory:
+    @pytest.fixture
+    def db(self, tmp_path):
+        return Database(f"sqlite:///{tmp_path / 'test.db'}")
+
+    @pytest.fixture
+    def now(self):
+        return datetime.now(timezone.utc)
+
+    def _history(self, db, platform, pid, *points):
+        with db.engine.begin() as conn:
+            conn.execute(
+                insert(PriceHistoryModel),
+                [{"platform": platform, "id": pid, "ts": ts, "price": p} for ts, p in points],
+            )
+
+    def test_only_price_changes_are_recorded(self, db):
+        product = Product(id="P1", title="Phone", price=100.0, platform="Amazon")
+        db.save_product(product)
+        db.save_product(product)
+        db.save_products([Product(id="P1", title="Phone v2", price=100.0, platform="Amazon")])
+        db.save_products([Product(id="P1", title="Phone", price=90.0, platform="Amazon")])
+        db.save_product(Product(id="P1", title="Phone", price=95.0, platform="Amazon"))
+
+        assert [price for _, price in db.price_history("P1", "Amazon")] == [100.0, 90.0, 95.0]
+
+    def test_bulk_save_records_new_products(self, db):
+        db.save_products(
+            [Product(id=f"N{i}", title="x", price=float(i), platform="Amazon") for i in range(3)]
+        )
+        assert db.price_history("N2", "Amazon")[0][1] == 2.0
+
+    def test_price_at(self, db, now):
+        self._history(
+            db, "Amazon", "P1", (now - timedelta(days=3), 100.0), (now - timedelta(days=1), 80.0)
+        )
+
+        assert db.price_at("P1", "Amazon", now - timedelta(days=4)) is None
+        assert db.price_at("P1", "Amazon", now - timedelta(days=2)) == 100.0
+        assert db.price_at("P1", "Amazon", now) == 80.0
+
+    def test_price_range_includes_price_at_window_start(self, db, now):
+        self._history(
+            db,
+            "Amazon",
+            "P1",
+            (now - timedelta(days=10), 120.0),
+            (now - timedelta(days=2), 90.0),
+            (now - timedelta(days=1), 110.0),
+        )
+
+        assert db.price_range("P1", "Amazon", now - timedelta(days=5)) == (90.0, 120.0)
+        assert db.price_range("P1", "Amazon", now - timedelta(hours=12)) == (110.0, 110.0)
+        assert db.price_range("P9", "Amazon", now - timedelta(days=5)) is None
+
+    def test_largest_price_drops(self, db, now):
+        old = now - timedelta(days=5)
+        recent = now - timedelta(hours=2)
+        self._history(db, "Amazon", "BIG", (old, 200.0), (recent, 150.0))
+        self._history(db, "Amazon", "SMALL", (old, 100.0), (recent, 95.0))
+        self._history(db, "Amazon", "UP", (old, 50.0), (recent, 60.0))
+        self._history(db, "Amazon", "STALE", (old, 500.0), (old + timedelta(hours=1), 100.0))
+        self._history(db, "Flipkart", "NEW", (now - timedelta(hours=3), 80.0), (recent, 40.0))
+
+        drops = db.largest_price_drops(hours=24)
+        assert [(d.id, d.old_price, d.new_price) for d in drops] == [
+            ("BIG", 200.0, 150.0),
+            ("NEW", 80.0, 40.0),
+            ("SMALL", 100.0, 95.0),
+        ]
+        assert drops[1].drop_percentage == 50.0
+        assert [d.id for d in db.largest_price_drops(hours=24, platform="Flipkart")] == ["NEW"]
+        assert len(db.largest_price_drops(hours=24, limit=1)) == 1
+
+    def test_price_lookups_use_covering_index(self, db):
+        with db.engine.connect() as conn:
+            plan = conn.execute(
+                text(
+                    "EXPLAIN QUERY PLAN SELECT price FROM price_history "
+                    "WHERE platform = 'a' AND id = 'b' AND ts <= '2030-01-01' "
+                    "ORDER BY ts DESC LIMIT 1"
+                )
+            ).fetchall()
+        assert "COVERING INDEX" in " ".join(str(row) for row in plan)
+
+
+class TestQueryProducts:
+    @pytest.fixture
+    def db(self, tmp_path):
+        db = Database(f"sqlite:///{tmp_path / 'test.db'}")
+        db.save_products(
+            Product(
+                id=f"P{i:02d}",
+                title=f"Product {i}",
+                price=float(10 * i),
+                discount_percentage=float(i * 5) if i % 5 else None,
+                rating=4.0 + (i % 3) / 2,
+                category="Electronics" if i % 2 else "Books",
+                platform="Amazon" if i < 10 else "Flipkart",
+            )
+            for i in range(1, 21)
+        )
+        return db
+
+    def test_filters(self, db):
+        page = db.query_products(
+            category="Electronics", min_discount=20, max_price=150, min_rating=4.5
+        )
+        for product in page.products:
+            assert product.category == "Electronics"
+            assert product.discount_percentage >= 20
+            assert product.price <= 150
+            assert product.rating >= 4.5
+        assert {p.id for p in page.products} == {"P07", "P11", "P13"}
+
+    def test_order_and_platform(self, db):
+        page = db.query_products(platform="Amazon", order_by="price", descending=False)
+        assert [p.price for p in page.products] == [float(10 * i) for i in range(1, 10)]
+
+    @pytest.mark.parametrize("descending", [True, False])
+    def test_sort_column_nulls_last(self, db, descending):
+        products = db.query_products(order_by="discount_percentage", descending=descending).products
+        assert len(products) == 20
+        assert [p.id for p in products[16:]] == (
+            ["P20", "P15", "P10", "P05"] if descending else ["P05", "P10", "P15", "P20"]
+        )
+
+    @pytest.mark.parametrize("order_by", ["rating", "discount_percentage"])
+    @pytest.mark.parametrize("descending", [True, False])
+    def test_keyset_pagination_covers_every_row_once(self, db, order_by, descending):
+        seen, cursor = [], None
+        while True:
+            page = db.query_products(
+                order_by=order_by, descending=descending, limit=3, after=cursor
+            )
+            seen.extend(p.id for p in page.products)
+            if page.next_cursor is None:
+                break
+            cursor = page.next_cursor
+
+        everything = db.query_products(order_by=order_by, descending=descending, limit=100)
+        assert seen == [p.id for p in everything.products]
+        assert len(set(seen)) == 20
+
+    @pytest.mark.parametrize("after", [(25.0, "Amazon", "P05"), (None, "Amazon", "P05")])
+    def test_cursor_pages_seek_the_index(self, db, after):
+        statements = []
+
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            statements.append((statement, parameters))
+
+        event.listen(db.engine, "before_cursor_execute", capture)
+        try:
+            db.query_products(order_by="discount_percentage", limit=3, after=after)
+        finally:
+            event.remove(db.engine, "before_cursor_execute", capture)
+
+        assert statements
+        with db.engine.connect() as conn:
+            for statement, parameters in statements:
+                plan = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+                assert "SEARCH products USING INDEX" in " ".join(str(row) for row in plan)
+
+    def test_staleness(self, db):
+        cutoff = datetime.now(timezone.utc) + timedelta(minutes=1)
+        assert len(db.query_products(updated_before=cutoff, limit=100).products) == 20
+        assert db.query_products(updated_after=cutoff).products == []
+
+    def test_unknown_order_by(self, db):
+        with pytest.raises(ValueError):
+            db.query_products(order_by="title")
+
+    def test_filters_use_indexes(self, db):
+        with db.engine.connect() as conn:
+            plan = conn.execute(
+                text(
+                    "EXPLAIN QUERY PLAN SELECT * FROM products WHERE category = 'Books' "
+                    "AND discount_percentage >= 10 "
+                    "ORDER BY discount_percentage DESC, platform DESC, id DESC LIMIT 10"
+                )
+            ).fetchall()
+        assert "ix_products_category_discount" in " ".join(str(row) for row in plan)
+
+
+class TestIterProducts:
+    @pytest.fixture
+    def db(self, tmp_path):
+        db = Database(f"sqlite:///{tmp_path / 'test.db'}")
+        db.save_products(
+            Product(
+                id=f"I{i}", title=f"Item {i}", price=1.0, platform="Amazon" if i % 2 else "Flipkart"
+            )
+            for i in range(25)
+        )
+        return db
+
+    def test_streams_every_row(self, db):
+        products = db.iter_products(batch_size=4)
+        assert next(products).title.startswith("Item")
+        assert len(list(products)) == 24
+
+    def test_platform_filter(self, db):
+        assert {p.platform for p in db.iter_products("Amazon", batch_size=5)} == {"Amazon"}
+        assert len(list(db.iter_products("Amazon", batch_size=5))) == 12
+
+    def test_batches_are_fetched_lazily(self, db):
+        fetched = []
+
+        def spy(*row):
+            fetched.append(row[0])
+            return Product(*row)
+
+        with patch("src.utils.database.Product", spy):
+            products = db.iter_products(batch_size=5)
+            next(products)
+            assert len(fetched) == 1
+            products.close()
+
+
+class TestSqliteTuning:
+    def _pragma(self, db, name):
+        with db.engine.connect() as conn:
+            return conn.execute(text(f"PRAGMA {name}")).scalar()
+
+    def test_default_profile(self, tmp_path):
+        db = Database(f"sqlite:///{tmp_path / 'test.db'}")
+        assert self._pragma(db, "journal_mode") == "wal"
+        assert self._pragma(db, "synchronous") == 1  # NORMAL
+        assert self._pragma(db, "busy_timeout") == 5000
+        assert self._pragma(db, "cache_size") == -65536
+
+    def test_empty_profile_keeps_sqlite_defaults(self, tmp_path):
+        db = Database(f"sqlite:///{tmp_path / 'test.db'}", sqlite_pragmas={})
+        assert self._pragma(db, "journal_mode") == "delete"
+
+    def test_invalid_value_rejected(self, tmp_path):
+        with pytest.raises(ValueError):
+            Database(
+                f"sqlite:///{tmp_path / 'test.db'}", sqlite_pragmas={"journal_mode": "wal; --"}
+            )
+
+    def test_in_memory_database(self):
+        db = Database("sqlite:///:memory:", pool_size=5)
+        assert self._pragma(db, "busy_timeout") == 5000
+        assert db.get_products() == []
+
+    def test_from_config(self, tmp_path):
+        db = database_from_config(
+            {
+                "database_url": f"sqlite:///{tmp_path / 'test.db'}",
+                "sqlite_synchronous": "full",
+                "sqlite_cache_size": None,
+            }
+        )
+        assert self._pragma(db, "synchronous") == 2  # FULL
+        assert self._pragma(db, "cache_size") == -65536
+
+    def test_from_config_tuning_disabled(self, tmp_path):
+        db = database_from_config(
+            {"database_url": f"sqlite:///{tmp_path / 'test.db'}", "sqlite_tuning": False}
+        )
+        assert self._pragma(db, "journal_mode") == "delete"
+
+
+class TestFullTextSearch:
+    @pytest.fixture
+    def db(self, tmp_path):
+        db = Database(f"sqlite:///{tmp_path / 'test.db'}")
+        db.save_products(
+            [
+                Product(
+                    id="A1",
+                    title="Sony WH-1000XM5 Wireless Headphones",
+                    price=299.0,
+                    category="Audio",
+                    platform="Amazon",
+                ),
+                Product(
+                    id="A2",
+                    title="Headphone Stand",
+                    price=19.0,
+                    description="Fits Sony and Bose headphones",
+                    category="Accessories",
+                    platform="Amazon",
+                ),
+                Product(
+                    id="F1",
+                    title="Bose QuietComfort Headphones",
+                    price=279.0,
+                    category="Audio",
+                    platform="Flipkart",
+                ),
+            ]
+        )
+        return db
+
+    def test_ranked_by_relevance(self, db):
+        assert db.full_text
+        assert [p.id for p in db.search_saved("sony")] == ["A1", "A2"]
+        assert [p.id for p in db.search_saved("sony headphones")] == ["A1", "A2"]
+
+    def test_prefix_and_category_matches(self, db):
+        assert {p.id for p in db.search_saved("headphone")} == {"A1", "A2", "F1"}
+        assert [p.id for p in db.search_saved("audio", platform="Flipkart")] == ["F1"]
+        assert [p.id for p in db.search_saved("headphones", category="Accessories")] == ["A2"]
+
+    def test_index_follows_updates(self, db):
+        db.save_product(Product(id="A2", title="Desk Lamp", price=15.0, platform="Amazon"))
+        db.save_products([Product(id="F1", title="Sony Speaker", price=99.0, platform="Flipkart")])
+
+        assert {p.id for p in db.search_saved("sony")} == {"A1", "F1"}
+        assert db.search_saved("bose") == []
+        assert [p.id for p in db.search_saved("lamp")] == ["A2"]
+
+    def test_query_syntax_is_literal(self, db):
+        assert db.search_saved('sony" OR "bose') == []
+        assert db.search_saved("NEAR(") == []
+        assert [p.id for p in db.search_saved("WH-1000XM5")] == ["A1"]
+
+
+class TestChangeDetection:
+    @pytest.fixture
+    def db(self, tmp_path):
+        return Database(f"sqlite:///{tmp_path / 'test.db'}")
+
+    @pytest.fixture
+    def products(self):
+        return [
+            Product(id=f"P{i}", title=f"Product {i}", price=10.0 + i, platform="Amazon")
+            for i in range(4)
+        ]
+
+    def _timestamps(self, db, product_id):
+        with db.engine.connect() as conn:
+            return conn.execute(
+                select(ProductModel.last_updated, ProductModel.last_seen).where(
+                    ProductModel.id == product_id
+                )
+            ).one()
+
+    def test_batch_counts(self, db, products):
+        assert db.save_products(products) == SaveStats(new=4)
+
+        products[0].rating = 4.5
+        products[1].price = 5.0
+        extra = Product(id="P9", title="Extra", price=1.0, platform="Amazon")
+        assert db.save_products(products + [extra]) == SaveStats(new=1, changed=2, unchanged=2)
+        assert db.get_product("P0", "Amazon").rating == 4.5
+
+    def test_unchanged_rows_only_touch_last_seen(self, db, products):
+        db.save_products(products)
+        updated, seen = self._timestamps(db, "P0")
+
+        db.save_products(products)
+        db.save_product(products[0])
+
+        updated_again, seen_again = self._timestamps(db, "P0")
+        assert updated_again == updated
+        assert seen_again > seen
+        assert len(db.price_history("P0", "Amazon")) == 1
+
+    def test_save_product_detects_changes(self, db, products):
+        db.save_product(products[0])
+        updated, _ = self._timestamps(db, "P0")
+
+        products[0].description = "Now with a description"
+        db.save_product(products[0])
+
+        assert self._timestamps(db, "P0")[0] > updated
+        assert db.get_product("P0", "Amazon").description == "Now with a description"
+        assert db.save_products([products[0]]) == SaveStats(unchanged=1)
+
+    def test_seen_before_filter(self, db, products):
+        db.save_products(products)
+        cutoff = datetime.now(timezone.utc)
+        db.save_products(products[:2])
+
+        stale = db.query_products(seen_before=cutoff, order_by="price", descending=False)
+        assert [p.id for p in stale.products] == ["P2", "P3"]
+
+
+class TestMigrations:
+    @pytest.fixture
+    def legacy_url(self, tmp_path):
+        """A database as created before migrations: no version table, indexes or history."""
+        path = tmp_path / "legacy.db"
+        conn = sqlite3.connect(path)
+        conn.execute(
+            "CREATE TABLE products (id VARCHAR, platform VARCHAR, title VARCHAR, price FLOAT, "
+            "original_price FLOAT, discount_percentage FLOAT, url TEXT, affiliate_url TEXT, "
+            "image_url TEXT, rating FLOAT, review_count INTEGER, category VARCHAR, "
+            "description TEXT, last_updated DATETIME, PRIMARY KEY (id, platform))"
+        )
+        conn.execute(
+            "INSERT INTO products (id, platform, title, price) "
+            "VALUES ('A1', 'Amazon', 'Sony Headphones', 10.0)"
+        )
+        conn.commit()
+        conn.close()
+        return f"sqlite:///{path}"
+
+    def _version(self, db):
+        with db.engine.connect() as conn:
+            return conn.execute(text("SELECT version_num FROM alembic_version")).scalar()
+
+    def test_schema_version_is_migration_head(self):
+        config = Config()
+        config.set_main_option("script_location", str(MIGRATIONS_DIR))
+        assert ScriptDirectory.from_config(config).get_current_head() == SCHEMA_VERSION
+
+    def test_migrations_match_models(self, tmp_path):
+        db = Database(f"sqlite:///{tmp_path / 'test.db'}")
+        with db.engine.connect() as conn:
+            context = MigrationContext.configure(
+                conn,
+                opts={"include_object": lambda obj, name, *_: not name.startswith("products_fts")},
+            )
+            assert compare_metadata(context, Base.metadata) == []
+
+    def test_new_database_is_migrated(self, tmp_path):
+        db = Database(f"sqlite:///{tmp_path / 'test.db'}")
+        assert self._version(db) == SCHEMA_VERSION
+        assert db.full_text
+
+    def test_legacy_database_is_migrated(self, legacy_url):
+        db = Database(legacy_url)
+
+        assert self._version(db) == SCHEMA_VERSION
+        assert [p.id for p in db.search_saved("sony")] == ["A1"]
+        product = Product(id="A1", title="Sony Headphones", price=10.0, platform="Amazon")
+        assert db.save_products([product]) == SaveStats(changed=1)
+        assert db.save_products([product]) == SaveStats(unchanged=1)
+        with db.engine.connect() as conn:
+            indexes = {row[0] for row in conn.execute(text("SELECT name FROM sqlite_master"))}
+        assert {"ix_products_price", "ix_price_history_ts"} <= indexes
+
+    def test_current_database_skips_migrations(self, tmp_path):
+        url = f"sqlite:///{tmp_path / 'test.db'}"
+        Database(url).engine.dispose()
+
+        with patch("alembic.command.upgrade") as upgrade, patch.object(
+            Base.metadata, "create_all"
+        ) as create_all:
+            db = Database(url)
+        upgrade.assert_not_called()
+        create_all.assert_not_called()
+        assert db.full_text
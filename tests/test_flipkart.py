@@ -1,8 +1,10 @@
 from unittest.mock import Mock, patch
 
 import pytest
+import requests
 
 from src.platforms.flipkart.flipkart_affiliate import FlipkartAffiliate
+from src.utils.cache import ResponseCache
 
 
 class TestFlipkartAffiliate:
@@ -30,6 +32,22 @@ class TestFlipkartAffiliate:
         assert headers["Fk-Affiliate-Id"] == "test-id"
         assert headers["Fk-Affiliate-Token"] == "test-token"
 
+    def test_api_get_uses_response_cache(self):
+        session = Mock()
+        session.get.return_value = Mock(status_code=200, content=b'{"products": []}', headers={})
+        flipkart = FlipkartAffiliate(
+            {
+                "flipkart_affiliate_id": "test-id",
+                "flipkart_affiliate_token": "test-token",
+                "http_session": session,
+                "response_cache": ResponseCache(),
+            }
+        )
+
+        assert flipkart.search_products("laptop") == []
+        assert flipkart.search_products("laptop") == []
+        assert session.get.call_count == 1
+
     def test_generate_affiliate_link(self, flipkart):
         url = "https://www.flipkart.com/product/123"
         assert flipkart.generate_affiliate_link(url) == url
@@ -60,6 +78,19 @@ class TestFlipkartAffiliate:
         assert products[0].original_price == 1499.0
         assert products[0].platform == "Flipkart"
 
+    @patch('src.platforms.flipkart.flipkart_affiliate.FlipkartAffiliate._api_get')
+    def test_iter_search_products(self, mock_api_get, flipkart):
+        mock_api_get.return_value = {
+            "products": [
+                {"productBaseInfoV1": {"productId": "FK1", "title": "One"}},
+                {"productBaseInfoV1": {"productId": "FK2", "title": "Two"}},
+            ]
+        }
+
+        stream = flipkart.iter_search_products("laptop")
+        assert next(stream).id == "FK1"
+        assert [p.id for p in stream] == ["FK2"]
+
     @patch('src.platforms.flipkart.flipkart_affiliate.FlipkartAffiliate._api_get')
     def test_search_products_empty(self, mock_api_get, flipkart):
         mock_api_get.return_value = {"products": []}
@@ -85,6 +116,26 @@ class TestFlipkartAffiliate:
         assert product is not None
         assert product.id == "FK123"
 
+    def test_get_product_details_many(self, flipkart):
+        def api_get(url, params=None):
+            product_id = url.rsplit("/", 1)[-1]
+            if product_id == "BROKEN":
+                raise requests.HTTPError("500 Server Error")
+            return {"productBaseInfoV1": {"productId": product_id, "title": product_id}}
+
+        with patch.object(flipkart, "_api_get", side_effect=api_get) as mock_api_get:
+            results = flipkart.get_product_details_many(["FK1", "FK2", "FK1", "BROKEN", ""])
+
+        assert list(results) == ["FK1", "FK2", "BROKEN"]
+        assert mock_api_get.call_count == 3
+        assert results["FK2"].ok
+        assert results["FK2"].product.id == "FK2"
+        assert not results["BROKEN"].ok
+        assert "500" in results["BROKEN"].error
+
+    def test_get_product_details_many_empty(self, flipkart):
+        assert flipkart.get_product_details_many([]) == {}
+
     def test_parse_product_discount_calculation(self, flipkart):
         data = {
             "productBaseInfoV1": {
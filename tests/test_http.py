@@ -0,0 +1,25 @@
+from src.utils.http import create_session, session_from_config
+
+
+class TestCreateSession:
+    def test_pool_settings(self):
+        session = create_session(pool_connections=3, pool_maxsize=7)
+        adapter = session.get_adapter("https://www.amazon.com")
+
+        assert adapter._pool_connections == 3
+        assert adapter._pool_maxsize == 7
+        assert adapter.max_retries.total == 0
+
+    def test_default_headers(self):
+        session = create_session()
+        assert session.headers["Accept-Encoding"] == "gzip, deflate"
+        assert session.headers["Connection"] == "keep-alive"
+
+    def test_keep_alive_disabled(self):
+        session = create_session(keep_alive=False)
+        assert session.headers["Connection"] == "close"
+
+    def test_session_from_config(self):
+        session = session_from_config({"http_pool_maxsize": 20})
+        adapter = session.get_adapter("https://affiliate-api.flipkart.net")
+        assert adapter._pool_maxsize == 20
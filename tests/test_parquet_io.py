@@ -0,0 +1,95 @@
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from src.core.base_affiliate import Product
+from src.utils.database import Database
+from src.utils.parquet_io import PRODUCT_SCHEMA, export_parquet, import_parquet
+
+
+def _snapshot(db):
+    return sorted(
+        (p.platform, p.id, p.title, p.price, p.rating, p.review_count, p.category)
+        for p in db.get_products()
+    )
+
+
+def _timestamps(db):
+    return {(p.platform, p.id): p.last_updated for p in db.get_products()}
+
+
+class TestParquetExport:
+    @pytest.fixture
+    def db(self, tmp_path):
+        db = Database(f"sqlite:///{tmp_path / 'source.db'}")
+        db.save_products(
+            Product(
+                id=f"P{i}",
+                title=f"Product {i}",
+                price=10.0 + i,
+                rating=4.0 if i % 2 else None,
+                review_count=i,
+                category="Audio",
+                platform="Amazon" if i < 7 else "Flipkart",
+            )
+            for i in range(10)
+        )
+        db.save_product(Product(id="P1", title="Product 1", price=5.0, platform="Amazon"))
+        return db
+
+    def test_round_trip(self, db, tmp_path):
+        counts = export_parquet(db, tmp_path / "export", chunk_size=3)
+        assert counts == {"products": 10, "price_history": 11}
+
+        target = Database(f"sqlite:///{tmp_path / 'target.db'}")
+        assert import_parquet(target, tmp_path / "export", chunk_size=4) == counts
+        assert _snapshot(target) == _snapshot(db)
+        assert target.price_history("P1", "Amazon") == db.price_history("P1", "Amazon")
+        assert _timestamps(target) == _timestamps(db)
+
+    def test_partitioned_typed_files(self, db, tmp_path):
+        export_parquet(db, tmp_path / "export", chunk_size=3)
+
+        amazon = tmp_path / "export" / "products" / "platform=Amazon" / "part-0.parquet"
+        parquet_file = pq.ParquetFile(amazon)
+        assert parquet_file.schema_arrow == PRODUCT_SCHEMA
+        assert parquet_file.metadata.num_rows == 7
+        assert parquet_file.num_row_groups == 3
+
+        frame = pd.read_parquet(tmp_path / "export" / "products")
+        assert frame.groupby("platform", observed=True).size().to_dict() == {
+            "Amazon": 7,
+            "Flipkart": 3,
+        }
+        assert pa.types.is_timestamp(
+            pq.read_schema(
+                tmp_path / "export" / "price_history" / "platform=Amazon" / "part-0.parquet"
+            )
+            .field("ts")
+            .type
+        )
+
+    def test_existing_export_needs_overwrite(self, db, tmp_path):
+        export_parquet(db, tmp_path / "export")
+        with pytest.raises(FileExistsError):
+            export_parquet(db, tmp_path / "export")
+        assert export_parquet(db, tmp_path / "export", overwrite=True)["products"] == 10
+
+    def test_import_is_idempotent(self, db, tmp_path):
+        export_parquet(db, tmp_path / "export")
+        target = Database(f"sqlite:///{tmp_path / 'target.db'}")
+        import_parquet(target, tmp_path / "export")
+        import_parquet(target, tmp_path / "export")
+
+        assert len(target.get_products()) == 10
+        assert len(target.price_history("P1", "Amazon")) == 2
+
+    def test_products_only(self, db, tmp_path):
+        assert export_parquet(db, tmp_path / "export", include_history=False) == {"products": 10}
+        target = Database(f"sqlite:///{tmp_path / 'target.db'}")
+        import_parquet(target, tmp_path / "export", include_history=False)
+        history = target.price_history("P1", "Amazon")
+        assert len(history) == 1
+        assert _timestamps(target) == _timestamps(db)
+        assert history[0][0] == _timestamps(db)[("Amazon", "P1")]
@@ -0,0 +1,55 @@
+import sys
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from src.core.base_affiliate import Product
+
+
+class TestProductCodec:
+    @pytest.fixture
+    def product(self):
+        return Product(
+            id="B0TEST",
+            title='Kopfhörer "Pro" 2',
+            price=199.99,
+            original_price=249.0,
+            discount_percentage=20.0,
+            url="https://www.amazon.com/dp/B0TEST",
+            affiliate_url="https://www.amazon.com/dp/B0TEST?tag=test-20",
+            rating=4.5,
+            review_count=1234,
+            category="Audio",
+            platform="Amazon",
+            last_updated=datetime(2026, 3, 1, 12, 30, 15, 123456, tzinfo=timezone.utc),
+        )
+
+    def test_bytes_round_trip(self, product):
+        data = product.to_bytes()
+        assert isinstance(data, bytes)
+        assert Product.from_bytes(data) == product
+
+    def test_naive_timestamp_is_utc(self, product):
+        product.last_updated = datetime(2026, 3, 1, 12, 30)
+        decoded = Product.from_bytes(product.to_bytes())
+        assert decoded.last_updated == datetime(2026, 3, 1, 12, 30, tzinfo=timezone.utc)
+
+    def test_other_timezones_keep_the_instant(self, product):
+        product.last_updated = datetime(2026, 3, 1, 14, 0, tzinfo=timezone(timedelta(hours=2)))
+        decoded = Product.from_bytes(product.to_bytes())
+        assert decoded.last_updated == product.last_updated
+        assert decoded.last_updated.tzinfo == timezone.utc
+
+    def test_unknown_version_rejected(self, product):
+        with pytest.raises(ValueError):
+            Product.from_bytes(b"\x09" + product.to_bytes()[1:])
+
+    def test_dict_round_trip(self, product):
+        assert Product.from_dict(product.to_dict()) == product
+        assert Product.from_dict({"id": "X", "title": "T", "price": 1.0, "extra": 1}).id == "X"
+
+    @pytest.mark.skipif(sys.version_info < (3, 10), reason="slots need Python 3.10")
+    def test_slotted(self, product):
+        assert not hasattr(product, "__dict__")
+        with pytest.raises(AttributeError):
+            product.unknown_attribute = 1
@@ -0,0 +1,91 @@
+import numpy as np
+import pytest
+
+from src.core.base_affiliate import Product
+from src.core.product_batch import ProductBatch
+
+
+class TestProductBatch:
+    @pytest.fixture
+    def products(self):
+        rows = [
+            ("1", 10.0, 20.0, 4.5, 100, "Amazon", "Audio"),
+            ("2", 25.0, None, 3.9, None, "Flipkart", "Audio"),
+            ("3", 5.0, 50.0, None, 12, "Amazon", "Books"),
+            ("4", 80.0, 35.0, 4.8, 900, "Flipkart", "Audio"),
+            ("5", 15.0, 20.0, 4.1, 40, "Amazon", "Books"),
+            ("6", 12.0, 0.0, 4.0, 5, "Amazon", "Audio"),
+        ]
+        return [
+            Product(
+                id=id,
+                title=f"P{id}",
+                price=price,
+                discount_percentage=discount,
+                rating=rating,
+                review_count=reviews,
+                platform=platform,
+                category=category,
+            )
+            for id, price, discount, rating, reviews, platform, category in rows
+        ]
+
+    @pytest.fixture
+    def batch(self, products):
+        return ProductBatch.from_products(products)
+
+    def ids(self, batch):
+        return [p.id for p in batch.to_products()]
+
+    def test_round_trip_returns_the_same_products(self, products, batch):
+        assert len(batch) == 6
+        assert batch.to_products() == products
+        assert batch.to_products()[0] is products[0]
+
+    def test_numeric_columns_use_nan_for_missing(self, batch):
+        assert batch.price.dtype == np.float64
+        assert np.isnan(batch.discount_percentage[1])
+        assert np.isnan(batch.review_count[1])
+        assert batch.review_count[3] == 900
+
+    def test_filter(self, batch):
+        assert self.ids(batch.filter(min_discount=20.0)) == ["1", "3", "4", "5"]
+        assert self.ids(batch.filter(max_price=12.0, platform="Amazon")) == ["1", "3", "6"]
+        assert self.ids(batch.filter(min_rating=4.0, category="Audio")) == ["1", "4", "6"]
+        assert self.ids(batch.filter(min_reviews=50)) == ["1", "4"]
+
+    def test_filter_by_discount_leaves_out_undiscounted(self, batch):
+        assert self.ids(batch.filter(min_discount=0.0)) == ["1", "3", "4", "5"]
+
+    def test_rank_is_stable_with_missing_last(self, batch):
+        assert self.ids(batch.rank("discount_percentage")) == ["3", "4", "1", "5", "6", "2"]
+        assert self.ids(batch.rank("price", descending=False)) == ["3", "1", "6", "5", "2", "4"]
+
+    def test_rank_by_score(self, batch):
+        scores = batch.score({"rating": 10.0, "discount_percentage": 1.0})
+        assert scores[2] == 50.0  # missing rating counts as 0
+        assert self.ids(batch.rank(scores)) == ["4", "1", "5", "3", "6", "2"]
+
+    def test_top_k_matches_rank(self):
+        rng = np.random.default_rng(7)
+        discounts = rng.integers(0, 10, size=500).astype(float)
+        discounts[rng.random(500) < 0.1] = np.nan
+        products = [
+            Product(
+                id=str(i),
+                title="x",
+                price=1.0,
+                discount_percentage=None if np.isnan(d) else d,
+                platform="Amazon",
+            )
+            for i, d in enumerate(discounts)
+        ]
+        batch = ProductBatch.from_products(products)
+        ranked = self.ids(batch.rank())
+        for k in (0, 1, 7, 50, 499, 500, 600):
+            assert self.ids(batch.top_k(k)) == ranked[:k]
+
+    def test_empty_batch(self):
+        batch = ProductBatch.from_products([])
+        assert len(batch.filter(min_discount=10.0)) == 0
+        assert batch.top_k(5).to_products() == []
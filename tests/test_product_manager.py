@@ -1,9 +1,17 @@
+import time
 from unittest.mock import MagicMock, patch
 
 import pytest
 
-from src.core.base_affiliate import Product
-from src.core.product_manager import ProductManager
+from src.core.base_affiliate import LookupResult, Product
+from src.core.product_manager import (
+    STATUS_ERROR,
+    STATUS_OK,
+    STATUS_TIMEOUT,
+    ProductManager,
+    top_deals,
+)
+from src.utils.deadline import remaining
 
 
 class TestProductManager:
@@ -16,9 +24,7 @@ class TestProductManager:
             "flipkart_affiliate_id": "",
             "flipkart_affiliate_token": "",
         }
-        with patch(
-            'src.core.product_manager.AmazonAffiliate'
-        ) as MockAmazon:
+        with patch('src.core.product_manager.AmazonAffiliate') as MockAmazon:
             mock_amazon = MockAmazon.return_value
             mock_amazon.search_products.return_value = []
             mock_amazon.get_trending_products.return_value = []
@@ -77,6 +83,49 @@ class TestProductManager:
         deals = manager.get_best_deals(min_discount=10.0)
         assert [d.discount_percentage for d in deals] == [50.0, 35.0, 20.0]
 
+    def test_get_best_deals_batch_path_matches_list_path(self, manager):
+        discounts = [None, 0.0, 5.0, 20.0, 35.0, 35.0, 50.0, 20.0]
+        products = [
+            Product(id=str(i), title=f"P{i}", price=10, discount_percentage=d, platform="Amazon")
+            for i, d in enumerate(discounts * 3)
+        ]
+        manager.providers["amazon"].get_trending_products.return_value = products
+
+        deals = manager.get_best_deals(min_discount=10.0)
+        with patch('src.core.product_manager.BATCH_MIN_PRODUCTS', 1):
+            batched = manager.get_best_deals(min_discount=10.0)
+        assert [d.id for d in batched] == [d.id for d in deals]
+        assert len(deals) == 15
+
+    def test_get_best_deals_limit(self, manager):
+        products = [
+            Product(id=str(i), title=f"P{i}", price=10, discount_percentage=d, platform="Amazon")
+            for i, d in enumerate([20.0, 50.0, 35.0, 5.0, 50.0])
+        ]
+        manager.providers["amazon"].get_trending_products.return_value = products
+
+        deals = manager.get_best_deals(min_discount=10.0, limit=2)
+        assert [d.id for d in deals] == ["1", "4"]
+        assert manager.get_best_deals(min_discount=10.0, limit=0) == []
+
+    def test_top_deals_matches_full_sort(self):
+        lists = [
+            [
+                Product(id=f"{n}-{i}", title="P", price=10, discount_percentage=d, platform=str(n))
+                for i, d in enumerate(discounts)
+            ]
+            for n, discounts in enumerate(
+                [[10.0, 40.0, None, 40.0, 25.0], [], [40.0, 0.0, 15.0, 25.0, 60.0, 25.0]]
+            )
+        ]
+        expected = sorted(
+            (p for products in lists for p in products if (p.discount_percentage or 0) >= 15.0),
+            key=lambda p: p.discount_percentage,
+            reverse=True,
+        )
+        for limit in range(len(expected) + 2):
+            assert top_deals(lists, 15.0, limit) == expected[:limit]
+
     def test_compare_prices(self, manager, sample_products):
         manager.providers["amazon"].search_products.return_value = [sample_products[0]]
 
@@ -90,6 +139,147 @@ class TestProductManager:
         comparison = manager.compare_prices("nonexistent")
         assert "amazon" not in comparison
 
+    def test_search_all_platforms_runs_providers_concurrently(self, manager, sample_products):
+        def slow_search(query, max_results=5):
+            time.sleep(0.2)
+            return sample_products
+
+        manager.providers["amazon"].search_products.side_effect = slow_search
+        manager.providers["flipkart"] = MagicMock()
+        manager.providers["flipkart"].search_products.side_effect = slow_search
+
+        start = time.monotonic()
+        results = manager.search_all_platforms("laptop")
+        elapsed = time.monotonic() - start
+
+        assert len(results["amazon"]) == 2
+        assert len(results["flipkart"]) == 2
+        assert elapsed < 0.35
+
+    def test_search_all_platforms_partial_results_on_timeout(self, manager, sample_products):
+        manager.providers["amazon"].search_products.return_value = sample_products
+        manager.providers["flipkart"] = MagicMock()
+        manager.providers["flipkart"].search_products.side_effect = lambda *a, **k: time.sleep(1)
+        manager.provider_timeouts = {"flipkart": 0.1}
+
+        results = manager.search_all_platforms("laptop")
+
+        assert len(results["amazon"]) == 2
+        assert results["flipkart"] == []
+        assert manager.last_status["amazon"].status == STATUS_OK
+        assert manager.last_status["flipkart"].status == STATUS_TIMEOUT
+
+    def test_fan_out_global_budget(self, manager):
+        manager.providers["amazon"].get_trending_products.side_effect = lambda *a: time.sleep(1)
+
+        start = time.monotonic()
+        results = manager.fan_out("get_trending_products", None, timeout=0.1)
+
+        assert results["amazon"].status == STATUS_TIMEOUT
+        assert time.monotonic() - start < 0.5
+
+    def test_fan_out_propagates_deadline(self, manager):
+        seen = []
+        manager.providers["amazon"].get_trending_products.side_effect = (
+            lambda *a: seen.append(remaining()) or []
+        )
+
+        manager.fan_out("get_trending_products", None, timeout=2)
+
+        assert seen and 0 < seen[0] <= 2
+
+    def test_fan_out_reports_errors(self, manager):
+        manager.providers["amazon"].search_products.side_effect = Exception("Network error")
+
+        results = manager.fan_out("search_products", "laptop")
+        assert results["amazon"].status == STATUS_ERROR
+        assert "Network error" in results["amazon"].error
+
+    def test_sequential_mode(self, manager, sample_products):
+        manager.concurrent = False
+        manager.providers["amazon"].search_products.return_value = sample_products
+
+        results = manager.search_all_platforms("laptop")
+        assert len(results["amazon"]) == 2
+        assert manager.last_status["amazon"].ok
+
+    def test_iter_all_platforms_yields_before_slow_provider_finishes(self, manager):
+        def fast_stream(query, max_results=5):
+            yield Product(id="A1", title="Fast", price=1.0, platform="Amazon")
+
+        def slow_stream(query, max_results=5):
+            time.sleep(0.3)
+            yield Product(id="F1", title="Slow", price=1.0, platform="Flipkart")
+
+        manager.providers["amazon"].iter_search_products.side_effect = fast_stream
+        manager.providers["flipkart"] = MagicMock()
+        manager.providers["flipkart"].iter_search_products.side_effect = slow_stream
+
+        start = time.monotonic()
+        stream = manager.iter_all_platforms("laptop")
+        first = next(stream)
+        first_elapsed = time.monotonic() - start
+        rest = list(stream)
+
+        assert first[0] == "amazon"
+        assert first_elapsed < 0.2
+        assert [(name, p.id) for name, p in rest] == [("flipkart", "F1")]
+        assert manager.last_status["amazon"].value == 1
+        assert manager.last_status["flipkart"].value == 1
+
+    def test_iter_all_platforms_timeout_and_errors(self, manager):
+        def hanging_stream(query, max_results=5):
+            time.sleep(1)
+            yield Product(id="X", title="Late", price=1.0, platform="Flipkart")
+
+        manager.providers["amazon"].iter_search_products.side_effect = Exception("blocked")
+        manager.providers["flipkart"] = MagicMock()
+        manager.providers["flipkart"].iter_search_products.side_effect = hanging_stream
+
+        results = list(manager.iter_all_platforms("laptop", timeout=0.1))
+
+        assert results == []
+        assert manager.last_status["amazon"].status == STATUS_ERROR
+        assert manager.last_status["flipkart"].status == STATUS_TIMEOUT
+
+    def test_iter_all_platforms_sequential(self, manager, sample_products):
+        manager.concurrent = False
+        manager.providers["amazon"].iter_search_products.return_value = iter(sample_products)
+
+        results = list(manager.iter_all_platforms("laptop"))
+        assert [p.id for _, p in results] == ["A1", "A2"]
+        assert manager.last_status["amazon"].value == 2
+
+    def test_refresh_saved_products(self, manager):
+        manager.save_product(Product(id="A1", title="Old", price=10.0, platform="Amazon"))
+        manager.save_product(Product(id="A2", title="Gone", price=10.0, platform="Amazon"))
+        manager.providers["amazon"].platform_name = "Amazon"
+        manager.providers["amazon"].get_product_details_many.return_value = {
+            "A1": LookupResult(product=Product(id="A1", title="New", price=8.0, platform="Amazon")),
+            "A2": LookupResult(error="not found"),
+        }
+
+        results = manager.refresh_saved_products()
+
+        assert results["amazon:A1"].ok
+        assert not results["amazon:A2"].ok
+        assert manager.db.get_product("A1", "Amazon").price == 8.0
+        ids = manager.providers["amazon"].get_product_details_many.call_args.args[0]
+        assert sorted(ids) == ["A1", "A2"]
+
+    def test_providers_share_http_session(self, tmp_path):
+        config = {
+            "database_url": f"sqlite:///{tmp_path / 'test.db'}",
+            "amazon_associate_tag": "test-tag-20",
+            "flipkart_affiliate_id": "test-id",
+            "flipkart_affiliate_token": "test-token",
+        }
+        mgr = ProductManager(config)
+
+        assert mgr.providers["amazon"].session is mgr.http_session
+        assert mgr.providers["flipkart"].session is mgr.http_session
+        mgr.close()
+
     def test_save_and_get_products(self, manager):
         product = Product(
             id="TEST1",
@@ -103,6 +293,33 @@ class TestProductManager:
         assert len(saved) == 1
         assert saved[0].id == "TEST1"
 
+    def test_save_product_is_written_behind(self, manager):
+        manager.save_product(
+            Product(id="TEST1", title="Test Product", price=19.99, platform="Amazon")
+        )
+        assert len(manager.writer) == 1
+
+        manager.close()
+        assert manager.db.get_product("TEST1", "Amazon").price == 19.99
+
+    def test_in_memory_database_is_shared_with_write_behind_thread(self):
+        manager = ProductManager(
+            {"database_url": "sqlite:///:memory:", "write_behind_flush_interval": 0.05}
+        )
+        manager.save_product(Product(id="M1", title="Memory", price=5.0, platform="Amazon"))
+
+        deadline = time.monotonic() + 5
+        while not manager.db.get_products() and time.monotonic() < deadline:
+            time.sleep(0.01)  # wait for the background flush, without flushing ourselves
+        assert [p.id for p in manager.db.get_products()] == ["M1"]
+        assert manager.flush_writes() == 0
+        manager.close()
+
+    def test_flush_writes_reports_dropped_products(self, manager):
+        manager.save_product(Product(id="X1", title="X", price=1.0, platform="Amazon"))
+        manager.writer.save_batch = MagicMock(side_effect=RuntimeError("disk full"))
+        assert manager.flush_writes() == 1
+
     def test_get_saved_products_by_platform(self, manager):
         p1 = Product(id="A1", title="Amazon Product", price=10, platform="Amazon")
         p2 = Product(id="F1", title="Flipkart Product", price=10, platform="Flipkart")
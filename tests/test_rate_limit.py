@@ -0,0 +1,150 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from unittest.mock import MagicMock, patch
+
+import pytest
+import requests
+
+from src.platforms.amazon.amazon_affiliate import AmazonAffiliate
+from src.utils.deadline import DeadlineExceeded, deadline_scope
+from src.utils.http import RateLimitedAdapter
+from src.utils.rate_limit import (
+    RateLimiterRegistry,
+    TokenBucket,
+    parse_retry_after,
+    rate_limiters,
+    retry_after_from_exception,
+)
+
+
+class TestTokenBucket:
+    def test_burst_is_free(self):
+        bucket = TokenBucket(rate=1.0, capacity=3)
+        assert [bucket.reserve() for _ in range(3)] == [0.0, 0.0, 0.0]
+
+    def test_waits_once_burst_is_spent(self):
+        bucket = TokenBucket(rate=2.0, capacity=1)
+        bucket.reserve()
+        assert bucket.reserve() == pytest.approx(0.5, abs=0.05)
+        assert bucket.reserve() == pytest.approx(1.0, abs=0.05)
+
+    def test_pause_delays_next_caller(self):
+        bucket = TokenBucket(rate=100.0, capacity=10)
+        bucket.pause(5)
+        assert bucket.reserve() == pytest.approx(5, abs=0.05)
+
+    @patch('src.utils.rate_limit.time.sleep')
+    def test_acquire_sleeps_for_reservation(self, mock_sleep):
+        bucket = TokenBucket(rate=1.0, capacity=1)
+        bucket.acquire()
+        mock_sleep.assert_not_called()
+        bucket.acquire()
+        mock_sleep.assert_called_once()
+
+    @patch('src.utils.rate_limit.time.sleep')
+    def test_acquire_fails_fast_past_deadline(self, mock_sleep):
+        bucket = TokenBucket(rate=1.0, capacity=1)
+        bucket.acquire()
+        with deadline_scope(0.2), pytest.raises(DeadlineExceeded):
+            bucket.acquire()
+        mock_sleep.assert_not_called()
+        # The refused token is handed back, so the next caller waits no longer
+        assert bucket.reserve() == pytest.approx(1.0, abs=0.05)
+
+    @patch('src.utils.rate_limit.time.sleep')
+    def test_acquire_waits_within_deadline(self, mock_sleep):
+        bucket = TokenBucket(rate=10.0, capacity=1)
+        bucket.acquire()
+        with deadline_scope(5):
+            bucket.acquire()
+        mock_sleep.assert_called_once()
+
+    def test_acquire_async_fails_fast_past_deadline(self):
+        bucket = TokenBucket(rate=0.1, capacity=1)
+
+        async def run():
+            await bucket.acquire_async()
+            with deadline_scope(0.2):
+                await bucket.acquire_async()
+
+        with pytest.raises(DeadlineExceeded):
+            asyncio.run(asyncio.wait_for(run(), 1))
+
+
+class TestRegistry:
+    def test_for_url_uses_hostname(self):
+        registry = RateLimiterRegistry()
+        registry.configure("www.amazon.com", 1.0, 3)
+        assert registry.for_url("https://www.amazon.com/s?k=x") is registry.get("www.amazon.com")
+        assert registry.for_url("https://example.com/") is None
+
+    def test_reconfigure_keeps_bucket_when_unchanged(self):
+        registry = RateLimiterRegistry()
+        registry.configure("a.com", 1.0, 3)
+        bucket = registry.get("a.com")
+        registry.configure("a.com", 1.0, 3)
+        assert registry.get("a.com") is bucket
+        registry.configure("a.com", 2.0, 3)
+        assert registry.get("a.com") is not bucket
+
+
+class TestRetryAfter:
+    def test_seconds(self):
+        assert parse_retry_after("12") == 12.0
+
+    def test_http_date(self):
+        when = datetime.now(timezone.utc) + timedelta(seconds=30)
+        assert parse_retry_after(format_datetime(when, usegmt=True)) == pytest.approx(30, abs=2)
+
+    def test_invalid(self):
+        assert parse_retry_after(None) is None
+        assert parse_retry_after("soon") is None
+
+    def test_from_requests_error(self):
+        response = requests.Response()
+        response.status_code = 429
+        response.headers["Retry-After"] = "7"
+        exc = requests.HTTPError(response=response)
+        assert retry_after_from_exception(exc) == 7.0
+
+
+class TestRateLimitedAdapter:
+    def test_throttle_response_pauses_host(self):
+        registry = RateLimiterRegistry()
+        registry.configure("api.example.com", 100.0, 10)
+        adapter = RateLimitedAdapter(limiters=registry)
+
+        response = requests.Response()
+        response.status_code = 429
+        response.headers["Retry-After"] = "3"
+        request = requests.Request("GET", "https://api.example.com/x").prepare()
+        with patch('requests.adapters.HTTPAdapter.send', return_value=response):
+            assert adapter.send(request) is response
+
+        assert registry.get("api.example.com").reserve() == pytest.approx(3, abs=0.05)
+
+    def test_unknown_host_not_limited(self):
+        adapter = RateLimitedAdapter(limiters=RateLimiterRegistry())
+        request = requests.Request("GET", "https://other.example.com/").prepare()
+        with patch('requests.adapters.HTTPAdapter.send', return_value=MagicMock(status_code=200)):
+            assert adapter.send(request).status_code == 200
+
+
+class TestProviderConfig:
+    @pytest.fixture(autouse=True)
+    def clean_registry(self):
+        rate_limiters.clear()
+        yield
+        rate_limiters.clear()
+
+    def test_amazon_configures_host_bucket(self):
+        AmazonAffiliate(
+            {"amazon_associate_tag": "t-20", "amazon_rate_limit": 2.0, "amazon_rate_burst": 4}
+        )
+        bucket = rate_limiters.get("www.amazon.com")
+        assert bucket.rate == 2.0 and bucket.capacity == 4
+
+    def test_zero_disables(self):
+        AmazonAffiliate({"amazon_associate_tag": "t-20", "amazon_rate_limit": 0})
+        assert rate_limiters.get("www.amazon.com") is None
@@ -1,8 +1,12 @@
+import asyncio
 from unittest.mock import patch
 
 import pytest
+import requests
 
-from src.utils.retry import retry_on_failure
+from src.utils.deadline import DeadlineExceeded, deadline_scope, remaining
+from src.utils.metrics import metrics
+from src.utils.retry import RetryBudget, retry_on_failure
 
 
 class TestRetryOnFailure:
@@ -57,3 +61,185 @@ class TestRetryOnFailure:
 
         with pytest.raises(TypeError):
             wrong_exception()
+
+
+class TestRetryBackoff:
+    @patch('src.utils.retry.random.uniform', return_value=0.25)
+    @patch('src.utils.retry.time.sleep')
+    def test_jitter_draws_from_backoff_window(self, mock_sleep, mock_uniform):
+        @retry_on_failure(max_retries=3, base_delay=1.0, jitter=True)
+        def always_fail():
+            raise ValueError("fail")
+
+        with pytest.raises(ValueError):
+            always_fail()
+
+        assert [c.args for c in mock_uniform.call_args_list] == [(0, 1.0), (0, 2.0)]
+        assert [c.args[0] for c in mock_sleep.call_args_list] == [0.25, 0.25]
+
+    @patch('src.utils.retry.time.sleep')
+    def test_max_delay_caps_backoff(self, mock_sleep):
+        @retry_on_failure(max_retries=3, base_delay=10.0, max_delay=15.0)
+        def always_fail():
+            raise ValueError("fail")
+
+        with pytest.raises(ValueError):
+            always_fail()
+
+        assert [c.args[0] for c in mock_sleep.call_args_list] == [10.0, 15.0]
+
+    @patch('src.utils.retry.time.sleep')
+    def test_retry_after_is_a_floor(self, mock_sleep):
+        response = requests.Response()
+        response.status_code = 429
+        response.headers["Retry-After"] = "5"
+
+        @retry_on_failure(max_retries=2, base_delay=1.0, exceptions=(requests.HTTPError,))
+        def throttled():
+            raise requests.HTTPError(response=response)
+
+        with pytest.raises(requests.HTTPError):
+            throttled()
+
+        assert [c.args[0] for c in mock_sleep.call_args_list] == [5.0]
+
+
+class TestRetryEngine:
+    @pytest.fixture(autouse=True)
+    def reset_metrics(self):
+        metrics.reset()
+
+    def test_timeout_shrinks_to_deadline(self):
+        seen = []
+
+        @retry_on_failure(max_retries=1, timeout_arg="timeout")
+        def fetch(timeout=30):
+            seen.append(timeout)
+
+        fetch()
+        with deadline_scope(2):
+            fetch()
+            fetch(timeout=0.5)
+
+        assert seen[0] == 30
+        assert 1.9 < seen[1] <= 2
+        assert seen[2] == 0.5
+
+    def test_nested_deadline_only_tightens(self):
+        with deadline_scope(1):
+            with deadline_scope(60):
+                assert remaining() <= 1
+        assert remaining() is None
+
+    @patch('src.utils.retry.time.sleep')
+    def test_no_retry_past_deadline(self, mock_sleep):
+        calls = 0
+
+        @retry_on_failure(max_retries=3, base_delay=5.0, name="deadline")
+        def always_fail():
+            nonlocal calls
+            calls += 1
+            raise ValueError("fail")
+
+        with deadline_scope(1), pytest.raises(ValueError):
+            always_fail()
+
+        assert calls == 1
+        mock_sleep.assert_not_called()
+        assert metrics.get("retry.deadline.deadline_exceeded") == 1
+
+    def test_expired_deadline_fails_fast(self):
+        @retry_on_failure(max_retries=3)
+        def never_called():
+            raise AssertionError("should not run")
+
+        with deadline_scope(0), pytest.raises(DeadlineExceeded):
+            never_called()
+
+    @patch('src.utils.retry.time.sleep')
+    def test_retry_budget(self, mock_sleep):
+        budget = RetryBudget(ratio=0.0, min_retries=1)
+
+        @retry_on_failure(max_retries=3, budget=budget, name="budget")
+        def always_fail():
+            raise ValueError("fail")
+
+        for _ in range(2):
+            with pytest.raises(ValueError):
+                always_fail()
+
+        # One retry in the reserve, then every call fails on its first attempt
+        assert mock_sleep.call_count == 1
+        assert metrics.get("retry.budget.attempts") == 3
+        assert metrics.get("retry.budget.budget_exhausted") == 2
+
+    def test_budget_refills_with_calls(self):
+        budget = RetryBudget(ratio=0.5, min_retries=2)
+        assert budget.try_spend() and budget.try_spend()
+        assert not budget.try_spend()
+        budget.deposit()
+        budget.deposit()
+        assert budget.try_spend()
+
+    def test_metrics_count_attempts(self):
+        calls = 0
+
+        @retry_on_failure(max_retries=3, base_delay=0, name="flaky")
+        def flaky():
+            nonlocal calls
+            calls += 1
+            if calls < 2:
+                raise ValueError("not yet")
+            return "ok"
+
+        assert flaky() == "ok"
+        assert metrics.get("retry.flaky.calls") == 1
+        assert metrics.get("retry.flaky.attempts") == 2
+        assert metrics.get("retry.flaky.retries") == 1
+
+    def test_async_retry_respects_deadline(self):
+        seen = []
+
+        @retry_on_failure(max_retries=3, base_delay=0, timeout_arg="timeout")
+        async def fetch(timeout=30):
+            seen.append(timeout)
+            if len(seen) < 2:
+                raise ValueError("not yet")
+            return "ok"
+
+        async def run():
+            with deadline_scope(5):
+                return await fetch()
+
+        assert asyncio.run(run()) == "ok"
+        assert all(t <= 5 for t in seen) and len(seen) == 2
+
+    @pytest.mark.parametrize("run_async", [False, True])
+    def test_local_deadline_is_not_retried(self, run_async):
+        budget = RetryBudget(ratio=0.0, min_retries=1)
+        calls = 0
+
+        def attempt():
+            nonlocal calls
+            calls += 1
+            raise DeadlineExceeded("rate limit wait exceeds deadline")
+
+        # The async providers retry asyncio.TimeoutError, which DeadlineExceeded subclasses
+        retry = retry_on_failure(
+            max_retries=3, base_delay=0, exceptions=(asyncio.TimeoutError,), budget=budget
+        )
+        if run_async:
+
+            @retry
+            async def fetch():
+                attempt()
+
+            with pytest.raises(DeadlineExceeded):
+                asyncio.run(fetch())
+        else:
+            fetch = retry(attempt)
+            with pytest.raises(DeadlineExceeded):
+                fetch()
+
+        assert calls == 1
+        assert budget.try_spend()
@@ -0,0 +1,209 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import pytest
+
+from src.platforms.flipkart.flipkart_affiliate import FlipkartAffiliate
+from src.utils.deadline import DeadlineExceeded, deadline_scope
+from src.utils.singleflight import AsyncSingleFlight, SingleFlight, coalesce
+
+
+class Provider:
+    def __init__(self):
+        self.calls = 0
+
+    @coalesce(case_insensitive=True)
+    def search(self, query, max_results=10):
+        self.calls += 1
+        time.sleep(0.1)
+        return [query.strip().lower()] * max_results
+
+    @coalesce()
+    def lookup(self, product_id):
+        self.calls += 1
+        time.sleep(0.1)
+        if product_id == "bad":
+            raise ValueError("upstream failed")
+        return product_id
+
+    @coalesce()
+    async def async_lookup(self, product_id):
+        self.calls += 1
+        await asyncio.sleep(0.05)
+        return product_id
+
+
+class TestSingleFlight:
+    def test_concurrent_calls_share_execution(self):
+        group = SingleFlight()
+        calls = []
+
+        def work():
+            calls.append(1)
+            time.sleep(0.1)
+            return "result"
+
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            results = list(executor.map(lambda _: group.do("key", work), range(5)))
+
+        assert results == ["result"] * 5
+        assert len(calls) == 1
+        assert group.stats() == {"executions": 1, "coalesced": 4}
+
+    def test_sequential_calls_run_again(self):
+        group = SingleFlight()
+        assert group.do("key", lambda: 1) == 1
+        assert group.do("key", lambda: 2) == 2
+
+    def test_follower_gives_up_at_its_deadline(self):
+        group = SingleFlight()
+        release = threading.Event()
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            leader = executor.submit(group.do, "key", lambda: release.wait(5) and "result")
+            time.sleep(0.05)
+            started = time.monotonic()
+            with deadline_scope(0.1), pytest.raises(DeadlineExceeded):
+                group.do("key", lambda: "unused")
+            assert time.monotonic() - started < 1
+            release.set()
+            assert leader.result() == "result"
+
+    def test_follower_with_time_left_reruns_after_leader_deadline(self):
+        group = SingleFlight()
+        calls = []
+
+        def work():
+            calls.append(1)
+            if len(calls) == 1:
+                time.sleep(0.1)
+                raise DeadlineExceeded("leader ran out of time")
+            return "result"
+
+        def lead():
+            with deadline_scope(0.5):
+                return group.do("key", work)
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            leader = executor.submit(lead)
+            time.sleep(0.05)
+            with deadline_scope(5):
+                assert group.do("key", work) == "result"
+            with pytest.raises(DeadlineExceeded):
+                leader.result()
+        assert len(calls) == 2
+
+    def test_async_follower_gives_up_at_its_deadline(self):
+        group = AsyncSingleFlight()
+
+        async def work():
+            await asyncio.sleep(0.3)
+            return "result"
+
+        async def follow():
+            await asyncio.sleep(0.01)
+            with deadline_scope(0.05):
+                return await group.do("key", work)
+
+        async def run():
+            return await asyncio.gather(group.do("key", work), follow(), return_exceptions=True)
+
+        leader, follower = asyncio.run(run())
+        assert leader == "result"
+        assert isinstance(follower, DeadlineExceeded)
+
+    def test_async_follower_with_time_left_reruns_after_leader_deadline(self):
+        group = AsyncSingleFlight()
+        calls = []
+
+        async def work():
+            calls.append(1)
+            if len(calls) == 1:
+                await asyncio.sleep(0.02)
+                raise DeadlineExceeded("leader ran out of time")
+            return "result"
+
+        async def lead():
+            with deadline_scope(0.05):
+                return await group.do("key", work)
+
+        async def follow():
+            await asyncio.sleep(0.01)
+            return await group.do("key", work)
+
+        async def run():
+            return await asyncio.gather(lead(), follow(), return_exceptions=True)
+
+        leader, follower = asyncio.run(run())
+        assert isinstance(leader, DeadlineExceeded)
+        assert follower == "result"
+        assert len(calls) == 2
+
+
+class TestCoalesce:
+    def test_normalized_arguments_share_call(self):
+        provider = Provider()
+        queries = ["Laptop", "  laptop ", "LAPTOP"]
+
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            results = list(executor.map(lambda q: provider.search(q, max_results=2), queries))
+
+        assert provider.calls == 1
+        assert results[0] == results[1] == ["laptop", "laptop"]
+        assert results[0] is not results[1]
+
+    def test_defaults_are_applied_to_key(self):
+        provider = Provider()
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            executor.submit(provider.search, "phone")
+            executor.submit(provider.search, "phone", max_results=10)
+
+        assert provider.calls == 1
+
+    def test_different_arguments_not_shared(self):
+        provider = Provider()
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            list(executor.map(provider.lookup, ["A1", "a1"]))
+
+        assert provider.calls == 2
+
+    def test_errors_are_shared(self):
+        provider = Provider()
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            futures = [executor.submit(provider.lookup, "bad") for _ in range(3)]
+
+        for future in futures:
+            with pytest.raises(ValueError):
+                future.result()
+        assert provider.calls == 1
+
+    def test_async_calls_share_execution(self):
+        provider = Provider()
+
+        async def run():
+            return await asyncio.gather(*(provider.async_lookup("A1") for _ in range(5)))
+
+        assert asyncio.run(run()) == ["A1"] * 5
+        assert provider.calls == 1
+
+    def test_provider_search_coalesced(self):
+        flipkart = FlipkartAffiliate(
+            {"flipkart_affiliate_id": "test-id", "flipkart_affiliate_token": "test-token"}
+        )
+        barrier = threading.Barrier(2)
+
+        def api_get(url, params=None):
+            time.sleep(0.1)
+            return {"products": []}
+
+        def search(query):
+            barrier.wait()
+            return flipkart.search_products(query)
+
+        with patch.object(flipkart, "_api_get", side_effect=api_get) as mock_api_get:
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                list(executor.map(search, ["Laptop", "laptop"]))
+
+        assert mock_api_get.call_count == 1
@@ -0,0 +1,119 @@
+import threading
+import time
+from queue import Full
+
+import pytest
+
+from src.core.base_affiliate import Product
+from src.utils.write_behind import WriteBehindWriter, writer_from_config
+
+
+def make_product(product_id: str, price: float = 10.0) -> Product:
+    return Product(id=product_id, title=f"Product {product_id}", price=price, platform="Amazon")
+
+
+class RecordingSink:
+    def __init__(self, block: threading.Event = None):
+        self.batches = []
+        self.block = block
+
+    def __call__(self, products):
+        if self.block is not None:
+            self.block.wait(5)
+        self.batches.append([(p.id, p.price) for p in products])
+        return len(products)
+
+    @property
+    def written(self):
+        return [item for batch in self.batches for item in batch]
+
+
+class TestWriteBehindWriter:
+    @pytest.fixture
+    def sink(self):
+        return RecordingSink()
+
+    def test_flushes_full_batches(self, sink):
+        writer = WriteBehindWriter(sink, batch_size=3, flush_interval=60)
+        for i in range(7):
+            writer.put(make_product(f"P{i}"))
+
+        deadline = time.monotonic() + 5
+        while len(sink.batches) < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert [len(batch) for batch in sink.batches] == [3, 3]
+        writer.close()
+        assert len(sink.written) == 7
+
+    def test_flushes_after_interval(self, sink):
+        writer = WriteBehindWriter(sink, batch_size=100, flush_interval=0.05)
+        writer.put(make_product("P1"))
+
+        deadline = time.monotonic() + 5
+        while not sink.batches and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert sink.written == [("P1", 10.0)]
+        writer.close()
+
+    def test_coalesces_repeated_writes(self, sink):
+        writer = WriteBehindWriter(sink, batch_size=100, flush_interval=60)
+        writer.put(make_product("P1", 10.0))
+        writer.put(make_product("P2", 20.0))
+        writer.put(make_product("P1", 8.0))
+        assert len(writer) == 2
+
+        writer.flush()
+        assert sink.written == [("P2", 20.0), ("P1", 8.0)]
+        writer.close()
+
+    def test_close_drains_queue_and_rejects_puts(self, sink):
+        writer = WriteBehindWriter(sink, batch_size=2, flush_interval=60)
+        writer.put_many(make_product(f"P{i}") for i in range(5))
+        writer.close()
+
+        assert sorted(pid for pid, _ in sink.written) == [f"P{i}" for i in range(5)]
+        with pytest.raises(RuntimeError):
+            writer.put(make_product("P9"))
+
+    def test_backpressure_when_full(self):
+        release = threading.Event()
+        sink = RecordingSink(block=release)
+        writer = WriteBehindWriter(
+            sink, batch_size=2, flush_interval=60, max_pending=2, put_timeout=0.05
+        )
+        writer.put_many(make_product(f"P{i}") for i in range(2))
+        time.sleep(0.05)  # the worker takes that batch and blocks in the sink
+        writer.put_many(make_product(f"P{i}") for i in range(2, 4))
+
+        with pytest.raises(Full):
+            writer.put(make_product("P4"))
+        writer.put(make_product("P3", 5.0))  # replacing a queued product needs no room
+
+        release.set()
+        writer.close()
+        assert len(sink.written) == 4
+
+    def test_failed_batch_is_dropped(self):
+        def failing(products):
+            raise RuntimeError("database is locked")
+
+        writer = WriteBehindWriter(failing, batch_size=10, flush_interval=60)
+        writer.put(make_product("P1"))
+        writer.put(make_product("P2"))
+        assert writer.flush() == 2
+        assert len(writer) == 0
+        assert writer.flush() == 0
+
+    def test_close_reports_background_failures(self):
+        def failing(products):
+            raise RuntimeError("database is locked")
+
+        writer = WriteBehindWriter(failing, batch_size=1, flush_interval=60)
+        writer.put(make_product("P1"))
+        assert writer.close() == 1
+
+    def test_from_config(self, sink):
+        assert writer_from_config(sink, {"write_behind_enabled": False}) is None
+        writer = writer_from_config(sink, {"write_behind_batch_size": 7})
+        assert writer.batch_size == 7
+        writer.close()